@@ -11,3 +11,14 @@ functionality to access a HDF5-file using h5py.
 from .container import Container  # noqa: F401
 from .features import FeatureContainer  # noqa: F401
 from .audio import AudioContainer  # noqa: F401
+from .ragged import RaggedContainer  # noqa: F401
+from .virtual import VirtualFeatureContainer  # noqa: F401
+from .storage import StorageOptions  # noqa: F401
+from .index import ContainerIndex  # noqa: F401
+
+from .operations import copy_keys  # noqa: F401
+from .operations import subset  # noqa: F401
+from .operations import merge  # noqa: F401
+
+from .pool import HandlePool  # noqa: F401
+from .pool import default_handle_pool  # noqa: F401
@@ -14,6 +14,8 @@ class AudioContainer(container.Container):
         The samples are stored  as 16-Bit Integers.
         But all methods expect or return the samples as 32-Bit Floats,
         in the range of -1.0 to 1.0.
+        Except the ``*_raw`` methods, which expect or return
+        the 16-Bit Integers as they are stored, without any conversion.
     """
 
     def get(self, key, mem_map=True):
@@ -33,9 +35,11 @@ class AudioContainer(container.Container):
                    with ``np.float32`` [-1.0,1.0] and the sampling-rate.
         """
         self.raise_error_if_not_open()
+        self.flush(key)
 
-        if key in self._file:
-            data = self._file[key]
+        data = self._dataset(key)
+
+        if data is not None:
             sampling_rate = data.attrs[SAMPLING_RATE_ATTR]
 
             if not mem_map:
@@ -47,8 +51,152 @@ class AudioContainer(container.Container):
 
         return None
 
+    def get_range(self, key, start=0, end=None):
+        """
+        Return a range of the samples for the given key.
+        Only the requested samples are read from the file
+        and converted to floats.
+
+        Args:
+            key (str): The key to read the data from.
+            start (int): Index of the first sample to read.
+            end (int): Index of the sample to stop reading at (exclusive).
+                       If ``None``, reads until the last sample.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            numpy.ndarray: The samples as numpy array with ``np.float32`` [-1.0,1.0].
+            ``None`` if there are no samples for the given key.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        dset = self._dataset(key)
+
+        if dset is not None:
+            return np.float32(dset[start:end]) / MAX_INT16_VALUE
+
+        return None
+
+    def get_raw(self, key, mem_map=True):
+        """
+        Return the samples for the given key as stored (16-Bit Integers)
+        and the sampling-rate.
+
+        Args:
+            key (str): The key to read the data from.
+            mem_map (bool): If ``True`` returns the data as
+                            memory-mapped array, otherwise a copy is returned.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            tuple: A tuple containing the samples (``np.int16``)
+            and the sampling-rate. ``None`` if there are no samples for the given key.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        data = self._dataset(key)
+
+        if data is None:
+            return None
+
+        sampling_rate = data.attrs[SAMPLING_RATE_ATTR]
+
+        if not mem_map:
+            data = data[()]
+
+        return data, sampling_rate
+
+    def get_raw_range(self, key, start=0, end=None, out=None):
+        """
+        Return a range of the samples for the given key as stored (16-Bit Integers).
+        Only the requested samples are read from the file.
+
+        Args:
+            key (str): The key to read the data from.
+            start (int): Index of the first sample to read.
+            end (int): Index of the sample to stop reading at (exclusive).
+                       If ``None``, reads until the last sample.
+            out (numpy.ndarray): If not ``None``, the samples are read into
+                                 this ``np.int16`` array, which has to have
+                                 the length of the range, instead of a new array.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            numpy.ndarray: The samples as numpy array with ``np.int16``.
+            ``None`` if there are no samples for the given key.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        dset = self._dataset(key)
+
+        if dset is None:
+            return None
+
+        if out is None:
+            return dset[start:end]
+
+        start, end, _ = slice(start, end).indices(dset.shape[0])
+
+        if out.shape != (max(0, end - start),):
+            raise ValueError('The output array has to have the length of the range!')
+
+        if end > start:
+            dset.read_direct(out, source_sel=np.s_[start:end])
+
+        return out
+
+    def get_sampling_rate(self, key):
+        """
+        Return the sampling-rate of the samples for the given key,
+        without reading any samples.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            int: The sampling-rate, ``None`` if there are no samples for the given key.
+        """
+        self.raise_error_if_not_open()
+
+        buffered_attrs = self._buffered_attrs(key)
+
+        if buffered_attrs is not None and SAMPLING_RATE_ATTR in buffered_attrs:
+            return buffered_attrs[SAMPLING_RATE_ATTR]
+
+        dset = self._dataset(key)
+
+        if dset is not None:
+            return dset.attrs[SAMPLING_RATE_ATTR]
+
+        return None
+
+    def get_num_samples(self, key):
+        """
+        Return the number of samples stored for the given key,
+        without reading any samples.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            int: The number of samples, ``None`` if there are no samples for the given key.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        return self._load_index().num_rows(key)
+
     # skipcq: PYL-W0221
-    def set(self, key, samples, sampling_rate):
+    def set(self, key, samples, sampling_rate, storage=None):
         """
         Set the samples and sampling-rate for the given key.
         Existing data will be overwritten.
@@ -59,6 +207,9 @@ class AudioContainer(container.Container):
             key (str): A key to store the data for.
             samples (numpy.ndarray): 1-D array of audio samples (np.float32).
             sampling_rate (int): The sampling-rate of the audio samples.
+            storage (StorageOptions): Options how to store the samples.
+                                      If ``None``, the options of
+                                      the container are used.
 
         Note:
             The container has to be opened in advance.
@@ -69,18 +220,39 @@ class AudioContainer(container.Container):
         if len(samples.shape) > 1:
             raise ValueError('Only single channel supported!')
 
-        self.raise_error_if_not_open()
+        self.set_raw(key, (samples * MAX_INT16_VALUE).astype(np.int16), sampling_rate, storage=storage)
 
-        if key in self._file:
-            del self._file[key]
+    def set_raw(self, key, samples, sampling_rate, storage=None):
+        """
+        Set the samples (16-Bit Integers) and sampling-rate for the given key.
+        The samples are stored as they are passed, without any conversion.
+        Existing data will be overwritten.
 
-        samples = (samples * MAX_INT16_VALUE).astype(np.int16)
+        Args:
+            key (str): A key to store the data for.
+            samples (numpy.ndarray): 1-D array of audio samples (``np.int16``).
+            sampling_rate (int): The sampling-rate of the audio samples.
+            storage (StorageOptions): Options how to store the samples.
+                                      If ``None``, the options of
+                                      the container are used.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        _check_raw_samples(samples)
 
-        dset = self._file.create_dataset(key, data=samples)
+        self.raise_error_if_not_open()
+        self._raise_error_if_swmr_writing()
+        self._discard_buffered(key)
+        self._delete_dataset(key)
+
+        kwargs = self._storage_options(storage).dataset_kwargs(samples.shape)
+        dset = self._file.create_dataset(self._dataset_path(key), data=samples, **kwargs)
         dset.attrs[SAMPLING_RATE_ATTR] = sampling_rate
+        self._update_index(key)
 
     # skipcq: PYL-W0221
-    def append(self, key, samples, sampling_rate):
+    def append(self, key, samples, sampling_rate, storage=None):
         """
         Append the given samples to the data that already exists
         in the container for the given key.
@@ -89,6 +261,9 @@ class AudioContainer(container.Container):
             key (str): A key to store the data for.
             samples (numpy.ndarray): 1-D array of audio samples (int-16).
             sampling_rate (int): The sampling-rate of the audio samples.
+            storage (StorageOptions): Options how to store the samples.
+                                      If ``None``, the options of
+                                      the container are used.
 
         Note:
             The container has to be opened in advance.
@@ -101,20 +276,46 @@ class AudioContainer(container.Container):
         if len(samples.shape) > 1:
             raise ValueError('Only single channel supported!')
 
-        existing = self.get(key, mem_map=True)
-        samples = (samples * MAX_INT16_VALUE).astype(np.int16)
+        self.append_raw(key, (samples * MAX_INT16_VALUE).astype(np.int16), sampling_rate, storage=storage)
+
+    def append_raw(self, key, samples, sampling_rate, storage=None):
+        """
+        Append the given samples (16-Bit Integers) to the data that already exists
+        in the container for the given key.
+        The samples are stored as they are passed, without any conversion.
+
+        Args:
+            key (str): A key to store the data for.
+            samples (numpy.ndarray): 1-D array of audio samples (``np.int16``).
+            sampling_rate (int): The sampling-rate of the audio samples.
+            storage (StorageOptions): Options how to store the samples.
+                                      If ``None``, the options of
+                                      the container are used.
+
+        Note:
+            The container has to be opened in advance.
+            For appending to existing data the HDF5-Dataset has to be chunked,
+            so it is not allowed to first add data via ``set``.
+        """
+        _check_raw_samples(samples)
+
+        self.raise_error_if_not_open()
+
+        existing_sr = self.get_sampling_rate(key)
+
+        if existing_sr is not None and existing_sr != sampling_rate:
+            raise ValueError('Different sampling-rate than existing data!')
+
+        self._append(key, samples, attrs={SAMPLING_RATE_ATTR: sampling_rate}, storage=storage)
 
-        if existing is not None:
-            existing_samples, existing_sr = existing
+    def _encode(self, data, options):
+        # The samples are always stored as 16-Bit Integers
+        return data, {}
 
-            if existing_sr != sampling_rate:
-                raise ValueError('Different sampling-rate than existing data!')
 
-            num_existing = existing_samples.shape[0]
-            self._file[key].resize(num_existing + samples.shape[0], 0)
-            self._file[key][num_existing:] = samples
-        else:
-            dset = self._file.create_dataset(key, data=samples,
-                                             chunks=True, maxshape=(None,))
+def _check_raw_samples(samples):
+    if samples.dtype != np.int16:
+        raise ValueError('Samples are required as np.int16!')
 
-            dset.attrs[SAMPLING_RATE_ATTR] = sampling_rate
+    if len(samples.shape) > 1:
+        raise ValueError('Only single channel supported!')
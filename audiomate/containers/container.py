@@ -1,5 +1,22 @@
+import collections
 import contextlib
+import hashlib
+
 import h5py
+import numpy as np
+
+from audiomate.utils import units
+
+from . import index as container_index
+from . import pool
+from . import storage as storage_options
+
+SHARD_LEVELS_ATTR = 'shard-levels'
+CACHED_ATTR_PREFIX = 'cached-'
+ENCODED_DATA_ATTR = 'encoded-data'
+
+INTERNAL_ATTRS = frozenset([SHARD_LEVELS_ATTR, ENCODED_DATA_ATTR])
+INTERNAL_ATTR_PREFIXES = ('storage-', CACHED_ATTR_PREFIX)
 
 
 class Container:
@@ -14,6 +31,22 @@ class Container:
                     If the file doesn't exist, one is created.
         mode (str): Either 'r' for read-only, 'w' for truncate and write or
                     'a' for append. (default: 'a').
+        storage (StorageOptions): Options how to store the data
+                                  (compression, chunking).
+                                  They are stored in the file, when it is
+                                  opened for writing. If ``None``, the options
+                                  stored in the file are used.
+        shard_levels (int): Number of levels of nested groups,
+                            the datasets are distributed into (based on a hash of the key).
+                            Every level has up to 256 groups. This keeps the number
+                            of links per group small, if there are a lot of keys.
+                            ``0`` stores all datasets in the root group.
+                            The layout is stored in the file and can only be
+                            chosen for a container without data.
+                            If ``None``, the layout stored in the file is used.
+        swmr (bool): If ``True``, the file is opened for single-writer/multiple-reader access
+                     (HDF5 SWMR, see :meth:`start_swmr`). Readers have to open the container
+                     with ``mode='r'`` and ``swmr=True``, to read while it is written.
 
     Example:
         >>> ct = Container('/path/to/hdf5file')
@@ -23,14 +56,33 @@ class Container:
         array([1, 2, 3, 4])
     """
 
-    def __init__(self, path, mode='a'):
+    def __init__(self, path, mode='a', storage=None, shard_levels=None, swmr=False):
         if mode not in ['r', 'w', 'a']:
             raise ValueError("Invalid mode! Modes: ['a', 'r', 'w']")
 
         self.path = path
         self.mode = mode
+        self.storage = storage
+        self.shard_levels = shard_levels
+        self.swmr = swmr
 
         self._file = None
+        self._pooled = False
+        self._swmr_writing = False
+        self._swmr_reading = False
+        self._published_offset = 0
+
+        self._index = None
+        self._index_file = None
+        self._index_changed = False
+        self._has_cached_attrs = None
+        self._has_encoded_data = False
+
+        self._append_buffer = None
+        self._append_buffer_attrs = {}
+        self._append_buffer_storage = {}
+        self._append_buffer_size = 0
+        self._max_append_buffer_size = 0
 
     def open(self, mode=None):
         """
@@ -48,13 +100,39 @@ class Container:
             raise ValueError("Invalid mode! Modes: ['a', 'r', 'w']")
 
         if self._file is None:
-            self._file = h5py.File(self.path, mode=mode)
+            pool.default_handle_pool().discard(self.path)
+
+            if not self.swmr:
+                self._file = h5py.File(self.path, mode=mode)
+            elif mode == 'r':
+                self._file = h5py.File(self.path, mode=mode, libver='latest', swmr=True)
+                self._swmr_reading = container_index.PUBLISHED_DATASET in self._file
+            else:
+                self._file = h5py.File(self.path, mode=mode, libver='latest')
+
+            self._init_file_state(mode)
 
     def close(self):
-        """ Close the container file if its open. """
+        """
+        Close the container file if its open.
+        A handle of the pool (see :meth:`open_pooled`) is shared,
+        so it is only released to the pool instead of being closed.
+        """
         if self._file is not None:
-            self._file.close()
+            if self._pooled:
+                self._pooled = False
+                pool.default_handle_pool().release(self.path)
+            else:
+                self.flush()
+                self._write_index()
+                self._file.close()
+
             self._file = None
+            self._has_cached_attrs = None
+            self._has_encoded_data = False
+            self._swmr_writing = False
+            self._swmr_reading = False
+            self._published_offset = 0
 
     def is_open(self):
         """
@@ -86,6 +164,30 @@ class Container:
             if not was_open:
                 self.close()
 
+    @contextlib.contextmanager
+    def open_pooled(self):
+        """
+        Context-manager for read-only access.
+        If the container is already open, it is used as it is.
+        Otherwise a handle from the process-wide handle pool
+        (:func:`audiomate.containers.default_handle_pool`) is used.
+        In contrast to :meth:`open_if_needed` the file is kept open
+        by the pool for a moment after the context, so it can be reused
+        by successive reads.
+        """
+        if self.is_open():
+            yield self
+            return
+
+        self._file = pool.default_handle_pool().acquire(self.path)
+        self._pooled = True
+
+        try:
+            self._init_file_state('r')
+            yield self
+        finally:
+            self.close()
+
     def __enter__(self):
         self.open()
         return self
@@ -100,12 +202,51 @@ class Container:
         Returns:
             list: List of identifiers available in the container.
 
+        Note:
+            The container has to be opened in advance.
+        """
+        return self.index.sorted_keys()
+
+    def __contains__(self, key):
+        """
+        Return ``True`` if data is stored for the given key.
+
         Note:
             The container has to be opened in advance.
         """
         self.raise_error_if_not_open()
 
-        return sorted(list(self._file.keys()))
+        return key in self._load_index() or self._is_buffered(key)
+
+    @property
+    def index(self):
+        """
+        Return the index (:class:`audiomate.containers.ContainerIndex`)
+        with shape, type and size of all arrays in the container.
+        The index is loaded once from the file,
+        so the metadata of all arrays can be queried without accessing
+        the datasets of the HDF5 file.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self.flush()
+
+        return self._load_index()
+
+    def get_shape(self, key):
+        """
+        Return the shape of the data stored for the given key
+        (``None`` if there is no data for the key).
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        return self._load_index().shape(key)
 
     def get(self, key, mem_map=True):
         """
@@ -121,20 +262,110 @@ class Container:
 
         Returns:
             numpy.ndarray: The stored data.
+            If the data is stored with a different type (see :class:`audiomate.containers.StorageOptions`),
+            it is converted back. With ``mem_map == True`` a
+            :class:`audiomate.containers.storage.DecodedDataset` is returned in this case,
+            which converts the data when indexed.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        if self._swmr_reading and key not in self._load_index():
+            return None
+
+        data = self._dataset(key)
+
+        if data is not None and self._swmr_reading:
+            data.refresh()
+
+        if data is not None and self._has_encoded_data and storage_options.DECODED_DTYPE_ATTR in data.attrs:
+            data = storage_options.DecodedDataset(data)
+
+        if data is not None and not mem_map:
+            data = data[()]
+
+        return data
+
+    def get_many(self, keys, contiguous=False):
+        """
+        Read and return the data stored for all given keys.
+        The datasets are read in the order they are stored in the file
+        (not in the order of ``keys``), to reduce seeking.
+
+        Args:
+            keys (list): The keys to read the data from.
+            contiguous (bool): If ``True``, the data of all keys is read
+                               into a single preallocated array,
+                               concatenated along the first dimension.
+                               This requires that all arrays have
+                               the same type and the same dimensions
+                               (except the first).
+
+        Note:
+            The container has to be opened in advance.
+            The data is returned as stored in the file
+            (e.g. 16-Bit Integers for :class:`audiomate.containers.AudioContainer`),
+            except data stored with a different type by the storage options,
+            which is converted back like in :meth:`get`.
+
+        Returns:
+            list: If ``contiguous == False``, a list with the data for every key
+            (in the order of ``keys``).
+
+            tuple: If ``contiguous == True``, a tuple with the array containing the data of all keys
+            and an array with ``len(keys) + 1`` offsets. The data of ``keys[i]`` is
+            ``data[offsets[i]:offsets[i + 1]]``.
         """
         self.raise_error_if_not_open()
+        self.flush()
+
+        index = self._load_index()
 
-        if key in self._file:
-            data = self._file[key]
+        for key in keys:
+            if key not in index:
+                raise ValueError('No data stored for key {}'.format(key))
 
-            if not mem_map:
-                data = data[()]
+        # The low-level API is used, since the overhead of the high-level API
+        # is significant, if many small datasets are read.
+        dset_ids = [h5py.h5d.open(self._file.id, self._dataset_path(key).encode('utf-8')) for key in keys]
 
-            return data
+        if self._swmr_reading:
+            for dset_id in dset_ids:
+                dset_id.refresh()
+        shapes = [index.shape(key) for key in keys]
+        storage_offsets = [_storage_offset(dset_id, shape) for dset_id, shape in zip(dset_ids, shapes)]
+        read_order = sorted(range(len(keys)), key=lambda i: storage_offsets[i])
+
+        if not contiguous:
+            result = [None] * len(keys)
+
+            for i in read_order:
+                result[i] = self._decode_read(dset_ids[i], _read_dataset(dset_ids[i], shapes[i], index.dtype(keys[i])))
+
+            return result
+
+        dtypes = {index.dtype(key) for key in keys}
+        row_shapes = {shape[1:] for shape in shapes}
+
+        if len(keys) > 0 and (len(dtypes) > 1 or len(row_shapes) > 1 or () in shapes):
+            raise ValueError('Only arrays of the same type and dimensions can be read contiguously!')
+
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([shape[0] for shape in shapes])
+
+        if len(keys) > 0:
+            data = np.empty((offsets[-1],) + row_shapes.pop(), dtype=dtypes.pop())
         else:
-            return None
+            data = np.empty(0)
+
+        for i in read_order:
+            if offsets[i + 1] > offsets[i]:
+                dset_ids[i].read(h5py.h5s.ALL, h5py.h5s.ALL, data[offsets[i]:offsets[i + 1]])
+                self._decode_read(dset_ids[i], data[offsets[i]:offsets[i + 1]])
 
-    def set(self, key, data):
+        return data, offsets
+
+    def set(self, key, data, storage=None):
         """
         Set the given data to the container with the given key.
         Any existing data for the given key is discarded/overwritten.
@@ -142,18 +373,26 @@ class Container:
         Args:
             key (str): A key to store the data for.
             data (numpy.ndarray): Array-like data.
+            storage (StorageOptions): Options how to store the data.
+                                      If ``None``, the options of
+                                      the container are used.
 
         Note:
             The container has to be opened in advance.
         """
         self.raise_error_if_not_open()
+        self._raise_error_if_swmr_writing()
+        self._discard_buffered(key)
+        self._delete_dataset(key)
 
-        if key in self._file:
-            del self._file[key]
-
-        self._file.create_dataset(key, data=data)
+        options = self._storage_options(storage)
+        data, attrs = self._encode(np.asarray(data), options)
+        kwargs = options.dataset_kwargs(data.shape)
+        dset = self._file.create_dataset(self._dataset_path(key), data=data, **kwargs)
+        self._set_encoding_attrs(dset, attrs)
+        self._update_index(key)
 
-    def append(self, key, data):
+    def append(self, key, data, storage=None):
         """
         Append the given data to the data that already exists
         in the container for the given key.
@@ -165,13 +404,305 @@ class Container:
             data (numpy.ndarray): Array-like data.
                                   Has to have the same dimension as
                                   the existing data after the first dimension.
+            storage (StorageOptions): Options how to store the data,
+                                      if the dataset is created.
+                                      If ``None``, the options of
+                                      the container are used.
 
         Note:
             The container has to be opened in advance.
             For appending to existing data the HDF5-Dataset has to be chunked,
             so it is not allowed to first add data via ``set``.
+            Within :meth:`buffered_append` the data is collected in memory
+            and written later.
+        """
+        self.raise_error_if_not_open()
+        self._append(key, data, storage=storage)
+
+    def remove(self, key):
+        """
+        Remove the data stored for the given key.
+
+        Args:
+            key (str): Key of the data to remove.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self._raise_error_if_swmr_writing()
+        self._discard_buffered(key)
+
+        if self._delete_dataset(key):
+            self._update_index(key)
+
+    @contextlib.contextmanager
+    def buffered_append(self, max_buffer_size='64m'):
+        """
+        Context-manager, within data passed to :meth:`append` is collected
+        in memory, instead of being written immediately.
+        The collected data is written at once, if the size of all collected
+        data exceeds ``max_buffer_size``, the data of a key is accessed
+        or :meth:`flush` is called. When leaving the context all remaining
+        data is written.
+
+        Datasets created from buffered data are chunked with a chunk-shape
+        based on the data written at once
+        (see :func:`audiomate.containers.storage.chunk_shape`),
+        instead of the (possibly tiny) first chunk appended.
+
+        Args:
+            max_buffer_size (str): The maximal size of all collected
+                                   data in bytes. The units ``k`` (kibibytes),
+                                   ``m`` (mebibytes) and ``g`` (gibibytes)
+                                   are supported.
+
+        Note:
+            The container has to be opened in advance.
+
+        Example:
+            >>> with fc.buffered_append():
+            >>>     for chunk in chunks:
+            >>>         fc.append('utt-1', chunk)
+        """
+        self.raise_error_if_not_open()
+
+        self._append_buffer = collections.OrderedDict()
+        self._max_append_buffer_size = units.parse_storage_size(max_buffer_size)
+
+        try:
+            yield self
+        finally:
+            self.flush()
+            self._append_buffer = None
+
+    def declare(self, key, row_shape=(), dtype=np.float32, storage=None):
+        """
+        Create an empty array for the given key, to which data can be appended.
+        In SWMR mode (see :meth:`start_swmr`) no arrays can be created,
+        so all keys have to be declared in advance.
+
+        Args:
+            key (str): The key.
+            row_shape (tuple): The dimensions of the data, except the first.
+            dtype (numpy.dtype): The type of the data.
+            storage (StorageOptions): Options how to store the data.
+                                      If ``None``, the options of
+                                      the container are used.
+                                      Integer storage types are not supported,
+                                      since the scale depends on the data.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self._raise_error_if_swmr_writing()
+
+        options = self._storage_options(storage)
+
+        if options.dtype is not None and np.issubdtype(np.dtype(options.dtype), np.integer):
+            raise ValueError('Keys can not be declared with an integer storage type!')
+
+        self._discard_buffered(key)
+        self._delete_dataset(key)
+
+        data, attrs = self._encode(np.empty((0,) + tuple(row_shape), dtype=dtype), options)
+        kwargs = options.dataset_kwargs(data.shape, growable=True)
+        dset = self._file.create_dataset(self._dataset_path(key), data=data, **kwargs)
+        self._set_encoding_attrs(dset, attrs)
+        self._update_index(key)
+
+    def start_swmr(self):
+        """
+        Switch the file to SWMR mode, so it can be read by other processes
+        (opened with ``mode='r'`` and ``swmr=True``), while it is written.
+        In SWMR mode data can only be appended to existing (declared) keys,
+        no keys can be created or removed and no attributes can be changed.
+        Readers only see keys, that were published with :meth:`publish`,
+        and get new published keys by calling :meth:`refresh`.
+
+        Note:
+            The container has to be opened for writing with ``swmr=True``.
+
+        Example:
+            >>> cnt = FeatureContainer('/path/to/hdf5file', swmr=True)
+            >>> cnt.open()
+            >>> cnt.frame_size = 400
+            >>> for utt_id in utt_ids:
+            >>>     cnt.declare(utt_id, row_shape=(40,))
+            >>> cnt.start_swmr()
+            >>> for utt_id in utt_ids:
+            >>>     cnt.append(utt_id, features[utt_id])
+            >>>     cnt.publish(utt_id)
+        """
+        self.raise_error_if_not_open()
+
+        if not self.swmr or self._file.mode == 'r':
+            raise ValueError('SWMR mode requires a container opened for writing with swmr=True!')
+
+        if self._swmr_writing:
+            return
+
+        self.flush()
+
+        # Everything that changes the file structure has to happen before
+        self._load_index()
+
+        if not self._index_changed:
+            if container_index.INDEX_GROUP in self._file:
+                del self._file[container_index.INDEX_GROUP]
+
+            self._index_changed = True
+
+        self._clear_cached_attrs()
+
+        if container_index.PUBLISHED_DATASET not in self._file:
+            self._file.create_dataset(container_index.PUBLISHED_DATASET, shape=(0,), maxshape=(None,),
+                                      dtype=np.uint8, chunks=(4096,))
+
+        self._file.swmr_mode = True
+        self._swmr_writing = True
+
+    def publish(self, key):
+        """
+        Make the data of the given key visible to SWMR readers.
+        The data of a key must not be changed after it was published.
+
+        Args:
+            key (str): The key.
+
+        Note:
+            The container has to be in SWMR mode (see :meth:`start_swmr`).
+        """
+        if not self._swmr_writing:
+            raise ValueError('Keys can only be published in SWMR mode!')
+
+        self.flush(key)
+        dset = self._dataset(key)
+
+        if dset is None:
+            raise ValueError('No data stored for key {}'.format(key))
+
+        dset.flush()
+
+        published = self._file[container_index.PUBLISHED_DATASET]
+        data = np.frombuffer((key + container_index.SEPARATOR).encode('utf-8'), dtype=np.uint8)
+        num_existing = published.shape[0]
+
+        published.resize(num_existing + data.size, 0)
+        published[num_existing:] = data
+        published.flush()
+
+    def refresh(self):
+        """
+        Load the keys, that were published by the writer, since the container
+        was opened or refreshed the last time (see :meth:`start_swmr`).
+        Does nothing, if the container isn't opened as SWMR reader.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            list: The newly published keys.
         """
-        existing = self.get(key, mem_map=True)
+        self.raise_error_if_not_open()
+
+        if not self._swmr_reading:
+            return []
+
+        self._load_index()
+
+        return self._read_published()
+
+    def _read_published(self):
+        """ Add the keys published since the last call to the index. """
+        published = self._file[container_index.PUBLISHED_DATASET]
+        published.refresh()
+
+        data = published[self._published_offset:].tobytes()
+        end = data.rfind(container_index.SEPARATOR.encode('utf-8')) + 1
+        self._published_offset += end
+
+        new_keys = []
+
+        for key in data[:end].decode('utf-8').split(container_index.SEPARATOR)[:-1]:
+            if key not in self._index:
+                dset = self._dataset(key)
+                dset.refresh()
+                self._index.update(key, dset.shape, storage_options.decoded_dtype(dset))
+                new_keys.append(key)
+
+        return new_keys
+
+    def flush(self, key=None):
+        """
+        Write the data collected within :meth:`buffered_append`.
+
+        Args:
+            key (str): If not ``None``, only the data of the given key is written.
+                       This can be used if no more data is going to be
+                       appended for this key.
+        """
+        if not self._append_buffer:
+            return
+
+        if key is None:
+            keys = list(self._append_buffer.keys())
+        elif key in self._append_buffer:
+            keys = [key]
+        else:
+            keys = []
+
+        for buffered_key in keys:
+            chunks = self._append_buffer.pop(buffered_key)
+            attrs = self._append_buffer_attrs.pop(buffered_key, None)
+            storage = self._append_buffer_storage.pop(buffered_key, None)
+            data = np.concatenate(chunks)
+
+            self._append_buffer_size -= data.nbytes
+            self._write_appended(buffered_key, data, attrs=attrs, storage=storage,
+                                 chunks=storage_options.chunk_shape(data.shape, data.dtype))
+
+    def _append(self, key, data, attrs=None, storage=None):
+        """
+        Append the data directly or collect it, if buffering is enabled.
+        ``attrs`` are set on the dataset, if it is created.
+        """
+        if self._append_buffer is None:
+            self._write_appended(key, data, attrs=attrs, storage=storage)
+            return
+
+        if key in self._append_buffer:
+            existing_shape = self._append_buffer[key][0].shape
+
+            if existing_shape[1:] != data.shape[1:]:
+                error_msg = (
+                    'The data to append needs to'
+                    'have the same dimensions ({}).'
+                )
+                raise ValueError(error_msg.format(existing_shape[1:]))
+        else:
+            self._append_buffer[key] = []
+
+            if attrs is not None:
+                self._append_buffer_attrs[key] = attrs
+
+            if storage is not None:
+                self._append_buffer_storage[key] = storage
+
+        data = np.array(data)
+        self._append_buffer[key].append(data)
+        self._append_buffer_size += data.nbytes
+
+        if self._append_buffer_size > self._max_append_buffer_size:
+            self.flush()
+
+    def _write_appended(self, key, data, attrs=None, storage=None, chunks=True):
+        """
+        Append the data to the dataset in the file, create the dataset if needed.
+        ``chunks`` is used as chunk-shape, if not defined by the storage options.
+        """
+        existing = self._dataset(key)
 
         if existing is not None:
             num_existing = existing.shape[0]
@@ -183,31 +714,333 @@ class Container:
                 )
                 raise ValueError(error_msg.format(existing.shape[1:]))
 
+            if self._has_encoded_data:
+                self._widen_encoded_range(existing, data)
+
             existing.resize(num_existing + data.shape[0], 0)
+
+            if self._has_encoded_data:
+                data = storage_options.encode_like(data, existing.dtype, existing.attrs)
+
             existing[num_existing:] = data
         else:
-            max_shape = list(data.shape)
-            max_shape[0] = None
+            self._raise_error_if_swmr_writing()
+            options = self._storage_options(storage)
+            data, encoding_attrs = self._encode(data, options)
+            kwargs = options.dataset_kwargs(data.shape, growable=True, default_chunks=chunks)
+            dset = self._file.create_dataset(self._dataset_path(key), data=data, **kwargs)
+            self._set_encoding_attrs(dset, encoding_attrs)
 
-            self._file.create_dataset(key, data=data,
-                                      chunks=True, maxshape=max_shape)
+            if attrs is not None:
+                for name, value in attrs.items():
+                    dset.attrs[name] = value
 
-    def remove(self, key):
+        self._update_index(key)
+
+    def _widen_encoded_range(self, dset, data):
         """
-        Remove the data stored for the given key.
+        Re-scale the quantized data stored in the dataset,
+        if the data to append is out of the range of its scale and offset.
+        """
+        attrs = storage_options.widen_range(data, dset.dtype, dset.attrs)
 
-        Args:
-            key (str): Key of the data to remove.
+        if attrs is None:
+            return
 
-        Note:
-            The container has to be opened in advance.
+        if self._swmr_writing:
+            raise ValueError('In SWMR mode the data to append needs to be in the range of the existing data!')
+
+        stored = storage_options.decode(dset[()], dset.attrs)
+
+        for name in (storage_options.SCALE_ATTR, storage_options.OFFSET_ATTR):
+            dset.attrs[name] = attrs[name]
+
+        dset[()] = storage_options.encode_like(stored, dset.dtype, attrs)
+
+    def _load_index(self):
         """
-        self.raise_error_if_not_open()
+        Return the index of the open file.
+        It is read from the file once. If the file contains no index or an index,
+        that doesn't match the stored datasets (e.g. written by an older version),
+        it is created by scanning all datasets.
+        A scanned index is only stored, once the container is changed.
+        """
+        if self._index is not None and self._index_file is self._file:
+            return self._index
+
+        if self._swmr_reading:
+            self._index = container_index.ContainerIndex()
+            self._index_file = self._file
+            self._read_published()
+
+            return self._index
+
+        group = self._file.get(container_index.INDEX_GROUP, None)
+        index = None
+
+        if group is not None:
+            index = container_index.ContainerIndex.read(group)
+
+        shard_levels = self._get_shard_levels()
+        num_top_level = len(self._file) - sum(1 for name in container_index.RESERVED_NAMES if name in self._file)
+
+        # Datasets added by older versions can only be detected in the flat layout,
+        # since older versions don't support sharding
+        if shard_levels == 0:
+            outdated = index is not None and num_top_level != len({key.split('/')[0] for key in index.keys})
+        else:
+            outdated = False
+
+        if index is None or outdated:
+            index = container_index.ContainerIndex.scan(self._file, strip_levels=shard_levels)
+
+        self._index = index
+        self._index_file = self._file
+
+        return index
+
+    def _update_index(self, key):
+        """
+        Update the index entry for the given key after the dataset was changed.
+        The index stored in the file is removed on the first change,
+        so it is recognized as outdated, if the container isn't closed properly.
+        """
+        index = self._load_index()
+
+        if not self._index_changed:
+            # The published keys of a previous SWMR session are outdated as well
+            for name in container_index.RESERVED_NAMES:
+                if name in self._file:
+                    del self._file[name]
+
+            self._index_changed = True
+
+        if self._has_cached_attrs is not False:
+            self._clear_cached_attrs()
+
+        dset = self._dataset(key)
+
+        if dset is None:
+            index.remove(key)
+        elif self._has_encoded_data:
+            index.update(key, dset.shape, storage_options.decoded_dtype(dset))
+        else:
+            index.update(key, dset.shape, dset.dtype)
+
+    def _write_index(self):
+        """ Store the index in the file, if it was changed. """
+        # No groups can be created in SWMR mode, the index is created by scanning on the next open
+        if self._index_changed and self._index_file is self._file and not self._swmr_writing:
+            group = self._file.require_group(container_index.INDEX_GROUP)
+            self._index.write(group)
+
+        self._index = None
+        self._index_file = None
+        self._index_changed = False
+
+    def _encode(self, data, options):
+        """ Return the data converted for storing and the attributes needed to decode it. """
+        return options.encode(data)
+
+    def _set_encoding_attrs(self, dset, attrs):
+        """ Store the attributes needed to decode the data of the dataset. """
+        for name, value in attrs.items():
+            dset.attrs[name] = value
+
+        if len(attrs) > 0 and not self._has_encoded_data:
+            self._file.attrs[ENCODED_DATA_ATTR] = True
+            self._has_encoded_data = True
+
+    def _decode_read(self, dset_id, data):
+        """ Decode the data read from the dataset (low-level id), if it is encoded. """
+        if self._has_encoded_data and h5py.h5a.exists(dset_id, storage_options.SCALE_ATTR.encode('utf-8')):
+            attrs = h5py.Dataset(dset_id).attrs
+            data *= attrs[storage_options.SCALE_ATTR].astype(data.dtype)
+            data += attrs[storage_options.OFFSET_ATTR].astype(data.dtype)
+
+        return data
+
+    def _data_attrs(self):
+        """
+        Return the attributes of the file, that describe the data (e.g. ``frame-size``),
+        without the attributes used internally by the container (storage options, cached values, ...).
+        """
+        return {
+            name: value for name, value in self._file.attrs.items()
+            if name not in INTERNAL_ATTRS and not name.startswith(INTERNAL_ATTR_PREFIXES)
+        }
+
+    def _set_data_attr(self, name, value):
+        """ Set an attribute of the file, that describes the data. """
+        self._file.attrs[name] = value
+
+    def _set_cached_attr(self, name, value):
+        """
+        Store a value, that is derived from the data (e.g. statistics), as file attribute.
+        All cached values are removed when the data is changed.
+        Nothing is stored, if the file is opened read-only.
+        """
+        if self._file.mode != 'r' and not self._swmr_writing:
+            self._file.attrs[CACHED_ATTR_PREFIX + name] = value
+            self._has_cached_attrs = True
+
+    def _get_cached_attr(self, name):
+        """ Return the cached value with the given name or ``None``, if not available. """
+        return self._file.attrs.get(CACHED_ATTR_PREFIX + name, None)
+
+    def _clear_cached_attrs(self):
+        """ Remove all cached values from the file attributes. """
+        names = [name for name in self._file.attrs.keys() if name.startswith(CACHED_ATTR_PREFIX)]
+
+        for name in names:
+            del self._file.attrs[name]
+
+        self._has_cached_attrs = False
+
+    def _init_file_state(self, mode):
+        """
+        Initialize the state, that depends on the opened file
+        (storage options, layout of the keys and encoding of the data).
+        """
+        if self.storage is None:
+            self.storage = storage_options.StorageOptions.read_attrs(self._file.attrs)
+        elif mode != 'r':
+            self.storage.write_attrs(self._file.attrs)
+
+        self._init_shard_levels(mode)
+        self._has_encoded_data = bool(self._file.attrs.get(ENCODED_DATA_ATTR, False))
+
+    def _init_shard_levels(self, mode):
+        """
+        Read the layout of the keys from the file, or store it,
+        if it is given and the file is opened for writing.
+        """
+        stored = int(self._file.attrs.get(SHARD_LEVELS_ATTR, 0))
+
+        if self.shard_levels is None or mode == 'r':
+            self.shard_levels = stored
+        elif self.shard_levels != stored:
+            num_datasets = len(self._file) - sum(1 for name in container_index.RESERVED_NAMES if name in self._file)
+
+            if num_datasets > 0:
+                raise ValueError('The layout (shard-levels) of a container with data can not be changed!')
+
+            self._file.attrs[SHARD_LEVELS_ATTR] = self.shard_levels
+
+    def _get_shard_levels(self):
+        """ Return the shard-levels, read them from the file if not known yet (e.g. pooled access). """
+        if self.shard_levels is None:
+            self.shard_levels = int(self._file.attrs.get(SHARD_LEVELS_ATTR, 0))
+
+        return self.shard_levels
 
-        if key in self._file:
-            del self._file[key]
+    def _dataset_path(self, key):
+        """ Return the path of the dataset for the given key in the file. """
+        return shard_path(key, self._get_shard_levels())
+
+    def _dataset(self, key):
+        """ Return the dataset for the given key, ``None`` if it doesn't exist. """
+        return self._file.get(self._dataset_path(key), None)
+
+    def _delete_dataset(self, key):
+        """ Delete the dataset for the given key. Return ``True`` if it existed. """
+        path = self._dataset_path(key)
+
+        if path in self._file:
+            del self._file[path]
+            return True
+
+        return False
+
+    def _is_buffered(self, key):
+        return self._append_buffer is not None and key in self._append_buffer
+
+    def _buffered_attrs(self, key):
+        """ Return the attributes of data collected for the given key, ``None`` if not buffered. """
+        if self._is_buffered(key):
+            return self._append_buffer_attrs.get(key, {})
+
+        return None
+
+    def _discard_buffered(self, key):
+        if self._is_buffered(key):
+            for chunk in self._append_buffer.pop(key):
+                self._append_buffer_size -= chunk.nbytes
+
+            self._append_buffer_attrs.pop(key, None)
+            self._append_buffer_storage.pop(key, None)
+
+    def _storage_options(self, storage=None):
+        """ Return the given storage options, or the options of the container if ``None``. """
+        if storage is not None:
+            return storage
+
+        if self.storage is not None:
+            return self.storage
+
+        return storage_options.StorageOptions()
 
     def raise_error_if_not_open(self):
         """ Check if container is opened, raise error if not. """
         if self._file is None:
             raise ValueError('The container is not opened!')
+
+    def _raise_error_if_swmr_writing(self):
+        if self._swmr_writing:
+            raise ValueError('In SWMR mode only data can be appended to declared keys!')
+
+
+def shard_path(key, levels):
+    """
+    Return the path of the dataset for the given key,
+    if the keys are distributed into ``levels`` levels of nested groups.
+    The groups are named by two hex-digits of the SHA-1 hash of the key.
+
+    Args:
+        key (str): The key.
+        levels (int): Number of levels of nested groups.
+
+    Returns:
+        str: The path of the dataset.
+
+    Example:
+        >>> shard_path('utt-1', 2)
+        '2a/f4/utt-1'
+    """
+    if levels == 0:
+        return key
+
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    groups = [digest[2 * i:2 * i + 2] for i in range(levels)]
+
+    return '/'.join(groups + [key])
+
+
+def _storage_offset(dset_id, shape):
+    """
+    Return the position of the data of the dataset (low-level id) in the file.
+    For chunked datasets the position of the first chunk is used.
+    Returns 0 if the position is unknown (e.g. empty datasets).
+    """
+    offset = dset_id.get_offset()
+
+    if offset is None and 0 not in shape and dset_id.get_create_plist().get_layout() == h5py.h5d.CHUNKED:
+        try:
+            offset = dset_id.get_chunk_info(0).byte_offset
+        except (AttributeError, RuntimeError, ValueError):
+            offset = None
+
+    return offset or 0
+
+
+def _read_dataset(dset_id, shape, dtype):
+    """ Read the whole dataset (low-level id) with the given shape and type. """
+    if dtype.hasobject:
+        return h5py.Dataset(dset_id)[()]
+
+    data = np.empty(shape, dtype=dtype)
+
+    if data.size > 0:
+        dset_id.read(h5py.h5s.ALL, h5py.h5s.ALL, data)
+
+    return data
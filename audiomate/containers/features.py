@@ -1,8 +1,15 @@
+import functools
+import hashlib
+import json
+import multiprocessing
+
 import numpy as np
 
 from audiomate.utils import stats
 from . import container
 
+STATS_BLOCK_SIZE = 16 * 1024 * 1024
+
 
 class FeatureContainer(container.Container):
     """
@@ -57,42 +64,160 @@ class FeatureContainer(container.Container):
         self.raise_error_if_not_open()
         self._file.attrs['sampling-rate'] = sampling_rate
 
-    def stats(self):
+    def stats(self, keys=None, per_dimension=False, num_workers=1, cache=False):
         """
         Return statistics calculated overall features in the container.
+        The data is read chunk-wise, so the features don't have to fit into memory.
+
+        Args:
+            keys (list, Corpus): Only use the features of these keys.
+                                 Instead of a list, a corpus or subview can be passed,
+                                 in which case the ids of its utterances are used.
+                                 If ``None``, all keys are used.
+            per_dimension (bool): If ``True``, the statistics are computed
+                                  for every feature dimension (last dimension) separately.
+            num_workers (int): Number of processes used to compute the statistics.
+                               If greater than 1, the container has to be opened read-only,
+                               since every process opens the file on its own.
+            cache (bool): If ``True``, the result is stored in the file attributes
+                          and reused on later calls with ``cache=True`` and the same keys,
+                          as long as the data isn't changed.
+                          Nothing is stored, if the container is opened read-only.
+                          Every distinct set of keys adds an attribute to the file.
 
         Note:
             The feature container has to be opened in advance.
 
         Returns:
-            DataStats: Statistics overall data points of all features.
+            StreamingStats: Statistics overall data points of all features.
         """
         self.raise_error_if_not_open()
+        self.flush()
+
+        keys = self._stats_keys(keys)
+        cache_name = None
+
+        if cache:
+            cache_name = _stats_cache_name(keys, per_dimension)
+            cached = self._get_cached_attr(cache_name)
+
+            if cached is not None:
+                return stats.StreamingStats.from_dict(json.loads(cached))
+
+        if num_workers > 1 and len(keys) > 1:
+            if not self._is_read_only():
+                raise ValueError('The container has to be opened read-only to compute stats with multiple workers!')
+
+            num_splits = min(len(keys), num_workers * 4)
+            splits = [keys[i::num_splits] for i in range(num_splits)]
+            worker = functools.partial(_compute_stats, self._reopen_factory(), per_dimension=per_dimension)
+
+            result = stats.StreamingStats(per_dimension=per_dimension)
+
+            with multiprocessing.Pool(num_workers) as p:
+                for split_stats in p.imap_unordered(worker, splits):
+                    result.merge(split_stats)
+        else:
+            result = stats.StreamingStats(per_dimension=per_dimension)
 
-        per_key_stats = self.stats_per_key()
+            for key in keys:
+                self._update_stats(result, key)
 
-        return stats.DataStats.concatenate(per_key_stats.values())
+        if cache_name is not None:
+            self._set_cached_attr(cache_name, json.dumps(result.to_dict()))
 
-    def stats_per_key(self):
+        return result
+
+    def stats_per_key(self, keys=None, per_dimension=False):
         """
         Return statistics calculated for each key in the container.
 
+        Args:
+            keys (list, Corpus): Only compute the statistics of these keys
+                                 (see :meth:`stats`). If ``None``, all keys are used.
+            per_dimension (bool): If ``True``, the statistics are computed
+                                  for every feature dimension (last dimension) separately.
+
         Note:
             The feature container has to be opened in advance.
 
         Returns:
-            dict: A dictionary containing a DataStats object for each key.
+            dict: A dictionary containing a StreamingStats object for each key.
         """
         self.raise_error_if_not_open()
+        self.flush()
 
         all_stats = {}
 
-        for key, data in self._file.items():
-            data = data[()]
-            all_stats[key] = stats.DataStats(float(np.mean(data)),
-                                             float(np.var(data)),
-                                             np.min(data),
-                                             np.max(data),
-                                             data.size)
+        for key in self._stats_keys(keys):
+            key_stats = stats.StreamingStats(per_dimension=per_dimension)
+            self._update_stats(key_stats, key)
+            all_stats[key] = key_stats
 
         return all_stats
+
+    def _stats_keys(self, keys):
+        """ Return the sorted list of keys to compute statistics for. """
+        if keys is None:
+            return list(self.index.sorted_keys())
+
+        if hasattr(keys, 'utterances'):
+            keys = keys.utterances.keys()
+
+        keys = sorted(keys)
+
+        for key in keys:
+            if key not in self.index:
+                raise ValueError('No data stored for key {}'.format(key))
+
+        return keys
+
+    def _update_stats(self, key_stats, key):
+        """ Add the data of the given key to the stats, reading blocks of rows. """
+        dset = self.get(key, mem_map=True)
+
+        if dset.ndim == 0:
+            key_stats.update(dset[()])
+            return
+
+        row_size = max(1, dset.dtype.itemsize * int(np.prod(dset.shape[1:])))
+        rows_per_block = max(1, STATS_BLOCK_SIZE // row_size)
+
+        for start in range(0, dset.shape[0], rows_per_block):
+            key_stats.update(dset[start:start + rows_per_block])
+
+    def _is_read_only(self):
+        """ Return ``True``, if the container file is opened read-only. """
+        return self._file.mode == 'r'
+
+    def _reopen_factory(self):
+        """
+        Return a picklable callable, that creates a new (closed) read-only
+        container for the same file. It is used to access the data from other processes.
+        """
+        return functools.partial(type(self), self.path, mode='r')
+
+
+def _stats_cache_name(keys, per_dimension):
+    """ Return the name of the cached stats for the given keys. """
+    key_hash = hashlib.sha1()
+
+    for key in keys:
+        key_hash.update(key.encode('utf-8'))
+        key_hash.update(b'\0')
+
+    key_hash.update(b'per-dimension' if per_dimension else b'global')
+
+    return 'stats-{}'.format(key_hash.hexdigest())
+
+
+def _compute_stats(container_factory, keys, per_dimension=False):
+    """ Compute the stats of the given keys in a worker process. """
+    cnt = container_factory()
+    result = stats.StreamingStats(per_dimension=per_dimension)
+
+    with cnt.open_if_needed(mode='r'):
+        for key in keys:
+            cnt._update_stats(result, key)  # skipcq: PYL-W0212
+
+    return result
@@ -0,0 +1,302 @@
+import h5py
+import numpy as np
+
+from . import storage
+
+INDEX_GROUP = '__index__'
+PUBLISHED_DATASET = '__published__'
+RESERVED_NAMES = (INDEX_GROUP, PUBLISHED_DATASET)
+SEPARATOR = '\0'
+
+
+class ContainerIndex:
+    """
+    An index of all arrays stored in a container.
+    For every key the shape, the type and the size in bytes
+    of the array is stored in numpy arrays.
+    This allows to query the metadata of all arrays,
+    without accessing every dataset in the HDF5 file.
+    The type and size are those of the array in memory, as returned by the container.
+    They differ from the stored data, if the data is stored with another type
+    (see :class:`audiomate.containers.StorageOptions`).
+
+    The index is stored within the HDF5 file of the container
+    in the group ``__index__``.
+    It is maintained by the container on every change
+    and written when the container is closed.
+
+    Args:
+        keys (list): The keys of the arrays.
+        shapes (list): The shape (tuple) of the array for every key.
+        dtypes (list): The type (numpy.dtype) of the array for every key.
+
+    Attributes:
+        keys (numpy.ndarray): The keys of the arrays (dtype object).
+        ndims (numpy.ndarray): The number of dimensions of every array.
+        shapes (numpy.ndarray): 2-D array with the shape of every array
+                                (padded with 0 for arrays
+                                with fewer dimensions).
+        dtypes (numpy.ndarray): The type of every array as string
+                                (e.g. ``<f4``, dtype object).
+        byte_sizes (numpy.ndarray): The size of every array in bytes.
+    """
+
+    __slots__ = ['keys', 'ndims', 'shapes', 'dtypes', 'byte_sizes', '_positions', '_pending', '_num_removed',
+                 '_sorted_keys']
+
+    def __init__(self, keys=None, shapes=None, dtypes=None):
+        keys = list(keys or [])
+        shapes = [tuple(int(x) for x in s) for s in (shapes or [])]
+        dtypes = [np.dtype(d).str for d in (dtypes or [])]
+
+        self._set_arrays(keys, shapes, dtypes)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __iter__(self):
+        self._compact()
+        return iter(self.keys)
+
+    def _set_arrays(self, keys, shapes, dtypes):
+        max_ndim = max([len(s) for s in shapes], default=0)
+
+        self.keys = np.empty(len(keys), dtype=object)
+        self.keys[:] = keys
+        self.ndims = np.array([len(s) for s in shapes], dtype=np.int8)
+        self.shapes = np.zeros((len(shapes), max_ndim), dtype=np.int64)
+        self.dtypes = np.empty(len(dtypes), dtype=object)
+        self.dtypes[:] = dtypes
+        self.byte_sizes = np.zeros(len(keys), dtype=np.int64)
+
+        for i, (shape, dtype) in enumerate(zip(shapes, dtypes)):
+            self.shapes[i, :len(shape)] = shape
+            self.byte_sizes[i] = int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        self._positions = {key: i for i, key in enumerate(keys)}
+        self._pending = []
+        self._num_removed = 0
+        self._sorted_keys = None
+
+    def _compact(self):
+        """ Merge the pending changes into the arrays. """
+        if not self._pending and self._num_removed == 0:
+            return
+
+        keys = []
+        shapes = []
+        dtypes = []
+
+        for i, key in enumerate(self.keys):
+            if key is not None:
+                keys.append(key)
+                shapes.append(tuple(self.shapes[i, :self.ndims[i]]))
+                dtypes.append(self.dtypes[i])
+
+        for key, shape, dtype in self._pending:
+            if key is not None:
+                keys.append(key)
+                shapes.append(shape)
+                dtypes.append(dtype)
+
+        self._set_arrays(keys, shapes, dtypes)
+
+    def _entry(self, key):
+        """ Return shape and type of the given key, ``None`` if not in the index. """
+        pos = self._positions.get(key, None)
+
+        if pos is None:
+            return None
+
+        if pos >= len(self.keys):
+            _, shape, dtype = self._pending[pos - len(self.keys)]
+            return shape, dtype
+
+        return tuple(int(x) for x in self.shapes[pos, :self.ndims[pos]]), self.dtypes[pos]
+
+    def sorted_keys(self):
+        """ Return a sorted list of all keys. """
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._positions.keys())
+
+        return list(self._sorted_keys)
+
+    def shape(self, key):
+        """ Return the shape of the array with the given key, ``None`` if not in the index. """
+        entry = self._entry(key)
+
+        if entry is not None:
+            return entry[0]
+
+        return None
+
+    def dtype(self, key):
+        """ Return the type of the array with the given key, ``None`` if not in the index. """
+        entry = self._entry(key)
+
+        if entry is not None:
+            return np.dtype(entry[1])
+
+        return None
+
+    def num_rows(self, key):
+        """
+        Return the length of the first dimension of the array with the given key,
+        ``None`` if not in the index.
+        """
+        shape = self.shape(key)
+
+        if shape is not None:
+            return shape[0] if len(shape) > 0 else 1
+
+        return None
+
+    def byte_size(self, key):
+        """ Return the size in bytes of the array with the given key, ``None`` if not in the index. """
+        entry = self._entry(key)
+
+        if entry is not None:
+            return int(np.prod(entry[0])) * np.dtype(entry[1]).itemsize
+
+        return None
+
+    def update(self, key, shape, dtype):
+        """ Add or update the entry for the given key. """
+        shape = tuple(int(x) for x in shape)
+        dtype = np.dtype(dtype).str
+        pos = self._positions.get(key, None)
+
+        if pos is not None and pos < len(self.keys) and len(shape) <= self.shapes.shape[1]:
+            self.ndims[pos] = len(shape)
+            self.shapes[pos] = 0
+            self.shapes[pos, :len(shape)] = shape
+            self.dtypes[pos] = dtype
+            self.byte_sizes[pos] = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        elif pos is not None and pos >= len(self.keys):
+            self._pending[pos - len(self.keys)] = (key, shape, dtype)
+        else:
+            if pos is not None:
+                self._remove_at(pos)
+
+            self._positions[key] = len(self.keys) + len(self._pending)
+            self._pending.append((key, shape, dtype))
+            self._sorted_keys = None
+
+    def remove(self, key):
+        """ Remove the entry for the given key, if it exists. """
+        pos = self._positions.pop(key, None)
+
+        if pos is not None:
+            self._remove_at(pos)
+            self._sorted_keys = None
+
+    def _remove_at(self, pos):
+        if pos >= len(self.keys):
+            self._pending[pos - len(self.keys)] = (None, None, None)
+        else:
+            self.keys[pos] = None
+
+        self._num_removed += 1
+
+    def to_arrays(self):
+        """
+        Return the index as dictionary of flat numpy arrays,
+        which can be stored in a file (HDF5 or ``.npz``).
+        The keys and types are stored as null-separated UTF-8 bytes.
+        """
+        self._compact()
+
+        return {
+            'keys': _join(self.keys),
+            'ndims': self.ndims,
+            'shapes': self.shapes,
+            'dtypes': _join(self.dtypes)
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Create the index from arrays created with :meth:`to_arrays`.
+        ``arrays`` can be any mapping (e.g. a HDF5 group or a loaded ``.npz`` file).
+        Returns ``None`` if the arrays are not complete.
+        """
+        if not all(name in arrays for name in ['keys', 'ndims', 'shapes', 'dtypes']):
+            return None
+
+        keys = _split(arrays['keys'][()])
+        ndims = arrays['ndims'][()]
+        shapes = arrays['shapes'][()]
+        dtypes = _split(arrays['dtypes'][()])
+
+        index = cls()
+        index.keys = np.empty(len(keys), dtype=object)
+        index.keys[:] = keys
+        index.ndims = ndims.astype(np.int8)
+        index.shapes = shapes.astype(np.int64)
+        index.dtypes = np.empty(len(dtypes), dtype=object)
+        index.dtypes[:] = dtypes
+
+        itemsizes = np.array([np.dtype(d).itemsize for d in dtypes], dtype=np.int64)
+        padded = np.where(np.arange(index.shapes.shape[1]) < index.ndims[:, None], index.shapes, 1)
+        index.byte_sizes = np.prod(padded, axis=1, dtype=np.int64) * itemsizes
+
+        index._positions = {key: i for i, key in enumerate(keys)}
+
+        return index
+
+    def write(self, group):
+        """
+        Store the index in the given HDF5 group.
+        Existing datasets in the group are replaced.
+        """
+        for name in list(group.keys()):
+            del group[name]
+
+        for name, data in self.to_arrays().items():
+            group.create_dataset(name, data=data)
+
+    @classmethod
+    def read(cls, group):
+        """
+        Load the index from the given HDF5 group.
+        Returns ``None`` if the group contains no (complete) index.
+        """
+        return cls.from_arrays(group)
+
+    @classmethod
+    def scan(cls, group, exclude=RESERVED_NAMES, strip_levels=0):
+        """
+        Create the index by reading the metadata of all datasets in the given HDF5 group.
+        This is used for containers without a (valid) stored index.
+        ``strip_levels`` is the number of (shard) groups,
+        that are removed from the path of a dataset to get the key.
+        """
+        keys = []
+        shapes = []
+        dtypes = []
+
+        def visit(name, obj):
+            if isinstance(obj, h5py.Dataset) and name.split('/')[0] not in exclude:
+                keys.append(name.split('/', strip_levels)[-1])
+                shapes.append(obj.shape)
+                dtypes.append(storage.decoded_dtype(obj))
+
+        group.visititems(visit)
+
+        return cls(keys, shapes, dtypes)
+
+
+def _join(values):
+    """ Encode a list of strings as a single byte-array (strings separated by null-bytes). """
+    return np.frombuffer(SEPARATOR.join(values).encode('utf-8'), dtype=np.uint8)
+
+
+def _split(data):
+    """ Decode a byte-array created with ``_join``. """
+    if len(data) == 0:
+        return []
+
+    return bytes(data).decode('utf-8').split(SEPARATOR)
@@ -0,0 +1,213 @@
+"""
+Operations to create containers from the data of other containers,
+without converting the data (see :func:`copy_keys`).
+"""
+import os
+
+import numpy as np
+
+from . import audio
+from . import features
+from . import ragged
+from . import storage
+from . import virtual
+from audiomate import tracks
+
+ENCODING_ATTRS = [storage.DECODED_DTYPE_ATTR, storage.SCALE_ATTR, storage.OFFSET_ATTR]
+
+
+def copy_keys(source, target, keys, batch_size=1000):
+    """
+    Copy the arrays of the given keys from one container to another.
+    Existing arrays in the target container are overwritten.
+
+    For HDF5 based containers the datasets are copied with their attributes
+    by HDF5 itself, so the data isn't decoded and at most one array is kept in memory.
+    Compression, chunking and the storage type of every array are kept.
+    For :class:`audiomate.containers.RaggedContainer` the arrays are read and written
+    in batches of ``batch_size`` arrays.
+
+    The attributes of the source file, that describe the data
+    (e.g. ``frame-size``, ``hop-size`` and ``sampling-rate``),
+    are copied to the target as well.
+
+    Args:
+        source (Container): The container to copy the data from.
+        target (Container): The container to copy the data to.
+        keys (list): The keys of the arrays to copy.
+        batch_size (int): Number of arrays to read at once, if the data can't be copied by HDF5.
+
+    Raises:
+        ValueError: If a key doesn't exist in the source container
+                    or an attribute of the target file differs from the source.
+    """
+    with source.open_if_needed(mode='r'), target.open_if_needed():
+        source_attrs = source._data_attrs()  # skipcq: PYL-W0212
+
+        _check_attrs(source_attrs, target._data_attrs(), source.path, target.path)  # skipcq: PYL-W0212
+        _check_keys(source, keys)
+
+        for name, value in source_attrs.items():
+            target._set_data_attr(name, value)  # skipcq: PYL-W0212
+
+        if isinstance(source, ragged.RaggedContainer) or isinstance(target, ragged.RaggedContainer):
+            _copy_arrays(source, target, list(keys), batch_size)
+        else:
+            _copy_datasets(source, target, keys)
+
+
+def subset(container, corpus_view, path):
+    """
+    Create a new container with the arrays of the utterances of the given corpus or subview
+    (e.g. the ``train`` subview created by a splitter). For an
+    :class:`audiomate.containers.AudioContainer` the arrays of the tracks are used instead,
+    i.e. the keys of all :class:`audiomate.tracks.ContainerTrack`, that are stored in this container.
+    The data is copied with :func:`copy_keys`.
+
+    Args:
+        container (Container): The container to copy the data from.
+        corpus_view (CorpusView): The corpus or subview.
+        path (str): Path of the new container. An existing file is overwritten.
+
+    Returns:
+        Container: The new container (closed), with the same type as ``container``
+        (:class:`audiomate.containers.FeatureContainer` for a
+        :class:`audiomate.containers.VirtualFeatureContainer`).
+
+    Example:
+        >>> splits = splitter.split(proportions={'train': 0.8, 'test': 0.2})
+        >>> train_features = subset(features, splits['train'], '/path/to/train_features.hdf5')
+    """
+    if isinstance(container, audio.AudioContainer):
+        container_path = os.path.abspath(container.path)
+        keys = sorted({
+            track.key for track in corpus_view.tracks.values()
+            if isinstance(track, tracks.ContainerTrack) and os.path.abspath(track.container.path) == container_path
+        })
+    else:
+        keys = sorted(corpus_view.utterances.keys())
+
+    target = _create_target(container, path)
+
+    with container.open_if_needed(mode='r'):
+        target.open(mode='w')
+
+        try:
+            copy_keys(container, target, keys)
+        finally:
+            target.close()
+
+    return target
+
+
+def merge(containers, path):
+    """
+    Create a new container with the arrays of all given containers
+    (e.g. containers with features extracted on different machines).
+    The data is copied with :func:`copy_keys`.
+
+    Every key may only be contained in one of the containers
+    and the attributes describing the data (e.g. ``frame-size``) have to be equal.
+    This is checked before any data is copied.
+
+    Args:
+        containers (list): The containers to merge.
+        path (str): Path of the new container. An existing file is overwritten.
+
+    Returns:
+        Container: The new container (closed), with the same type as the first container
+        (:class:`audiomate.containers.FeatureContainer` for a
+        :class:`audiomate.containers.VirtualFeatureContainer`).
+
+    Raises:
+        ValueError: If a key is contained in multiple containers
+                    or the attributes of the containers differ.
+    """
+    if len(containers) == 0:
+        raise ValueError('At least one container is required!')
+
+    key_to_path = {}
+    attrs = {}
+
+    for cnt in containers:
+        with cnt.open_if_needed(mode='r'):
+            _check_attrs(cnt._data_attrs(), attrs, cnt.path, containers[0].path)  # skipcq: PYL-W0212
+            attrs.update(cnt._data_attrs())  # skipcq: PYL-W0212
+
+            for key in cnt.keys():
+                if key in key_to_path:
+                    raise ValueError('The key {} is contained in multiple containers ({} / {})!'.format(
+                        key, key_to_path[key], cnt.path
+                    ))
+
+                key_to_path[key] = cnt.path
+
+    target = _create_target(containers[0], path)
+    target.open(mode='w')
+
+    try:
+        for cnt in containers:
+            with cnt.open_if_needed(mode='r'):
+                copy_keys(cnt, target, cnt.keys())
+    finally:
+        target.close()
+
+    return target
+
+
+def _create_target(container, path):
+    """ Create a (closed) container of the matching type for the given path. """
+    if isinstance(container, virtual.VirtualFeatureContainer):
+        return features.FeatureContainer(path)
+
+    if isinstance(container, ragged.RaggedContainer):
+        return ragged.RaggedContainer(path)
+
+    return type(container)(path, storage=container.storage, shard_levels=container.shard_levels)
+
+
+def _check_attrs(source_attrs, target_attrs, source_path, target_path):
+    """ Raise an error, if an attribute differs in both dictionaries. """
+    for name, value in source_attrs.items():
+        if name in target_attrs and not np.array_equal(target_attrs[name], value):
+            raise ValueError('The attribute {} differs between the containers ({} / {})!'.format(
+                name, source_path, target_path
+            ))
+
+
+def _check_keys(source, keys):
+    """ Raise an error, if a key doesn't exist in the container. """
+    index = source.index
+
+    for key in keys:
+        if key not in index:
+            raise ValueError('No data stored for key {}'.format(key))
+
+
+def _copy_datasets(source, target, keys):
+    """ Copy the datasets of the keys with HDF5 from one file to the other. """
+    target_file = target._file  # skipcq: PYL-W0212
+
+    for key in keys:
+        dset = source._dataset(key)  # skipcq: PYL-W0212
+        target_path = target._dataset_path(key)  # skipcq: PYL-W0212
+        group_path, name = os.path.split(target_path)
+
+        target._discard_buffered(key)  # skipcq: PYL-W0212
+        target._delete_dataset(key)  # skipcq: PYL-W0212
+
+        group = target_file.require_group(group_path) if group_path else target_file
+        group.copy(dset, name)
+
+        encoding_attrs = {attr: value for attr, value in dset.attrs.items() if attr in ENCODING_ATTRS}
+        target._set_encoding_attrs(group[name], encoding_attrs)  # skipcq: PYL-W0212
+        target._update_index(key)  # skipcq: PYL-W0212
+
+
+def _copy_arrays(source, target, keys, batch_size):
+    """ Copy the arrays by reading and writing them in batches. """
+    for start in range(0, len(keys), batch_size):
+        batch_keys = keys[start:start + batch_size]
+
+        for key, data in zip(batch_keys, source.get_many(batch_keys)):
+            target.set(key, data)
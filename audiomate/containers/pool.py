@@ -0,0 +1,252 @@
+import collections
+import contextlib
+import os
+import threading
+import time
+
+import h5py
+
+_default_pool = None
+
+
+class HandlePool:
+    """
+    A pool of read-only HDF5 file handles, that are shared within a process.
+    A handle is kept open for ``max_idle`` seconds after it is released,
+    so that it can be reused by successive reads of the same file.
+    Afterwards it is closed (by a background timer), so the file isn't locked
+    for writers in other processes and changes written by them are visible
+    to the next read. If more than ``max_open`` files are open,
+    the least recently used handles, that are not in use, are closed.
+
+    Handles are never shared across processes. If the pool is used
+    in a forked process, the handles of the parent process are discarded
+    and the files are opened again.
+
+    Args:
+        max_open (int): The maximal number of files to keep open.
+                        Files that are in use are never closed, so the
+                        limit may be exceeded temporarily.
+        max_idle (float): Number of seconds a handle is kept open,
+                          after it was released. ``0`` closes the handle
+                          once it isn't used anymore, ``None`` keeps it
+                          open until it is discarded or the limit is reached.
+
+    Attributes:
+        num_opens (int): Number of times a file was opened.
+        num_closes (int): Number of times a file was closed.
+        num_reuses (int): Number of times an already open handle was reused.
+
+    Example:
+        >>> pool = HandlePool(max_open=16)
+        >>> with pool.handle('/path/to/hdf5file') as f:
+        >>>     data = f['utt-1'][()]
+    """
+
+    def __init__(self, max_open=64, max_idle=1.0):
+        self.max_open = max_open
+        self.max_idle = max_idle
+
+        self.num_opens = 0
+        self.num_closes = 0
+        self.num_reuses = 0
+
+        self._handles = collections.OrderedDict()
+        self._ref_counts = collections.defaultdict(int)
+        self._release_times = {}
+        self._lock = threading.RLock()
+        self._timer = None
+        self._pid = os.getpid()
+
+    @property
+    def num_open(self):
+        """ Return the number of currently open files. """
+        return len(self._handles)
+
+    def acquire(self, path):
+        """
+        Return an open read-only handle (``h5py.File``) for the given path.
+        Every call has to be followed by a call of :meth:`release`,
+        once the handle isn't used anymore.
+
+        Args:
+            path (str): Path of the HDF5 file.
+
+        Returns:
+            h5py.File: The open file.
+        """
+        path = os.path.abspath(path)
+        self._discard_if_forked()
+
+        with self._lock:
+            handle = self._handles.get(path, None)
+
+            if handle is None:
+                handle = h5py.File(path, mode='r')
+                self._handles[path] = handle
+                self.num_opens += 1
+            else:
+                self._handles.move_to_end(path)
+                self.num_reuses += 1
+
+            self._ref_counts[path] += 1
+            self._close_unused()
+
+            return handle
+
+    def release(self, path):
+        """
+        Release a handle that was acquired with :meth:`acquire`.
+        If the handle isn't used anymore, the file is kept open for ``max_idle`` seconds,
+        as long as the limit of open files isn't reached.
+
+        Args:
+            path (str): Path of the HDF5 file.
+        """
+        path = os.path.abspath(path)
+        self._discard_if_forked()
+
+        with self._lock:
+            if self._ref_counts.get(path, 0) > 1:
+                self._ref_counts[path] -= 1
+                return
+
+            self._ref_counts.pop(path, None)
+
+            if path not in self._handles:
+                return
+
+            if self.max_idle is not None and self.max_idle <= 0:
+                self._close(path)
+                return
+
+            self._release_times[path] = time.monotonic()
+            self._close_unused()
+
+            if self.max_idle is not None and self._timer is None:
+                self._schedule_close_idle(self.max_idle)
+
+    @contextlib.contextmanager
+    def handle(self, path):
+        """
+        Context-manager to acquire and release the handle for the given path.
+
+        Args:
+            path (str): Path of the HDF5 file.
+        """
+        handle = self.acquire(path)
+
+        try:
+            yield handle
+        finally:
+            self.release(path)
+
+    def discard(self, path):
+        """
+        Close the handle for the given path, if it is not in use.
+        This is needed before the file is opened with another mode.
+
+        Args:
+            path (str): Path of the HDF5 file.
+
+        Returns:
+            bool: ``True`` if no handle for the file is open anymore,
+            ``False`` if the handle is still in use.
+        """
+        path = os.path.abspath(path)
+        self._discard_if_forked()
+
+        with self._lock:
+            if path not in self._handles:
+                return True
+
+            if self._ref_counts.get(path, 0) > 0:
+                return False
+
+            self._close(path)
+            return True
+
+    def close_all(self):
+        """ Close all handles, that are not in use. """
+        self._discard_if_forked()
+
+        with self._lock:
+            for path in list(self._handles.keys()):
+                if self._ref_counts.get(path, 0) <= 0:
+                    self._close(path)
+
+    def _close_unused(self):
+        """ Close least recently used handles, until the limit of open files is reached. """
+        for path in list(self._handles.keys()):
+            if len(self._handles) <= self.max_open:
+                break
+
+            if self._ref_counts.get(path, 0) <= 0:
+                self._close(path)
+
+    def _close(self, path):
+        self._handles.pop(path).close()
+        self._release_times.pop(path, None)
+        self.num_closes += 1
+
+    def _schedule_close_idle(self, delay):
+        self._timer = threading.Timer(delay, self._close_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _close_idle(self):
+        """ Close the handles, that weren't used for ``max_idle`` seconds. """
+        with self._lock:
+            self._timer = None
+
+            if os.getpid() != self._pid or self.max_idle is None:
+                return
+
+            now = time.monotonic()
+            next_close = None
+
+            for path in list(self._handles.keys()):
+                if self._ref_counts.get(path, 0) > 0:
+                    continue
+
+                idle_time = now - self._release_times.get(path, now)
+
+                if idle_time >= self.max_idle:
+                    self._close(path)
+                elif next_close is None or self.max_idle - idle_time < next_close:
+                    next_close = self.max_idle - idle_time
+
+            if next_close is not None:
+                self._schedule_close_idle(next_close)
+
+    def _discard_if_forked(self):
+        """
+        Drop the handles inherited from the parent process, without closing them.
+        They are still used by the parent. The lock is created again,
+        since it may have been held by another thread (e.g. the timer) while forking.
+        """
+        pid = os.getpid()
+
+        if pid != self._pid:
+            self._handles = collections.OrderedDict()
+            self._ref_counts = collections.defaultdict(int)
+            self._release_times = {}
+            self._timer = None
+            self._lock = threading.RLock()
+            self._pid = pid
+
+
+def default_handle_pool():
+    """
+    Return the handle pool shared within the process.
+    It is used by :meth:`audiomate.containers.Container.open_pooled`.
+
+    Returns:
+        HandlePool: The pool.
+    """
+    global _default_pool
+
+    if _default_pool is None:
+        _default_pool = HandlePool()
+
+    return _default_pool
@@ -0,0 +1,488 @@
+import contextlib
+import json
+import os
+
+import numpy as np
+
+from . import container
+from . import index as container_index
+
+INDEX_SUFFIX = '.index.npz'
+ALIGNMENT = 64
+
+
+class RaggedContainer(container.Container):
+    """
+    A container, that stores all arrays in a single flat binary file,
+    instead of a HDF5 file. The file is memory-mapped for reading,
+    so :meth:`get` returns views into the file without copying any data.
+    The key, shape, type and byte-offset of every array
+    is stored in a separate index file (``<path>.index.npz``).
+
+    In contrast to HDF5 files, the memory-mapped file can be shared across forked processes
+    and there is no overhead per array, which makes it suitable for millions of small arrays.
+    Data is only ever appended to the file. If an array is overwritten, removed or data is appended
+    to an array that is not at the end of the file, the previous data remains in the file as unused space.
+    Use :meth:`from_container` to create a compact copy.
+
+    It has the same interface as :class:`audiomate.containers.Container`,
+    so it can be used with the datasets and iterators in :mod:`audiomate.feeding`.
+    Compression and per-array attributes are not supported.
+    Attributes of the whole container can be stored in :attr:`attrs`.
+
+    Args:
+        path (str): Path of the data file. If the file doesn't exist, one is created.
+        mode (str): Either 'r' for read-only, 'w' for truncate and write or
+                    'a' for append. (default: 'a').
+
+    Example:
+        >>> rc = RaggedContainer('/path/to/data.bin')
+        >>> with rc:
+        >>>     rc.set('utt-1', np.array([1,2,3,4]))
+        >>>     data = rc.get('utt-1')
+        array([1, 2, 3, 4])
+    """
+
+    def __init__(self, path, mode='a'):
+        super(RaggedContainer, self).__init__(path, mode=mode)
+
+        self.attrs = {}
+
+        self._mode = None
+        self._data_file = None
+        self._data = None
+        self._data_end = 0
+        self._offsets = {}
+
+    @property
+    def index_path(self):
+        """ Return the path of the index file. """
+        return '{}{}'.format(self.path, INDEX_SUFFIX)
+
+    def open(self, mode=None):
+        """
+        Open the container file.
+
+        Args:
+            mode (str): Either 'r' for read-only, 'w' for truncate and write or
+                        'a' for append. (default: 'a').
+                        If ``None``, uses ``self.mode``.
+        """
+        if mode is None:
+            mode = self.mode
+        elif mode not in ['r', 'w', 'a']:
+            raise ValueError("Invalid mode! Modes: ['a', 'r', 'w']")
+
+        if self.is_open():
+            return
+
+        if mode == 'r' and not os.path.isfile(self.path):
+            raise ValueError('The container {} does not exist!'.format(self.path))
+
+        if mode == 'w' or not os.path.isfile(self.path):
+            open(self.path, 'wb').close()
+            self._index = container_index.ContainerIndex()
+            self._offsets = {}
+            self.attrs = {}
+            self._index_changed = True
+        else:
+            self._read_index()
+            self._index_changed = False
+
+        if mode != 'r':
+            self._data_file = open(self.path, 'r+b')
+            self._data_file.seek(0, os.SEEK_END)
+
+        self._mode = mode
+        self._data_end = os.path.getsize(self.path)
+
+    def close(self):
+        """ Close the container file if its open. """
+        if self.is_open():
+            self.flush()
+            self._write_index()
+
+            if self._data_file is not None:
+                self._data_file.close()
+
+            self._data_file = None
+            self._data = None
+            self._mode = None
+            self._index = None
+            self._offsets = {}
+
+    def is_open(self):
+        """
+        Return ``True``, if container is already open.
+        ``False`` otherwise.
+        """
+        return self._mode is not None
+
+    def raise_error_if_not_open(self):
+        """ Check if container is opened, raise error if not. """
+        if not self.is_open():
+            raise ValueError('The container is not opened!')
+
+    @contextlib.contextmanager
+    def open_pooled(self):
+        """
+        Context-manager for read-only access.
+        Memory-mapping the file is cheap, so in contrast to
+        :meth:`audiomate.containers.Container.open_pooled` no handles are pooled.
+        """
+        with self.open_if_needed(mode='r'):
+            yield self
+
+    def get(self, key, mem_map=True):
+        """
+        Read and return the data stored for the given key.
+
+        Args:
+            key (str): The key to read the data from.
+            mem_map (bool): If ``True`` returns a read-only view
+                            into the memory-mapped file,
+                            otherwise a copy is returned.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            numpy.ndarray: The stored data.
+        """
+        self.raise_error_if_not_open()
+        self.flush(key)
+
+        if key not in self._index:
+            return None
+
+        data = self._view(key)
+
+        if not mem_map:
+            data = np.array(data)
+
+        return data
+
+    def get_many(self, keys, contiguous=False):
+        """
+        Read and return the data stored for all given keys.
+        The arrays are copied in the order they are stored in the file
+        (not in the order of ``keys``), to reduce seeking.
+
+        Args:
+            keys (list): The keys to read the data from.
+            contiguous (bool): If ``True``, the data of all keys is copied
+                               into a single preallocated array,
+                               concatenated along the first dimension.
+                               This requires that all arrays have
+                               the same type and the same dimensions
+                               (except the first).
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            list: If ``contiguous == False``, a list with the data for every key
+            (in the order of ``keys``).
+
+            tuple: If ``contiguous == True``, a tuple with the array containing the data of all keys
+            and an array with ``len(keys) + 1`` offsets. The data of ``keys[i]`` is
+            ``data[offsets[i]:offsets[i + 1]]``.
+        """
+        self.raise_error_if_not_open()
+        self.flush()
+
+        for key in keys:
+            if key not in self._index:
+                raise ValueError('No data stored for key {}'.format(key))
+
+        read_order = sorted(range(len(keys)), key=lambda i: self._offsets[keys[i]])
+
+        if not contiguous:
+            result = [None] * len(keys)
+
+            for i in read_order:
+                result[i] = np.array(self._view(keys[i]))
+
+            return result
+
+        shapes = [self._index.shape(key) for key in keys]
+        dtypes = {self._index.dtype(key) for key in keys}
+        row_shapes = {shape[1:] for shape in shapes}
+
+        if len(keys) > 0 and (len(dtypes) > 1 or len(row_shapes) > 1 or () in shapes):
+            raise ValueError('Only arrays of the same type and dimensions can be read contiguously!')
+
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([shape[0] for shape in shapes])
+
+        if len(keys) > 0:
+            data = np.empty((offsets[-1],) + row_shapes.pop(), dtype=dtypes.pop())
+        else:
+            data = np.empty(0)
+
+        for i in read_order:
+            data[offsets[i]:offsets[i + 1]] = self._view(keys[i])
+
+        return data, offsets
+
+    def set(self, key, data, storage=None):
+        """
+        Set the given data to the container with the given key.
+        Any existing data for the given key is discarded/overwritten.
+
+        Args:
+            key (str): A key to store the data for.
+            data (numpy.ndarray): Array-like data.
+            storage (StorageOptions): Ignored, since compression
+                                      and chunking is not supported.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self._raise_error_if_read_only()
+        self._discard_buffered(key)
+
+        self._write_array(key, np.asarray(data))
+
+    def remove(self, key):
+        """
+        Remove the data stored for the given key.
+        The data remains in the file as unused space.
+
+        Args:
+            key (str): Key of the data to remove.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self._raise_error_if_read_only()
+        self._discard_buffered(key)
+
+        if key in self._index:
+            self._index.remove(key)
+            del self._offsets[key]
+            self._index_changed = True
+
+    def declare(self, key, row_shape=(), dtype=np.float32, storage=None):
+        """
+        Create an empty array for the given key, to which data can be appended.
+
+        Args:
+            key (str): The key.
+            row_shape (tuple): The dimensions of the data, except the first.
+            dtype (numpy.dtype): The type of the data.
+            storage (StorageOptions): Ignored, since compression
+                                      and chunking is not supported.
+
+        Note:
+            The container has to be opened in advance.
+        """
+        self.raise_error_if_not_open()
+        self._raise_error_if_read_only()
+        self._discard_buffered(key)
+
+        self._write_array(key, np.empty((0,) + tuple(row_shape), dtype=dtype))
+
+    def start_swmr(self):
+        """
+        Not supported, since the memory-mapped file can be read
+        by other processes anyway, once the index is written (see :meth:`close`).
+        """
+        raise ValueError('SWMR mode is not supported by a ragged container!')
+
+    def publish(self, key):
+        """ Not supported (see :meth:`start_swmr`). """
+        raise ValueError('SWMR mode is not supported by a ragged container!')
+
+    def refresh(self):
+        """
+        Does nothing, since the SWMR mode is not supported (see :meth:`start_swmr`).
+
+        Returns:
+            list: An empty list.
+        """
+        self.raise_error_if_not_open()
+        return []
+
+    @classmethod
+    def from_container(cls, source, path, batch_size=1000):
+        """
+        Create a ragged container with all arrays of the given container
+        (e.g. a HDF5 based :class:`audiomate.containers.FeatureContainer`).
+        The attributes of the source file are copied to :attr:`attrs`.
+
+        Args:
+            source (Container): The container to copy the data from.
+            path (str): Path of the data file of the new container.
+                        An existing file is overwritten.
+            batch_size (int): Number of arrays to read at once from the source.
+
+        Returns:
+            RaggedContainer: The created container (closed).
+        """
+        target = cls(path)
+
+        with source.open_if_needed(mode='r'):
+            target.open(mode='w')
+
+            try:
+                if isinstance(source, RaggedContainer):
+                    target.attrs = dict(source.attrs)
+                else:
+                    file_attrs = source._file.attrs  # skipcq: PYL-W0212
+                    target.attrs = {key: _to_json_value(value) for key, value in file_attrs.items()}
+
+                keys = source.keys()
+
+                for start in range(0, len(keys), batch_size):
+                    batch_keys = keys[start:start + batch_size]
+
+                    for key, data in zip(batch_keys, source.get_many(batch_keys)):
+                        target.set(key, data)
+            finally:
+                target.close()
+
+        return target
+
+    def _load_index(self):
+        return self._index
+
+    def _data_attrs(self):
+        return dict(self.attrs)
+
+    def _set_data_attr(self, name, value):
+        self.attrs[name] = _to_json_value(value)
+
+    def _update_index(self, key):
+        """ The index is updated directly when writing. """
+
+    def _write_appended(self, key, data, attrs=None, storage=None, chunks=True):
+        """
+        Append the data to the existing data of the key.
+        If the existing data is at the end of the file, the new data is written after it,
+        otherwise all data of the key is written again at the end of the file.
+        """
+        self._raise_error_if_read_only()
+
+        data = np.asarray(data)
+        shape = self._index.shape(key)
+
+        if shape is None:
+            self._write_array(key, data)
+            return
+
+        if shape[1:] != data.shape[1:]:
+            error_msg = (
+                'The data to append needs to'
+                'have the same dimensions ({}).'
+            )
+            raise ValueError(error_msg.format(shape[1:]))
+
+        dtype = self._index.dtype(key)
+        data = np.ascontiguousarray(data, dtype=dtype)
+
+        if self._offsets[key] + self._index.byte_size(key) == self._data_end:
+            self._data_file.write(data.data)
+            self._data_end += data.nbytes
+            self._index.update(key, (shape[0] + data.shape[0],) + shape[1:], dtype)
+            self._index_changed = True
+        else:
+            self._write_array(key, np.concatenate([self._view(key), data]))
+
+    def _write_array(self, key, data):
+        """ Write the array at the end of the file (aligned) and add it to the index. """
+        data = np.ascontiguousarray(data)
+
+        if data.dtype.hasobject:
+            raise ValueError('Arrays with python objects can not be stored!')
+
+        padding = -self._data_end % ALIGNMENT
+
+        self._data_file.write(b'\0' * padding)
+        self._data_file.write(data.data)
+
+        self._offsets[key] = self._data_end + padding
+        self._data_end += padding + data.nbytes
+        self._index.update(key, data.shape, data.dtype)
+        self._index_changed = True
+
+    def _view(self, key):
+        """ Return a read-only view of the data of the given key. """
+        offset = self._offsets[key]
+        size = self._index.byte_size(key)
+
+        if self._data is None or len(self._data) < offset + size:
+            self._map_data()
+
+        return self._data[offset:offset + size].view(self._index.dtype(key)).reshape(self._index.shape(key))
+
+    def _map_data(self):
+        """ (Re-)create the memory-map of the data file. """
+        if self._data_file is not None:
+            self._data_file.flush()
+
+        if self._data_end > 0:
+            mapped = np.memmap(self.path, dtype=np.uint8, mode='r', shape=(self._data_end,))
+            self._data = mapped.view(np.ndarray)
+        else:
+            self._data = np.empty(0, dtype=np.uint8)
+
+    def _read_index(self):
+        if not os.path.isfile(self.index_path):
+            if os.path.getsize(self.path) > 0:
+                raise ValueError('The index of the container {} is missing!'.format(self.path))
+
+            self._index = container_index.ContainerIndex()
+            self._offsets = {}
+            self.attrs = {}
+            return
+
+        with np.load(self.index_path) as arrays:
+            index = container_index.ContainerIndex.from_arrays(arrays)
+            offsets = arrays['offsets']
+            attrs = json.loads(str(arrays['attrs']))
+
+        self._index = index
+        self._offsets = dict(zip(index.keys.tolist(), offsets.tolist()))
+        self.attrs = attrs
+
+    def _write_index(self):
+        """ Store the index, if it was changed. The file is replaced atomically. """
+        if not self._index_changed or self._mode == 'r':
+            return
+
+        arrays = self._index.to_arrays()
+        arrays['offsets'] = np.array([self._offsets[key] for key in self._index.keys], dtype=np.int64)
+        arrays['attrs'] = np.array(json.dumps(self.attrs))
+
+        if self._data_file is not None:
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+
+        tmp_path = '{}.tmp'.format(self.index_path)
+
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+
+        os.replace(tmp_path, self.index_path)
+        self._index_changed = False
+
+    def _raise_error_if_read_only(self):
+        if self._data_file is None:
+            raise ValueError('The container is opened read-only!')
+
+
+def _to_json_value(value):
+    """ Convert a (numpy) attribute value to a value, that can be stored as JSON. """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+
+    return value
@@ -0,0 +1,469 @@
+import numpy as np
+
+COMPRESSION_ATTR = 'storage-compression'
+COMPRESSION_LEVEL_ATTR = 'storage-compression-level'
+SHUFFLE_ATTR = 'storage-shuffle'
+CHUNK_SHAPE_ATTR = 'storage-chunk-shape'
+FRAMES_PER_CHUNK_ATTR = 'storage-frames-per-chunk'
+DTYPE_ATTR = 'storage-dtype'
+SCALE_PER_ATTR = 'storage-scale-per'
+
+DECODED_DTYPE_ATTR = 'decoded-dtype'
+SCALE_ATTR = 'quantization-scale'
+OFFSET_ATTR = 'quantization-offset'
+
+SCALE_PER_VALUES = ['key', 'dimension']
+
+CHUNK_SIZE = 512 * 1024
+
+
+class StorageOptions:
+    """
+    Options how the arrays of a container are stored in the HDF5 file.
+    Compressed and chunked datasets are read transparently by h5py,
+    so the options only have to be known when writing data.
+
+    Args:
+        compression (str): The compression filter to use
+                           (e.g. ``gzip``, ``lzf``).
+                           If ``None``, the data isn't compressed.
+        compression_level (int): The level of compression
+                                 (for ``gzip`` between 0 and 9).
+                                 If ``None`` the default level is used.
+        shuffle (bool): If ``True``, the shuffle filter is applied
+                        before compression, which usually improves the
+                        compression of numerical data.
+        chunk_shape (tuple): An explicit shape of the chunks.
+                             Dimensions larger than the data
+                             are reduced to the size of the data.
+        frames_per_chunk (int): Number of frames (rows along the first
+                                dimension) per chunk. A chunk always
+                                contains all other dimensions.
+                                Ignored if ``chunk_shape`` is given.
+        dtype (str): The type floating point data is stored with
+                     (``float32``, ``float16``, ``int16`` or ``int8``).
+                     When the data is read, it is converted back to floats
+                     (at least ``float32``). For integer types the values are
+                     scaled linearly to the range of the type.
+                     If ``None``, the data is stored as it is passed.
+        scale_per (str): For integer types, either ``key`` to use one
+                         scale and offset per array or ``dimension`` to
+                         use one per feature dimension (last dimension).
+
+    Note:
+        Data appended to an existing array is converted with the scale and offset
+        of the existing array. If values are out of its range, the existing array
+        is re-scaled to cover the range of both (not possible in SWMR mode).
+        Within :meth:`audiomate.containers.Container.buffered_append` the scale is based
+        on all data collected for the array.
+
+    Example:
+        >>> options = StorageOptions(compression='gzip', compression_level=4, shuffle=True)
+        >>> fc = FeatureContainer('/path/to/hdf5file', storage=options)
+        >>>
+        >>> quantized = StorageOptions(dtype='int16', scale_per='dimension')
+        >>> fc = FeatureContainer('/path/to/hdf5file', storage=quantized)
+    """
+
+    __slots__ = ['compression', 'compression_level', 'shuffle', 'chunk_shape', 'frames_per_chunk',
+                 'dtype', 'scale_per']
+
+    def __init__(self, compression=None, compression_level=None, shuffle=False,
+                 chunk_shape=None, frames_per_chunk=None, dtype=None, scale_per='key'):
+        if dtype is not None and np.dtype(dtype) not in STORAGE_DTYPES:
+            raise ValueError('Invalid storage type {}! Types: {}'.format(dtype, [d.name for d in STORAGE_DTYPES]))
+
+        if scale_per not in SCALE_PER_VALUES:
+            raise ValueError('Invalid scale_per {}! Values: {}'.format(scale_per, SCALE_PER_VALUES))
+
+        self.compression = compression
+        self.compression_level = compression_level
+        self.shuffle = shuffle
+        self.chunk_shape = chunk_shape
+        self.frames_per_chunk = frames_per_chunk
+        self.dtype = None if dtype is None else np.dtype(dtype).name
+        self.scale_per = scale_per
+
+    def __eq__(self, other):
+        return isinstance(other, StorageOptions) and self.values == other.values
+
+    def __repr__(self):
+        return 'StorageOptions(compression={}, compression_level={}, shuffle={}, ' \
+               'chunk_shape={}, frames_per_chunk={}, dtype={}, scale_per={})'.format(*self.values)
+
+    @property
+    def values(self):
+        """ Return the options as tuple. """
+        return (self.compression, self.compression_level, self.shuffle,
+                self.chunk_shape, self.frames_per_chunk, self.dtype, self.scale_per)
+
+    @property
+    def is_default(self):
+        """ Return ``True`` if no option differs from the h5py defaults. """
+        return self == StorageOptions()
+
+    def write_attrs(self, attrs):
+        """
+        Store the options in the given attributes (of a HDF5 file or dataset).
+        Options that are not set, are removed.
+        """
+        values = {
+            COMPRESSION_ATTR: self.compression,
+            COMPRESSION_LEVEL_ATTR: self.compression_level,
+            SHUFFLE_ATTR: self.shuffle or None,
+            CHUNK_SHAPE_ATTR: self.chunk_shape,
+            FRAMES_PER_CHUNK_ATTR: self.frames_per_chunk,
+            DTYPE_ATTR: self.dtype,
+            SCALE_PER_ATTR: None if self.scale_per == 'key' else self.scale_per
+        }
+
+        for name, value in values.items():
+            if value is None:
+                if name in attrs:
+                    del attrs[name]
+            else:
+                attrs[name] = value
+
+    @classmethod
+    def read_attrs(cls, attrs):
+        """
+        Create options from the given attributes (of a HDF5 file or dataset).
+        Options that are not stored are set to their default.
+        """
+        chunk_shape = attrs.get(CHUNK_SHAPE_ATTR, None)
+        compression = attrs.get(COMPRESSION_ATTR, None)
+        compression_level = attrs.get(COMPRESSION_LEVEL_ATTR, None)
+        frames_per_chunk = attrs.get(FRAMES_PER_CHUNK_ATTR, None)
+        dtype = attrs.get(DTYPE_ATTR, None)
+
+        if chunk_shape is not None:
+            chunk_shape = tuple(int(x) for x in chunk_shape)
+
+        if compression is not None:
+            compression = str(compression)
+
+        if compression_level is not None:
+            compression_level = int(compression_level)
+
+        if frames_per_chunk is not None:
+            frames_per_chunk = int(frames_per_chunk)
+
+        if dtype is not None:
+            dtype = str(dtype)
+
+        return cls(
+            compression=compression,
+            compression_level=compression_level,
+            shuffle=bool(attrs.get(SHUFFLE_ATTR, False)),
+            chunk_shape=chunk_shape,
+            frames_per_chunk=frames_per_chunk,
+            dtype=dtype,
+            scale_per=str(attrs.get(SCALE_PER_ATTR, 'key'))
+        )
+
+    def encode(self, data):
+        """
+        Convert the data to the type it is stored with.
+        Only floating point data is converted.
+
+        Args:
+            data (numpy.ndarray): The data.
+
+        Returns:
+            tuple: The data to store and a dictionary with the attributes
+            to store with it, which are needed to decode the data
+            (see :func:`decode`). The dictionary is empty, if the data isn't converted.
+        """
+        if self.dtype is None or not np.issubdtype(data.dtype, np.floating):
+            return data, {}
+
+        dtype = np.dtype(self.dtype)
+        decoded_dtype = np.promote_types(dtype, np.float32)
+        attrs = {DECODED_DTYPE_ATTR: decoded_dtype.name}
+
+        if np.issubdtype(dtype, np.integer):
+            per_dimension = self.scale_per == 'dimension' and data.ndim > 0
+            minimum, maximum = _value_range(data, per_dimension)
+            attrs.update(_scale_attrs(minimum, maximum, dtype))
+
+        return encode_like(data, dtype, attrs), attrs
+
+    def dataset_kwargs(self, shape, growable=False, default_chunks=None):
+        """
+        Return the keyword arguments for ``h5py.Group.create_dataset``
+        to create a dataset with the given shape and type.
+
+        Args:
+            shape (tuple): The shape of the data.
+            growable (bool): If ``True``, the dataset is created
+                             to be resizable along the first dimension
+                             (used for appending).
+            default_chunks (tuple): The chunk-shape to use,
+                                    if neither ``chunk_shape``
+                                    nor ``frames_per_chunk`` is set.
+                                    ``True`` for automatic chunking by h5py.
+
+        Returns:
+            dict: The keyword arguments.
+        """
+        kwargs = {}
+
+        # Scalars can't be chunked or compressed
+        if len(shape) == 0:
+            return kwargs
+
+        if self.compression is not None:
+            kwargs['compression'] = self.compression
+
+            if self.compression_level is not None:
+                kwargs['compression_opts'] = self.compression_level
+
+        if self.shuffle:
+            kwargs['shuffle'] = True
+
+        chunks = default_chunks
+
+        if 0 not in shape:
+            if self.chunk_shape is not None:
+                chunks = tuple(self.chunk_shape)
+            elif self.frames_per_chunk is not None:
+                chunks = (self.frames_per_chunk,) + tuple(shape[1:])
+
+            if chunks is not None and chunks is not True:
+                # The chunks must not be larger than the data, except along growable dimensions
+                start = 1 if growable else 0
+                chunks = tuple(chunks[:start]) + tuple(min(c, s) for c, s in zip(chunks[start:], shape[start:]))
+
+        if chunks is None and growable:
+            chunks = True
+
+        if chunks is not None:
+            kwargs['chunks'] = chunks
+
+        if growable:
+            kwargs['maxshape'] = (None,) + tuple(shape[1:])
+
+        return kwargs
+
+
+def chunk_shape(shape, dtype, target_size=CHUNK_SIZE):
+    """
+    Return a chunk-shape for a dataset with the given shape,
+    so that a chunk contains whole rows (all dimensions, except the first)
+    and is about ``target_size`` bytes large.
+
+    Args:
+        shape (tuple): The shape of the data.
+        dtype (numpy.dtype): The type of the data.
+        target_size (int): The targeted size of a chunk in bytes.
+
+    Returns:
+        tuple: The chunk-shape, ``True`` (automatic chunking by h5py)
+        if the shape contains zero-length dimensions.
+    """
+    if 0 in shape:
+        return True
+
+    row_size = int(np.prod(shape[1:])) * np.dtype(dtype).itemsize
+    num_rows = min(shape[0], max(1, target_size // row_size))
+
+    return (num_rows,) + tuple(shape[1:])
+
+
+STORAGE_DTYPES = [np.dtype(np.float32), np.dtype(np.float16), np.dtype(np.int16), np.dtype(np.int8)]
+
+
+def encode_like(data, dtype, attrs):
+    """
+    Convert the data to the given storage type,
+    with the scale and offset from the given attributes.
+    This is used to append data to an existing array.
+    Values out of the range of the type are clipped
+    (see :func:`widen_range` to avoid it).
+
+    Args:
+        data (numpy.ndarray): The data.
+        dtype (numpy.dtype): The type the data is stored with.
+        attrs (dict): The attributes of the stored data.
+
+    Returns:
+        numpy.ndarray: The data to store.
+    """
+    dtype = np.dtype(dtype)
+
+    if DECODED_DTYPE_ATTR not in attrs:
+        return data
+
+    if SCALE_ATTR not in attrs:
+        return data.astype(dtype)
+
+    max_value = np.iinfo(dtype).max
+    data = np.rint((data - attrs[OFFSET_ATTR]) / attrs[SCALE_ATTR])
+
+    return np.clip(data, -max_value, max_value).astype(dtype)
+
+
+def widen_range(data, dtype, attrs):
+    """
+    Check if the data can be converted to the given storage type
+    with the scale and offset from the given attributes without clipping values.
+    If not, return new attributes, with scale and offset covering
+    the range of the stored data and the range of the given data.
+
+    Args:
+        data (numpy.ndarray): The data to append.
+        dtype (numpy.dtype): The type the data is stored with.
+        attrs (dict): The attributes of the stored data.
+
+    Returns:
+        dict: The attributes with the widened scale and offset,
+        ``None`` if the data fits into the current range.
+    """
+    if SCALE_ATTR not in attrs or data.size == 0:
+        return None
+
+    dtype = np.dtype(dtype)
+    max_value = np.iinfo(dtype).max
+    scale = np.asarray(attrs[SCALE_ATTR], dtype=np.float64)
+    offset = np.asarray(attrs[OFFSET_ATTR], dtype=np.float64)
+
+    minimum, maximum = _value_range(data, scale.ndim > 0)
+
+    if np.all(np.rint((minimum - offset) / scale) >= -max_value) and \
+            np.all(np.rint((maximum - offset) / scale) <= max_value):
+        return None
+
+    minimum = np.minimum(minimum, offset - scale * max_value)
+    maximum = np.maximum(maximum, offset + scale * max_value)
+
+    widened = dict(attrs)
+    widened.update(_scale_attrs(minimum, maximum, dtype))
+
+    return widened
+
+
+def _value_range(data, per_dimension):
+    """
+    Return the minimum and the maximum of the data (as float64),
+    either per dimension (last dimension) or of all values.
+    """
+    if per_dimension:
+        rows = data.reshape(-1, data.shape[-1])
+    else:
+        rows = data.reshape(-1, 1)
+
+    if rows.shape[0] > 0:
+        minimum = np.min(rows, axis=0).astype(np.float64)
+        maximum = np.max(rows, axis=0).astype(np.float64)
+    else:
+        minimum = np.zeros(rows.shape[1])
+        maximum = np.zeros(rows.shape[1])
+
+    if not per_dimension:
+        return minimum[0], maximum[0]
+
+    return minimum, maximum
+
+
+def _scale_attrs(minimum, maximum, dtype):
+    """ Return the scale and offset to map the values between minimum and maximum to the integer type. """
+    scale = (maximum - minimum) / (2 * np.iinfo(dtype).max)
+    scale = np.where(scale == 0, 1.0, scale)
+
+    if np.ndim(minimum) == 0:
+        scale = scale[()]
+
+    return {
+        SCALE_ATTR: scale,
+        OFFSET_ATTR: (maximum + minimum) / 2
+    }
+
+
+def decode(data, attrs):
+    """
+    Convert stored data back to the type it was passed with
+    (the inverse of :meth:`StorageOptions.encode`).
+
+    Args:
+        data (numpy.ndarray): The data read from the file.
+        attrs (dict): The attributes of the stored data.
+
+    Returns:
+        numpy.ndarray: The decoded data.
+    """
+    if DECODED_DTYPE_ATTR not in attrs:
+        return data
+
+    data = np.asarray(data, dtype=np.dtype(str(attrs[DECODED_DTYPE_ATTR])))
+
+    if SCALE_ATTR in attrs:
+        data *= attrs[SCALE_ATTR].astype(data.dtype)
+        data += attrs[OFFSET_ATTR].astype(data.dtype)
+
+    return data
+
+
+def decoded_dtype(dset):
+    """ Return the type of the data of the given dataset after decoding. """
+    dtype = dset.attrs.get(DECODED_DTYPE_ATTR, None)
+
+    if dtype is None:
+        return dset.dtype
+
+    return np.dtype(str(dtype))
+
+
+class DecodedDataset:
+    """
+    Wrapper around a dataset with encoded data (see :meth:`StorageOptions.encode`),
+    that decodes the data, when it is read by indexing.
+    It is returned by :meth:`audiomate.containers.Container.get` for encoded arrays,
+    instead of the dataset itself.
+
+    Args:
+        dset (h5py.Dataset): The dataset.
+    """
+
+    __slots__ = ['dset', 'attrs', 'dtype']
+
+    def __init__(self, dset):
+        self.dset = dset
+        self.attrs = dict(dset.attrs)
+        self.dtype = decoded_dtype(dset)
+
+    @property
+    def shape(self):
+        return self.dset.shape
+
+    @property
+    def ndim(self):
+        return self.dset.ndim
+
+    @property
+    def size(self):
+        return self.dset.size
+
+    def __len__(self):
+        return len(self.dset)
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[()]
+
+        if dtype is not None:
+            data = data.astype(dtype)
+
+        return data
+
+    def __getitem__(self, item):
+        scale = self.attrs.get(SCALE_ATTR, None)
+
+        if not isinstance(item, tuple) or len(item) < 2 or np.ndim(scale) == 0:
+            return decode(self.dset[item], self.attrs)
+
+        # A scale per dimension can only be applied to whole rows
+        rows = decode(self.dset[item[0]], self.attrs)
+
+        if np.ndim(rows) < self.dset.ndim:
+            return rows[item[1:]]
+
+        return rows[(slice(None),) + item[1:]]
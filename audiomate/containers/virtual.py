@@ -0,0 +1,332 @@
+import contextlib
+import functools
+import glob
+import os
+
+import h5py
+import numpy as np
+
+from . import features
+from . import index as container_index
+from . import storage
+
+ATTRS_TO_CHECK = ['frame-size', 'hop-size', 'sampling-rate']
+ENCODING_ATTRS = [storage.DECODED_DTYPE_ATTR, storage.SCALE_ATTR, storage.OFFSET_ATTR]
+
+
+class VirtualFeatureContainer(features.FeatureContainer):
+    """
+    A read-only feature container, that presents the data of several feature container files
+    as one logical container (e.g. containers with features extracted on different machines).
+    Reads are routed to the file containing the key and :meth:`keys` returns the keys of all files.
+    Every key may only be contained in one of the files.
+    The attributes ``frame-size``, ``hop-size`` and ``sampling-rate`` have to be equal
+    for all files, that define them.
+
+    It can be used with the datasets and iterators in :mod:`audiomate.feeding`,
+    without merging the files first. To create a single container file,
+    that references the data of all files without copying it, use :meth:`materialize`.
+
+    Args:
+        paths (list): The paths of the container files.
+
+    Example:
+        >>> vc = VirtualFeatureContainer.from_glob('/path/to/features-*.hdf5')
+        >>> with vc:
+        >>>     data = vc.get('utt-1')
+    """
+
+    def __init__(self, paths):
+        super(VirtualFeatureContainer, self).__init__(None, mode='r')
+
+        self.paths = list(paths)
+        self.parts = [features.FeatureContainer(path, mode='r') for path in self.paths]
+
+        self._attrs = None
+        self._key_to_part = None
+
+    @classmethod
+    def from_glob(cls, pattern):
+        """
+        Create a container for all files matching the given glob pattern.
+        The files are sorted by path.
+        """
+        return cls(sorted(glob.glob(pattern)))
+
+    @classmethod
+    def from_manifest(cls, path):
+        """
+        Create a container for all files listed in the given manifest file
+        (one path per line). Relative paths are relative to the folder of the manifest.
+        Empty lines are ignored.
+        """
+        base_folder = os.path.dirname(os.path.abspath(path))
+
+        with open(path, 'r', encoding='utf-8') as f:
+            paths = [line.strip() for line in f if line.strip() != '']
+
+        return cls([os.path.join(base_folder, p) for p in paths])
+
+    def open(self, mode=None):
+        """
+        Open all container files (read-only).
+
+        Args:
+            mode (str): Only 'r' is supported. If ``None``, uses ``self.mode``.
+        """
+        if mode is not None and mode != 'r':
+            raise ValueError('A virtual container can only be opened read-only!')
+
+        if self.is_open():
+            return
+
+        try:
+            for part in self.parts:
+                part.open()
+
+            self._attrs = self._merged_attrs()
+            self._index, self._key_to_part = self._merged_index()
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self):
+        """ Close all container files. """
+        for part in self.parts:
+            part.close()
+
+        self._attrs = None
+        self._index = None
+        self._key_to_part = None
+
+    def is_open(self):
+        """
+        Return ``True``, if container is already open.
+        ``False`` otherwise.
+        """
+        return self._index is not None
+
+    def raise_error_if_not_open(self):
+        """ Check if container is opened, raise error if not. """
+        if not self.is_open():
+            raise ValueError('The container is not opened!')
+
+    @contextlib.contextmanager
+    def open_pooled(self):
+        """ Context-manager for read-only access (same as :meth:`open_if_needed`). """
+        with self.open_if_needed():
+            yield self
+
+    @property
+    def frame_size(self):
+        """ The number of samples used per frame. """
+        self.raise_error_if_not_open()
+        return self._attrs['frame-size']
+
+    @property
+    def hop_size(self):
+        """ The number of samples between two frames. """
+        self.raise_error_if_not_open()
+        return self._attrs['hop-size']
+
+    @property
+    def sampling_rate(self):
+        """ The sampling-rate of the signal these frames are based on. """
+        self.raise_error_if_not_open()
+        return self._attrs['sampling-rate']
+
+    def get(self, key, mem_map=True):
+        """
+        Read and return the data stored for the given key.
+
+        Args:
+            key (str): The key to read the data from.
+            mem_map (bool): If ``True`` returns the data as
+                            memory-mapped array, otherwise a copy is returned.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            numpy.ndarray: The stored data.
+        """
+        self.raise_error_if_not_open()
+
+        if key not in self._key_to_part:
+            return None
+
+        return self.parts[self._key_to_part[key]].get(key, mem_map=mem_map)
+
+    def get_many(self, keys, contiguous=False):
+        """
+        Read and return the data stored for all given keys.
+        The keys of every file are read at once
+        (see :meth:`audiomate.containers.Container.get_many`).
+
+        Args:
+            keys (list): The keys to read the data from.
+            contiguous (bool): If ``True``, the data of all keys is read
+                               into a single array,
+                               concatenated along the first dimension.
+
+        Note:
+            The container has to be opened in advance.
+
+        Returns:
+            list: If ``contiguous == False``, a list with the data for every key
+            (in the order of ``keys``).
+
+            tuple: If ``contiguous == True``, a tuple with the array containing the data of all keys
+            and an array with ``len(keys) + 1`` offsets. The data of ``keys[i]`` is
+            ``data[offsets[i]:offsets[i + 1]]``.
+        """
+        self.raise_error_if_not_open()
+
+        positions_per_part = [[] for _ in self.parts]
+
+        for i, key in enumerate(keys):
+            if key not in self._key_to_part:
+                raise ValueError('No data stored for key {}'.format(key))
+
+            positions_per_part[self._key_to_part[key]].append(i)
+
+        result = [None] * len(keys)
+
+        for part, positions in zip(self.parts, positions_per_part):
+            if len(positions) > 0:
+                part_data = part.get_many([keys[i] for i in positions])
+
+                for i, data in zip(positions, part_data):
+                    result[i] = data
+
+        if not contiguous:
+            return result
+
+        if len({(data.dtype, data.shape[1:]) for data in result}) > 1 or any(data.ndim == 0 for data in result):
+            raise ValueError('Only arrays of the same type and dimensions can be read contiguously!')
+
+        offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([data.shape[0] for data in result])
+
+        if len(keys) > 0:
+            return np.concatenate(result), offsets
+
+        return np.empty(0), offsets
+
+    def set(self, key, data, storage=None):
+        raise ValueError('A virtual container is read-only!')
+
+    def append(self, key, data, storage=None):
+        raise ValueError('A virtual container is read-only!')
+
+    def remove(self, key):
+        raise ValueError('A virtual container is read-only!')
+
+    def materialize(self, path):
+        """
+        Create a feature container file, that contains all keys of this container.
+        The data isn't copied, instead every array is a HDF5 virtual dataset
+        referencing the data in the original file. Hence the original files
+        have to stay at their location (they are referenced by absolute path).
+
+        Args:
+            path (str): Path of the new container file.
+                        An existing file is overwritten.
+
+        Returns:
+            FeatureContainer: The new container (closed).
+        """
+        target = features.FeatureContainer(path)
+
+        with self.open_if_needed():
+            target.open(mode='w')
+
+            try:
+                for name, value in self._attrs.items():
+                    target._file.attrs[name] = value  # skipcq: PYL-W0212
+
+                for key in self._index.sorted_keys():
+                    part = self.parts[self._key_to_part[key]]
+                    source = part._dataset(key)  # skipcq: PYL-W0212
+
+                    layout = h5py.VirtualLayout(shape=source.shape, dtype=source.dtype)
+                    layout[...] = h5py.VirtualSource(os.path.abspath(part.path), source.name, shape=source.shape)
+
+                    dset = target._file.create_virtual_dataset(target._dataset_path(key), layout)  # skipcq: PYL-W0212
+                    target._set_encoding_attrs(dset, {  # skipcq: PYL-W0212
+                        name: value for name, value in source.attrs.items()
+                        if name in ENCODING_ATTRS
+                    })
+                    target._update_index(key)  # skipcq: PYL-W0212
+            finally:
+                target.close()
+
+        return target
+
+    def _load_index(self):
+        return self._index
+
+    def _data_attrs(self):
+        return dict(self._attrs)
+
+    def _get_cached_attr(self, name):
+        return None
+
+    def _set_cached_attr(self, name, value):
+        pass
+
+    def _is_read_only(self):
+        return True
+
+    def _reopen_factory(self):
+        return functools.partial(type(self), self.paths)
+
+    def _dataset(self, key):
+        """ Return the dataset for the given key from the file containing it. """
+        if key not in self._key_to_part:
+            return None
+
+        return self.parts[self._key_to_part[key]]._dataset(key)  # skipcq: PYL-W0212
+
+    def _merged_attrs(self):
+        """ Return the attributes, that are checked to be equal in all files. """
+        attrs = {}
+
+        for part in self.parts:
+            part_attrs = part._file.attrs  # skipcq: PYL-W0212
+
+            for name in ATTRS_TO_CHECK:
+                if name in part_attrs:
+                    value = part_attrs[name]
+
+                    if name in attrs and attrs[name] != value:
+                        raise ValueError('The attribute {} differs between the containers ({} / {})!'.format(
+                            name, attrs[name], value
+                        ))
+
+                    attrs[name] = value
+
+        return attrs
+
+    def _merged_index(self):
+        """ Return the index of all keys and the index of the file for every key. """
+        keys = []
+        shapes = []
+        dtypes = []
+        key_to_part = {}
+
+        for part_index, part in enumerate(self.parts):
+            part_container_index = part.index
+
+            for key in part_container_index.sorted_keys():
+                if key in key_to_part:
+                    raise ValueError('The key {} is contained in multiple containers ({} / {})!'.format(
+                        key, self.paths[key_to_part[key]], part.path
+                    ))
+
+                key_to_part[key] = part_index
+                keys.append(key)
+                shapes.append(part_container_index.shape(key))
+                dtypes.append(part_container_index.dtype(key))
+
+        return container_index.ContainerIndex(keys, shapes, dtypes), key_to_part
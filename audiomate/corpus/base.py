@@ -5,7 +5,9 @@ import math
 
 import numpy as np
 
+from audiomate.utils import audio
 from audiomate.utils import stats
+from audiomate.utils import units
 
 
 class CorpusView(metaclass=abc.ABCMeta):
@@ -289,8 +291,7 @@ class CorpusView(metaclass=abc.ABCMeta):
 
         all_stats = {}
 
-        for utterance in self.utterances.values():
-            data = utterance.read_samples()
+        for utterance, data in self.read_utterance_samples():
             all_stats[utterance.idx] = stats.DataStats(float(np.mean(data)),
                                                        float(np.var(data)),
                                                        np.min(data),
@@ -299,6 +300,107 @@ class CorpusView(metaclass=abc.ABCMeta):
 
         return all_stats
 
+    def read_utterance_samples(self, sr=None, max_buffer_size='256m', utterance_ids=None):
+        """
+        Read the samples of all utterances in the corpus.
+        The utterances are grouped by track, so that the samples
+        of a track are read only once for all of its utterances,
+        instead of once for every utterance.
+
+        The samples of a track are read in parts, that cover as many
+        successive utterances as possible, while not exceeding
+        ``max_buffer_size`` (at the native sampling-rate).
+        An utterance that alone exceeds the limit is read on its own.
+
+        Args:
+            sr (int): If ``None`` uses the sampling rate given by the track,
+                      otherwise resamples to the given sampling rate.
+            max_buffer_size (str): The maximal size of the samples
+                                   read at once in bytes.
+                                   The units ``k`` (kibibytes), ``m``
+                                   (mebibytes) and ``g`` (gibibytes)
+                                   are supported.
+            utterance_ids (list): If not ``None``, only the utterances
+                                  with the given ids are read.
+
+        Returns:
+            Generator: A generator yielding a tuple
+            ``(utterance, samples)`` for every utterance.
+            The utterances are ordered by track-idx
+            and their start within the track.
+        """
+        max_buffer_size = units.parse_storage_size(max_buffer_size)
+        utts_per_track = collections.defaultdict(list)
+
+        if utterance_ids is None:
+            utterances = self.utterances.values()
+        else:
+            utterances = [self.utterances[utterance_idx] for utterance_idx in utterance_ids]
+
+        for utterance in utterances:
+            utts_per_track[utterance.track.idx].append(utterance)
+
+        for track_idx in sorted(utts_per_track.keys()):
+            utterances = sorted(utts_per_track[track_idx], key=lambda u: (u.start, u.idx))
+            track = utterances[0].track
+            native_sr = track.sampling_rate
+            max_duration = max_buffer_size / (native_sr * np.dtype(np.float32).itemsize)
+
+            for part in CorpusView._group_utterances_to_parts(utterances, max_duration):
+                part_start = part[0].start
+                part_end = max(u.end for u in part)
+
+                if part_end == float('inf'):
+                    samples = track.read_samples(offset=part_start)
+                else:
+                    samples = track.read_samples(offset=part_start, duration=part_end - part_start)
+
+                part_start_index = int(part_start * native_sr)
+
+                for utterance in part:
+                    start_index = int(utterance.start * native_sr) - part_start_index
+
+                    if utterance.end == float('inf'):
+                        utt_samples = samples[start_index:]
+                    else:
+                        num_samples = int((utterance.end - utterance.start) * native_sr)
+                        utt_samples = samples[start_index:start_index + num_samples]
+
+                    if sr is not None and sr != native_sr:
+                        utt_samples = audio.resample(utt_samples, native_sr, sr, res_type=track.RES_TYPE)
+
+                    yield utterance, utt_samples
+
+    @staticmethod
+    def _group_utterances_to_parts(utterances, max_duration):
+        """
+        Group the given utterances (sorted by start) to parts,
+        which span over ``max_duration`` seconds in maximum.
+        """
+        parts = []
+        current_part = []
+        current_start = 0
+
+        for utterance in utterances:
+            end = utterance.end_abs
+
+            if len(current_part) > 0:
+                current_end = max(u.end_abs for u in current_part)
+
+                if max(current_end, end) - current_start > max_duration:
+                    parts.append(current_part)
+                    current_part = []
+
+            if len(current_part) == 0:
+                current_start = utterance.start
+
+            current_part.append(utterance)
+
+        if len(current_part) > 0:
+            parts.append(current_part)
+
+        return parts
+
     #
     # Restructuring
     #
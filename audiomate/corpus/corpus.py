@@ -2,6 +2,8 @@ import copy
 import os
 import shutil
 
+import numpy as np
+
 from audiomate import tracks
 from audiomate import containers
 from audiomate import issuers
@@ -456,6 +458,10 @@ class Corpus(base.CorpusView):
         Copies every track to a single container.
         Afterwards all tracks in the container are linked against
         this single container.
+
+        The samples of files with 16-Bit PCM samples (e.g. most WAV files)
+        and of tracks in other audio containers are copied block by block as they are stored,
+        without converting them to floats.
         """
 
         cont = containers.AudioContainer(target_path)
@@ -466,9 +472,21 @@ class Corpus(base.CorpusView):
         # First create a new container track for all existing tracks
         for track in self.tracks.values():
             sr = track.sampling_rate
-            samples = track.read_samples()
 
-            cont.set(track.idx, samples, sr)
+            raw_blocks = _raw_sample_blocks(track, target_path)
+
+            if raw_blocks is not None:
+                cont.remove(track.idx)
+
+                for block in raw_blocks:
+                    cont.append_raw(track.idx, block, sr)
+
+                if track.idx not in cont:
+                    cont.set_raw(track.idx, np.zeros(0, dtype=np.int16), sr)
+            else:
+                samples = track.read_samples()
+                cont.set(track.idx, samples, sr)
+
             new_track = tracks.ContainerTrack(track.idx, cont)
 
             new_tracks[track.idx] = new_track
@@ -582,3 +600,27 @@ class Corpus(base.CorpusView):
             ds.merge_corpus(merging_corpus)
 
         return ds
+
+
+def _raw_sample_blocks(track, target_path, block_size=1048576):
+    """
+    Return a generator yielding the samples of the track as 16-Bit Integers block by block,
+    if they can be read without conversion. Otherwise ``None`` is returned.
+    """
+    if isinstance(track, tracks.FileTrack) and audio.is_pcm16_mono(track.path):
+        return audio.read_pcm16_blocks(track.path, block_size=block_size)
+
+    is_other_container = isinstance(track, tracks.ContainerTrack) and \
+        os.path.abspath(track.container.path) != os.path.abspath(target_path)
+
+    if is_other_container:
+        def container_blocks():
+            with track.container.open_pooled() as source:
+                num_samples = source.get_num_samples(track.key)
+
+                for start in range(0, num_samples, block_size):
+                    yield source.get_raw_range(track.key, start, start + block_size)
+
+        return container_blocks()
+
+    return None
@@ -15,6 +15,7 @@ from audiomate.utils import jsonfile
 from . import base
 
 FILES_FILE_NAME = 'files.txt'
+TRACK_INFO_FILE_NAME = 'track_info.txt'
 ISSUER_FILE_NAME = 'issuers.json'
 UTTERANCE_FILE_NAME = 'utterances.txt'
 UTT_ISSUER_FILE_NAME = 'utt_issuers.txt'
@@ -48,6 +49,7 @@ class DefaultReader(base.CorpusReader):
 
     def _load(self, path):
         file_path = os.path.join(path, FILES_FILE_NAME)
+        track_info_path = os.path.join(path, TRACK_INFO_FILE_NAME)
         audio_path = os.path.join(path, AUDIO_CONTAINER_FILE_NAME)
         issuer_path = os.path.join(path, ISSUER_FILE_NAME)
         utt_issuer_path = os.path.join(path, UTT_ISSUER_FILE_NAME)
@@ -57,6 +59,7 @@ class DefaultReader(base.CorpusReader):
         corpus = audiomate.Corpus(path=path)
 
         DefaultReader.read_files(file_path, corpus)
+        DefaultReader.read_track_info(track_info_path, corpus)
         DefaultReader.read_tracks_from_audio_containers(audio_path, corpus)
         DefaultReader.read_issuers(issuer_path, corpus)
         utt_id_to_issuer = DefaultReader.read_utt_to_issuer_mapping(utt_issuer_path, corpus)
@@ -74,6 +77,29 @@ class DefaultReader(base.CorpusReader):
         for file_idx, file_path in textfile.read_key_value_lines(path, separator=' ').items():
             corpus.new_file(os.path.join(base_path, file_path), track_idx=file_idx, copy_file=False)
 
+    @staticmethod
+    def read_track_info(track_info_path, corpus):
+        if not os.path.isfile(track_info_path):
+            return
+
+        records = textfile.read_separated_lines_generator(track_info_path, separator=' ', max_columns=6)
+
+        for record in records:
+            track = corpus.tracks.get(record[0], None)
+
+            if not isinstance(track, tracks.FileTrack):
+                continue
+
+            info = tracks.FileInfo(int(record[1]),
+                                   int(record[2]),
+                                   float(record[3]),
+                                   int(record[4]),
+                                   float(record[5]))
+
+            # Only use the info, if the file wasn't changed in the meantime
+            if info.matches_file(track.path):
+                track.info = info
+
     @staticmethod
     def read_issuers(file_path, corpus):
         if not os.path.isfile(file_path):
@@ -228,6 +254,7 @@ class DefaultWriter(base.CorpusWriter):
 
     def _save(self, corpus, path):
         file_path = os.path.join(path, FILES_FILE_NAME)
+        track_info_path = os.path.join(path, TRACK_INFO_FILE_NAME)
         audio_path = os.path.join(path, AUDIO_CONTAINER_FILE_NAME)
         issuer_path = os.path.join(path, ISSUER_FILE_NAME)
         utterance_path = os.path.join(path, UTTERANCE_FILE_NAME)
@@ -235,6 +262,7 @@ class DefaultWriter(base.CorpusWriter):
         container_path = os.path.join(path, FEAT_CONTAINER_FILE_NAME)
 
         DefaultWriter.write_file_tracks(file_path, corpus, path)
+        DefaultWriter.write_track_info(track_info_path, corpus)
         DefaultWriter.write_container_tracks(audio_path, corpus, path)
         DefaultWriter.write_issuers(issuer_path, corpus)
         DefaultWriter.write_utterances(utterance_path, corpus)
@@ -256,6 +284,26 @@ class DefaultWriter(base.CorpusWriter):
 
         textfile.write_separated_lines(file_path, file_records, separator=' ', sort_by_column=0)
 
+    @staticmethod
+    def write_track_info(track_info_path, corpus):
+        info_records = []
+
+        # Only already known infos are written, so saving doesn't probe all files
+        for file in corpus.tracks.values():
+            if isinstance(file, tracks.FileTrack) and file.has_info():
+                info = file.info
+                info_records.append([
+                    file.idx,
+                    info.sampling_rate,
+                    info.num_channels,
+                    info.duration,
+                    info.size,
+                    info.mtime
+                ])
+
+        if len(info_records) > 0:
+            textfile.write_separated_lines(track_info_path, info_records, separator=' ', sort_by_column=0)
+
     @staticmethod
     def write_container_tracks(audio_path, corpus, path):
         container_records = set()
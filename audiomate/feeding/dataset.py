@@ -49,8 +49,8 @@ class Dataset:
 
     @staticmethod
     def container_has_utterances(container, keys):
-        container_keys = set(container.keys())
-        return container_keys.issuperset(keys)
+        index = container.index
+        return all(key in index for key in keys)
 
 
 class UtteranceDataset(Dataset):
@@ -200,10 +200,11 @@ class UtteranceDataset(Dataset):
         lengths = []
 
         for cnt in self.containers:
+            index = cnt.index
             longest_in_container = 0
+
             for utt_idx in self.utt_ids:
-                utt_length = cnt._file[utt_idx].shape[0]  # skipcq: PYL-W0212
-                longest_in_container = max(utt_length, longest_in_container)
+                longest_in_container = max(index.num_rows(utt_idx), longest_in_container)
 
             lengths.append(longest_in_container)
 
@@ -354,6 +355,7 @@ class MultiFrameDataset(Dataset):
 
         regions = []
         current_offset = 0
+        indices = [cnt.index for cnt in self.containers]
 
         for utt_idx in sorted(self.utt_ids):
             offset = current_offset
@@ -361,8 +363,8 @@ class MultiFrameDataset(Dataset):
             num_frames = []
             refs = []
 
-            for cnt in self.containers:
-                num_frames.append(cnt.get(utt_idx).shape[0])
+            for cnt, index in zip(self.containers, indices):
+                num_frames.append(index.num_rows(utt_idx))
                 refs.append(cnt.get(utt_idx, mem_map=True))
 
             if len(set(num_frames)) != 1:
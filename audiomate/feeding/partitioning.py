@@ -10,6 +10,9 @@ import numpy as np
 
 import audiomate
 from audiomate import containers
+from audiomate.containers import container as container_module
+from audiomate.containers import index as container_index
+from audiomate.containers import storage
 from audiomate.utils import units
 
 
@@ -159,9 +162,8 @@ class PartitioningContainerLoader:
         info = self.partitions[index]
         data = PartitionData(info)
 
-        for utt_id in info.utt_ids:
-            utt_data = [c._file[utt_id][:] for c in self.containers]  # skipcq: PYL-W0212
-            data.utt_data.append(utt_data)
+        data_per_container = [c.get_many(info.utt_ids) for c in self.containers]
+        data.utt_data = [list(utt_data) for utt_data in zip(*data_per_container)]
 
         return data
 
@@ -170,27 +172,26 @@ class PartitioningContainerLoader:
         Check if there is a dataset for every utterance in every container,
         otherwise raise an error.
         """
-        expected_keys = frozenset(self.utt_ids)
-
         for cnt in self.containers:
-            keys = set(cnt.keys())
+            index = cnt.index
 
-            if not keys.issuperset(expected_keys):
+            if not all(utt_id in index for utt_id in self.utt_ids):
                 raise ValueError('Container is missing data for some utterances!')
 
     def _scan(self):
-        """ For every utterance, calculate the size it will need in memory. """
+        """
+        For every utterance, calculate the size it will need in memory.
+        For data stored with another type (see :class:`audiomate.containers.StorageOptions`)
+        this is the size after decoding, not the stored size.
+        """
         utt_sizes = {}
+        indices = [cnt.index for cnt in self.containers]
 
         for dset_name in self.utt_ids:
             per_container = []
 
-            for cnt in self.containers:
-                dset = cnt._file[dset_name]  # skipcq: PYL-W0212
-                dtype_size = dset.dtype.itemsize
-
-                record_size = dtype_size * dset.size
-                per_container.append(record_size)
+            for index in indices:
+                per_container.append(index.byte_size(dset_name))
 
             utt_size = sum(per_container)
 
@@ -207,9 +208,10 @@ class PartitioningContainerLoader:
         Return a list of tuples.
         """
         utt_lengths = {}
+        indices = [cnt.index for cnt in self.containers]
 
         for utt_idx in self.utt_ids:
-            per_container = [c._file[utt_idx].shape[0] for c in self.containers]  # skipcq: PYL-W0212
+            per_container = [index.num_rows(utt_idx) for index in indices]
             utt_lengths[utt_idx] = tuple(per_container)
 
         return utt_lengths
@@ -285,7 +287,9 @@ class PartitioningFeatureIterator:
     total available memory.
 
     Args:
-        hdf5file(h5py.File): HDF5 file containing the features
+        hdf5file(h5py.File, Container): HDF5 file containing the features,
+                                        or an opened container
+                                        (e.g. :class:`audiomate.containers.FeatureContainer`).
         partition_size(str): Size of the partitions in bytes. The units
                              ``k`` (kibibytes), ``m`` (mebibytes) and
                              ``g`` (gibibytes) are supported,
@@ -324,12 +328,22 @@ class PartitioningFeatureIterator:
     """
 
     def __init__(self, hdf5file, partition_size, shuffle=True, seed=None, includes=None, excludes=None):
-        self._file = hdf5file
         self._partition_size = units.parse_storage_size(partition_size)
         self._shuffle = shuffle
         self._seed = seed
 
-        data_sets = self._filter_data_sets(hdf5file.keys(), includes=includes, excludes=excludes)
+        if isinstance(hdf5file, containers.Container):
+            self._container = hdf5file
+            self._file = None
+            self._shard_levels = 0
+            keys = hdf5file.keys()
+        else:
+            self._container = None
+            self._file = hdf5file
+            self._shard_levels = int(hdf5file.attrs.get(container_module.SHARD_LEVELS_ATTR, 0))
+            keys = self._file_keys()
+
+        data_sets = self._filter_data_sets(keys, includes=includes, excludes=excludes)
         if shuffle:
             _random_state(self._seed).shuffle(data_sets)
 
@@ -370,16 +384,16 @@ class PartitioningFeatureIterator:
         end_dset_idx = self._data_sets.index(end_dset_name)
 
         if start_dset_name == end_dset_name:
-            slices = [DataSetSlice(start_dset_name, start_idx, self._file[start_dset_name][start_idx:end_idx])]
+            slices = [DataSetSlice(start_dset_name, start_idx, self._dataset(start_dset_name)[start_idx:end_idx])]
             return Partition(slices, shuffle=self._shuffle, seed=self._seed)
 
-        slices = [DataSetSlice(start_dset_name, start_idx, self._file[start_dset_name][start_idx:])]
+        slices = [DataSetSlice(start_dset_name, start_idx, self._dataset(start_dset_name)[start_idx:])]
 
         middle_dsets = self._data_sets[start_dset_idx + 1:end_dset_idx]
         for dset in middle_dsets:
-            slices.append(DataSetSlice(dset, 0, self._file[dset][:]))
+            slices.append(DataSetSlice(dset, 0, self._dataset(dset)[:]))
 
-        slices.append(DataSetSlice(end_dset_name, 0, self._file[end_dset_name][:end_idx]))
+        slices.append(DataSetSlice(end_dset_name, 0, self._dataset(end_dset_name)[:end_idx]))
 
         return Partition(slices, shuffle=self._shuffle, seed=self._seed)
 
@@ -438,12 +452,15 @@ class PartitioningFeatureIterator:
         dset_props = []
 
         for dset_name in self._data_sets:
-            dtype_size = self._file[dset_name].dtype.itemsize
+            dset = self._dataset(dset_name)
+
+            # The size in memory, which differs from the stored size for encoded data
+            dtype_size = dset.dtype.itemsize
 
-            if len(self._file[dset_name]) == 0:
+            if len(dset) == 0:
                 continue
 
-            num_records, items_per_record = self._file[dset_name].shape
+            num_records, items_per_record = dset.shape
             record_size = dtype_size * items_per_record
 
             if record_size > self._partition_size:
@@ -453,6 +470,26 @@ class PartitioningFeatureIterator:
 
         return dset_props
 
+    def _file_keys(self):
+        """ Return the keys of all datasets in the file (the names of the datasets, if not sharded). """
+        if self._shard_levels == 0:
+            return [key for key in self._file.keys() if key not in container_index.RESERVED_NAMES]
+
+        index = container_index.ContainerIndex.scan(self._file, strip_levels=self._shard_levels)
+        return index.sorted_keys()
+
+    def _dataset(self, dset_name):
+        """ Return the dataset, wrapped to decode the data if it is encoded. """
+        if self._container is not None:
+            return self._container.get(dset_name)
+
+        dset = self._file[container_module.shard_path(dset_name, self._shard_levels)]
+
+        if storage.DECODED_DTYPE_ATTR in dset.attrs:
+            return storage.DecodedDataset(dset)
+
+        return dset
+
     @staticmethod
     def _filter_data_sets(data_sets, includes=None, excludes=None):
         if includes is None:
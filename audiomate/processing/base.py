@@ -1,11 +1,22 @@
 import abc
+import collections
+import functools
+import multiprocessing
+import time
 
 import librosa
 import numpy as np
 
 from audiomate import containers
+from audiomate import logutil
+from audiomate import tracks
+from audiomate.utils import background
 from audiomate.utils import units
 
+logger = logutil.getLogger()
+
+PIPELINE_QUEUE_SIZE = 4
+
 
 class Processor(metaclass=abc.ABCMeta):
     """
@@ -25,7 +36,8 @@ class Processor(metaclass=abc.ABCMeta):
     Frame-size and hop-size are measured in samples regarding the original audio signal (or simply its sampling rate).
     """
 
-    def process_corpus(self, corpus, output_path, frame_size=400, hop_size=160, sr=None):
+    def process_corpus(self, corpus, output_path, frame_size=400, hop_size=160, sr=None, num_workers=1,
+                       pipelined=False, swmr=False):
         """
         Process all utterances of the given corpus and save the processed features in a feature-container.
         The utterances are processed in **offline** mode so the full utterance in one go.
@@ -36,20 +48,30 @@ class Processor(metaclass=abc.ABCMeta):
             frame_size (int): The number of samples per frame.
             hop_size (int): The number of samples between two frames.
             sr (int): Use the given sampling rate. If None uses the native sampling rate from the underlying data.
+            num_workers (int): Number of processes to compute the features with.
+                               The tracks are distributed to the processes,
+                               the features are written by the calling process only.
+                               The result is the same as with a single process.
+            pipelined (bool): If ``True``, the samples are read and the features are written
+                              in background threads, while the features are computed
+                              (see :class:`audiomate.utils.background.BackgroundReader`).
+                              The timings of the stages are logged.
+            swmr (bool): If ``True``, the feature-container can be read by other processes,
+                         while the features are extracted (opened with ``mode='r'`` and ``swmr=True``).
+                         Once the first features are computed, the keys of all utterances are declared
+                         and the container is switched to SWMR mode
+                         (see :meth:`audiomate.containers.Container.start_swmr`).
+                         Every utterance is published, as soon as its features are written.
+                         The features of all utterances need the same dimensions (except the first).
 
         Returns:
             FeatureContainer: The feature-container containing the processed features.
         """
-
-        def processing_func(utterance, feat_container, frame_size, hop_size, sr, corpus):
-            data = self.process_utterance(utterance, frame_size=frame_size, hop_size=hop_size, sr=sr, corpus=corpus)
-            feat_container.set(utterance.idx, data)
-
-        return self._process_corpus(corpus, output_path, processing_func,
-                                    frame_size=frame_size, hop_size=hop_size, sr=sr)
+        return self._process_corpus(corpus, output_path, frame_size=frame_size, hop_size=hop_size, sr=sr,
+                                    num_workers=num_workers, pipelined=pipelined, swmr=swmr)
 
     def process_corpus_online(self, corpus, output_path, frame_size=400, hop_size=160,
-                              chunk_size=1, buffer_size=5760000):
+                              chunk_size=1, buffer_size=5760000, num_workers=1, pipelined=False, swmr=False):
         """
         Process all utterances of the given corpus and save the processed features in a feature-container.
         The utterances are processed in **online** mode, so chunk by chunk.
@@ -63,25 +85,24 @@ class Processor(metaclass=abc.ABCMeta):
             buffer_size (int): Number of samples to load into memory at once.
                              The exact number of loaded samples depends on the block-size of the audioread library.
                              So it can be of block-size higher, where the block-size is typically 1024 or 4096.
+            num_workers (int): Number of processes to compute the features with.
+                               The utterances are distributed to the processes,
+                               the features are written by the calling process only.
+                               The result is the same as with a single process.
+            pipelined (bool): If ``True``, the features are written in a background thread,
+                              while the next utterance is processed.
+                              The timings of the stages are logged.
+            swmr (bool): If ``True``, the feature-container can be read by other processes,
+                         while the features are extracted (see :meth:`process_corpus`).
 
         Returns:
             FeatureContainer: The feature-container containing the processed features.
         """
+        return self._process_corpus(corpus, output_path, frame_size=frame_size, hop_size=hop_size, sr=None,
+                                    online=True, chunk_size=chunk_size, buffer_size=buffer_size,
+                                    num_workers=num_workers, pipelined=pipelined, swmr=swmr)
 
-        # skipcq: PYL-W0613
-        def processing_func(utterance, feat_container, frame_size, hop_size, corpus, sr):
-            for chunk in self.process_utterance_online(utterance,
-                                                       frame_size=frame_size,
-                                                       hop_size=hop_size,
-                                                       corpus=corpus,
-                                                       chunk_size=chunk_size,
-                                                       buffer_size=buffer_size):
-                feat_container.append(utterance.idx, chunk)
-
-        return self._process_corpus(corpus, output_path, processing_func,
-                                    frame_size=frame_size, hop_size=hop_size, sr=None)
-
-    def process_features(self, corpus, input_features, output_path):
+    def process_features(self, corpus, input_features, output_path, num_workers=1, pipelined=False):
         """
         Process all features of the given corpus and save the processed features in a feature-container.
         The features are processed in **offline** mode, all features of an utterance at once.
@@ -90,6 +111,13 @@ class Processor(metaclass=abc.ABCMeta):
             corpus (Corpus): The corpus to process the utterances from.
             input_features (FeatureContainer): The feature-container to process the frames from.
             output_path (str): A path to save the feature-container to.
+            num_workers (int): Number of processes to compute the features with.
+                               The input features are read and the processed features
+                               are written by the calling process only.
+                               The result is the same as with a single process.
+            pipelined (bool): If ``True``, the input features are read and the processed features are written
+                              in background threads, while the features are computed.
+                              The timings of the stages are logged.
 
         Returns:
             FeatureContainer: The feature-container containing the processed features.
@@ -99,12 +127,26 @@ class Processor(metaclass=abc.ABCMeta):
 
         input_features.open()
 
-        for utterance in corpus.utterances.values():
-            sampling_rate = input_features.sampling_rate
-            frames = input_features.get(utterance.idx, mem_map=False)
+        def read_frames():
+            for utterance in corpus.utterances.values():
+                sampling_rate = input_features.sampling_rate
+                frames = input_features.get(utterance.idx, mem_map=False)
+                yield utterance, frames, sampling_rate
+
+        def compute(utterance, frames, sampling_rate):
             processed = self.process_frames(frames, sampling_rate, offset=0, last=True,
                                             utterance=utterance, corpus=corpus)
-            feat_container.set(utterance.idx, processed)
+            return utterance.idx, processed
+
+        if num_workers > 1:
+            with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(self, corpus)) as p:
+                tasks = ((utterance.idx, frames, sampling_rate) for utterance, frames, sampling_rate in read_frames())
+                results = _imap_bounded(p, _process_frames_worker, tasks, 2 * num_workers)
+
+                _run_stages(results, lambda utterance_idx, processed: (utterance_idx, processed),
+                            feat_container.set, pipelined)
+        else:
+            _run_stages(read_frames(), compute, feat_container.set, pipelined)
 
         tf_frame_size, tf_hop_size = self.frame_transform(input_features.frame_size, input_features.hop_size)
         feat_container.frame_size = tf_frame_size
@@ -134,25 +176,28 @@ class Processor(metaclass=abc.ABCMeta):
 
         input_features.open()
 
-        for utterance in corpus.utterances.values():
-            sampling_rate = input_features.sampling_rate
-            frames = input_features.get(utterance.idx, mem_map=True)
+        with feat_container.buffered_append():
+            for utterance in corpus.utterances.values():
+                sampling_rate = input_features.sampling_rate
+                frames = input_features.get(utterance.idx, mem_map=True)
 
-            current_frame = 0
+                current_frame = 0
 
-            while current_frame < frames.shape[0]:
-                last = current_frame + chunk_size > frames.shape[0]
-                to_frame = current_frame + chunk_size
+                while current_frame < frames.shape[0]:
+                    last = current_frame + chunk_size > frames.shape[0]
+                    to_frame = current_frame + chunk_size
 
-                chunk = frames[current_frame:to_frame]
+                    chunk = frames[current_frame:to_frame]
 
-                processed = self.process_frames(chunk, sampling_rate, current_frame,
-                                                last=last, utterance=utterance, corpus=corpus)
+                    processed = self.process_frames(chunk, sampling_rate, current_frame,
+                                                    last=last, utterance=utterance, corpus=corpus)
 
-                if processed is not None:
-                    feat_container.append(utterance.idx, processed)
+                    if processed is not None:
+                        feat_container.append(utterance.idx, processed)
 
-                current_frame += chunk_size
+                    current_frame += chunk_size
+
+                feat_container.flush(utterance.idx)
 
         tf_frame_size, tf_hop_size = self.frame_transform(input_features.frame_size, input_features.hop_size)
         feat_container.frame_size = tf_frame_size
@@ -231,8 +276,6 @@ class Processor(metaclass=abc.ABCMeta):
         Returns:
             np.ndarray: The processed features.
         """
-        frame_settings = units.FrameSettings(frame_size, hop_size)
-
         if end != float('inf'):
             samples = track.read_samples(sr=sr, offset=start, duration=end-start)
         else:
@@ -241,21 +284,8 @@ class Processor(metaclass=abc.ABCMeta):
         if sr is None:
             sr = track.sampling_rate
 
-        if samples.size <= 0:
-            raise ValueError('Track {} has no samples'.format(track.idx))
-
-        # Pad with zeros to match frames
-        num_frames = frame_settings.num_frames(samples.size)
-        num_pad_samples = (num_frames - 1) * hop_size + frame_size
-
-        if num_pad_samples > samples.size:
-            samples = np.pad(samples, (0, num_pad_samples - samples.size), mode='constant', constant_values=0)
-
-        # Get sampling-rate if not given
-        sampling_rate = sr or utterance.sampling_rate
-
-        frames = librosa.util.frame(samples, frame_length=frame_size, hop_length=hop_size).T
-        return self.process_frames(frames, sampling_rate, 0, last=True, utterance=utterance, corpus=corpus)
+        return self._process_samples(samples, track, frame_size=frame_size, hop_size=hop_size, sr=sr,
+                                     utterance=utterance, corpus=corpus)
 
     def process_track_online(self, track, frame_size=400, hop_size=160,
                              start=0, end=float('inf'), utterance=None, corpus=None,
@@ -284,7 +314,7 @@ class Processor(metaclass=abc.ABCMeta):
         """
 
         current_frame = 0
-        frames = []
+        frames = None
 
         duration = None
         sr = track.sampling_rate
@@ -293,25 +323,35 @@ class Processor(metaclass=abc.ABCMeta):
             duration = end - start
 
         # Process chunks that are within end bounds
-        for frame, is_last in track.read_frames(frame_size,
-                                                hop_size,
-                                                offset=start,
-                                                duration=duration,
-                                                buffer_size=buffer_size):
+        for block, is_last in track.read_frame_blocks(frame_size,
+                                                      hop_size,
+                                                      offset=start,
+                                                      duration=duration,
+                                                      buffer_size=buffer_size):
 
-            frames.append(frame)
+            if frames is not None:
+                block = np.vstack([frames, block])
 
-            if len(frames) == chunk_size:
-                processed = self.process_frames(np.array(frames), sr, current_frame,
-                                                last=is_last, utterance=utterance, corpus=corpus)
+            num_chunks = block.shape[0] // chunk_size
+
+            for index in range(num_chunks):
+                chunk = block[index * chunk_size:(index + 1) * chunk_size]
+                last = is_last and (index + 1) * chunk_size == block.shape[0]
+
+                processed = self.process_frames(chunk, sr, current_frame,
+                                                last=last, utterance=utterance, corpus=corpus)
                 if processed is not None:
                     yield processed
                 current_frame += chunk_size
-                frames = frames[chunk_size:]
+
+            frames = block[num_chunks * chunk_size:]
+
+            if frames.shape[0] == 0:
+                frames = None
 
         # Process overlapping chunks with zero frames at the end
-        if len(frames) > 0:
-            processed = self.process_frames(np.array(frames), sr, current_frame,
+        if frames is not None:
+            processed = self.process_frames(frames, sr, current_frame,
                                             last=True, utterance=utterance, corpus=corpus)
             yield processed
 
@@ -356,14 +396,59 @@ class Processor(metaclass=abc.ABCMeta):
         """
         return frame_size, hop_size
 
-    def _process_corpus(self, corpus, output_path, processing_func, frame_size=400, hop_size=160, sr=None):
-        """ Utility function for processing a corpus with a separate processing function. """
-        feat_container = containers.FeatureContainer(output_path)
+    def _process_samples(self, samples, track, frame_size=400, hop_size=160, sr=None, utterance=None, corpus=None):
+        """ Utility function for processing the samples of a track in **offline** mode. """
+        frame_settings = units.FrameSettings(frame_size, hop_size)
+
+        if samples.size <= 0:
+            raise ValueError('Track {} has no samples'.format(track.idx))
+
+        # Pad with zeros to match frames
+        num_frames = frame_settings.num_frames(samples.size)
+        num_pad_samples = (num_frames - 1) * hop_size + frame_size
+
+        if num_pad_samples > samples.size:
+            samples = np.pad(samples, (0, num_pad_samples - samples.size), mode='constant', constant_values=0)
+
+        # Get sampling-rate if not given
+        sampling_rate = sr or utterance.sampling_rate
+
+        frames = librosa.util.frame(samples, frame_length=frame_size, hop_length=hop_size).T
+        return self.process_frames(frames, sampling_rate, 0, last=True, utterance=utterance, corpus=corpus)
+
+    def _process_corpus(self, corpus, output_path, frame_size=400, hop_size=160, sr=None,
+                        online=False, chunk_size=1, buffer_size=5760000, num_workers=1, pipelined=False,
+                        swmr=False):
+        """
+        Utility function for processing all utterances of a corpus in **offline** or **online** mode.
+        In offline mode the samples of all utterances are read grouped by track
+        (see :meth:`audiomate.corpus.CorpusView.read_utterance_samples`).
+        """
+        feat_container = containers.FeatureContainer(output_path, swmr=swmr)
         feat_container.open()
 
+        tf_frame_size, tf_hop_size = self.frame_transform(frame_size, hop_size)
         sampling_rate = -1
+        swmr_started = False
+
+        def write_attrs():
+            feat_container.frame_size = tf_frame_size
+            feat_container.hop_size = tf_hop_size
+            feat_container.sampling_rate = sr or sampling_rate
+
+        def start_swmr(data):
+            # No keys can be created and no attributes changed in SWMR mode
+            nonlocal swmr_started
+            write_attrs()
+
+            for utterance_idx in corpus.utterances.keys():
+                feat_container.declare(utterance_idx, row_shape=data.shape[1:], dtype=data.dtype)
 
-        for utterance in corpus.utterances.values():
+            feat_container.start_swmr()
+            swmr_started = True
+
+        def check_sampling_rate(utterance):
+            nonlocal sampling_rate
             utt_sampling_rate = utterance.sampling_rate
 
             if sr is None:
@@ -373,13 +458,207 @@ class Processor(metaclass=abc.ABCMeta):
 
                 sampling_rate = utt_sampling_rate
 
-            processing_func(utterance, feat_container, frame_size, hop_size, sr, corpus)
+        def compute(utterance, data):
+            check_sampling_rate(utterance)
+            return utterance, data
+
+        def compute_offline(utterance, samples):
+            check_sampling_rate(utterance)
+            data = self._process_samples(samples, utterance.track, frame_size=frame_size, hop_size=hop_size,
+                                         sr=sr or utterance.sampling_rate, utterance=utterance, corpus=corpus)
+            return utterance, data
+
+        def compute_online(utterance):
+            check_sampling_rate(utterance)
+            chunks = self.process_utterance_online(utterance,
+                                                   frame_size=frame_size,
+                                                   hop_size=hop_size,
+                                                   corpus=corpus,
+                                                   chunk_size=chunk_size,
+                                                   buffer_size=buffer_size)
+
+            # Compute the chunks now, not while writing them in the background
+            if pipelined:
+                chunks = list(chunks)
+
+            return utterance, chunks
+
+        def write(utterance, data):
+            if online:
+                with feat_container.buffered_append():
+                    for chunk in data:
+                        if swmr and not swmr_started:
+                            start_swmr(chunk)
+
+                        feat_container.append(utterance.idx, chunk)
+            elif swmr:
+                if not swmr_started:
+                    start_swmr(data)
+
+                feat_container.append(utterance.idx, data)
+            else:
+                feat_container.set(utterance.idx, data)
+
+            if swmr_started:
+                feat_container.publish(utterance.idx)
+
+        if num_workers > 1:
+            results = self._compute_features_parallel(
+                corpus, frame_size, hop_size, sr, online, chunk_size, buffer_size, num_workers
+            )
+            _run_stages(results, compute, write, pipelined)
+        elif online:
+            _run_stages(([utterance] for utterance in corpus.utterances.values()), compute_online, write, pipelined)
+        else:
+            _run_stages(corpus.read_utterance_samples(sr=sr), compute_offline, write, pipelined)
 
-        tf_frame_size, tf_hop_size = self.frame_transform(frame_size, hop_size)
-        feat_container.frame_size = tf_frame_size
-        feat_container.hop_size = tf_hop_size
-        feat_container.sampling_rate = sr or sampling_rate
+        if not swmr_started:
+            write_attrs()
 
         feat_container.close()
 
         return feat_container
+
+    def _compute_features_parallel(self, corpus, frame_size, hop_size, sr, online, chunk_size, buffer_size,
+                                   num_workers):
+        """
+        Yield every utterance of the corpus with its features, computed by a pool of processes.
+        In offline mode every process computes the features of all utterances of a track,
+        in online mode of a single utterance (the features are the list of the processed chunks).
+        The utterances are yielded in the same order as they are processed with a single process.
+        """
+        decoded_cache = tracks.active_decoded_cache()
+
+        # The workers only read from the decoded cache, so all files are stored in advance.
+        # The cache is closed, so no open file handle is inherited by the workers.
+        if decoded_cache is not None and not decoded_cache.read_only:
+            decoded_cache.fill(list(corpus.tracks.values()), num_workers=num_workers)
+            decoded_cache.close()
+
+        with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(self, corpus)) as p:
+            if online:
+                func = functools.partial(_process_utterance_online_worker, frame_size=frame_size,
+                                         hop_size=hop_size, chunk_size=chunk_size, buffer_size=buffer_size)
+                tasks = [[utterance_idx] for utterance_idx in corpus.utterances.keys()]
+            else:
+                func = functools.partial(_process_track_worker, frame_size=frame_size, hop_size=hop_size, sr=sr)
+                utts_per_track = collections.defaultdict(list)
+
+                for utterance in corpus.utterances.values():
+                    utts_per_track[utterance.track.idx].append(utterance.idx)
+
+                tasks = [utts_per_track[track_idx] for track_idx in sorted(utts_per_track.keys())]
+
+            for results in _imap_bounded(p, func, tasks, 2 * num_workers):
+                for utterance_idx, data in results:
+                    yield corpus.utterances[utterance_idx], data
+
+
+def _run_stages(items, compute_func, write_func, pipelined):
+    """
+    Call ``compute_func`` for every item (a tuple of arguments)
+    and ``write_func`` with the result (a tuple of arguments) in the same order.
+    If ``pipelined`` is ``True``, the items are read
+    and the results are written in background threads (see :mod:`audiomate.utils.background`),
+    with at most ``PIPELINE_QUEUE_SIZE`` items per queue. The timings of the stages are logged.
+    """
+    if not pipelined:
+        for item in items:
+            write_func(*compute_func(*item))
+
+        return
+
+    start = time.perf_counter()
+
+    with background.BackgroundReader(items, queue_size=PIPELINE_QUEUE_SIZE) as reader:
+        with background.BackgroundWriter(write_func, queue_size=PIPELINE_QUEUE_SIZE) as writer:
+            for item in reader:
+                writer.write(*compute_func(*item))
+
+    total_time = time.perf_counter() - start
+
+    logger.info(
+        'Processed %d utterances in %.2fs (pipelined): '
+        'read %.2fs (queue depth mean %.1f / max %d), '
+        'compute %.2fs (waited %.2fs for reading / %.2fs for writing), '
+        'write %.2fs (queue depth mean %.1f / max %d)',
+        writer.num_items, total_time,
+        reader.busy_time, reader.mean_depth, reader.max_depth,
+        total_time - reader.wait_time - writer.wait_time, reader.wait_time, writer.wait_time,
+        writer.busy_time, writer.mean_depth, writer.max_depth
+    )
+
+
+_worker_processor = None
+_worker_corpus = None
+
+
+def _init_worker(processor, corpus):
+    """ Store the processor and the corpus in a worker process of the pool. """
+    global _worker_processor
+    global _worker_corpus
+
+    _worker_processor = processor
+    _worker_corpus = corpus
+
+    decoded_cache = tracks.active_decoded_cache()
+
+    if decoded_cache is not None:
+        decoded_cache.read_only = True
+
+
+def _process_track_worker(utterance_idxs, frame_size, hop_size, sr):
+    """ Return the features of the given utterances, which belong to the same track (**offline** mode). """
+    results = []
+
+    for utterance, samples in _worker_corpus.read_utterance_samples(sr=sr, utterance_ids=utterance_idxs):
+        data = _worker_processor._process_samples(  # skipcq: PYL-W0212
+            samples, utterance.track, frame_size=frame_size, hop_size=hop_size,
+            sr=sr or utterance.sampling_rate, utterance=utterance, corpus=_worker_corpus
+        )
+        results.append((utterance.idx, data))
+
+    return results
+
+
+def _process_utterance_online_worker(utterance_idxs, frame_size, hop_size, chunk_size, buffer_size):
+    """ Return the processed chunks of the given utterances (**online** mode). """
+    results = []
+
+    for utterance_idx in utterance_idxs:
+        chunks = list(_worker_processor.process_utterance_online(_worker_corpus.utterances[utterance_idx],
+                                                                 frame_size=frame_size,
+                                                                 hop_size=hop_size,
+                                                                 corpus=_worker_corpus,
+                                                                 chunk_size=chunk_size,
+                                                                 buffer_size=buffer_size))
+        results.append((utterance_idx, chunks))
+
+    return results
+
+
+def _process_frames_worker(task):
+    """ Return the utterance-idx with the processed frames (**offline** mode). """
+    utterance_idx, frames, sampling_rate = task
+    processed = _worker_processor.process_frames(frames, sampling_rate, offset=0, last=True,
+                                                 utterance=_worker_corpus.utterances[utterance_idx],
+                                                 corpus=_worker_corpus)
+    return utterance_idx, processed
+
+
+def _imap_bounded(pool, func, tasks, max_pending):
+    """
+    Like ``pool.imap``, but at most ``max_pending`` tasks are submitted,
+    that weren't yielded yet. So the results (and the tasks, if generated lazily)
+    don't pile up in memory, if the consumer is slower than the workers.
+    """
+    pending = collections.deque()
+
+    for task in tasks:
+        pending.append(pool.apply_async(func, (task,)))
+
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
@@ -10,16 +10,21 @@ which is built by passing the parent steps to the ``__init__`` method of a step.
 Every step that is created has his own graph, but inherits all nodes and edges of the graphs of his parent steps.
 
 Every pipeline represents a processor and implements the ``process_frames`` method.
+Before processing, the graph is compiled into an ``ExecutionPlan``, which is reused for all sequences.
 """
 
 from .base import Chunk  # noqa: F401
 from .base import Step  # noqa: F401
 from .base import Computation  # noqa: F401
 from .base import Reduction  # noqa: F401
+from .base import ExecutionPlan  # noqa: F401
 
 from .normalization import MeanVarianceNorm  # noqa: F401
 
+from .spectral import SpectralComputation  # noqa: F401
+from .spectral import PowerSpectrum  # noqa: F401
 from .spectral import MelSpectrogram  # noqa: F401
+from .spectral import LogMelSpectrogram  # noqa: F401
 from .spectral import MFCC  # noqa: F401
 
 from .magnitude_scaling import PowerToDb  # noqa: F401
@@ -34,3 +39,5 @@ from .pool import VarPool  # noqa: F401
 
 from .onset import OnsetStrength  # noqa: F401
 from .rhythm import Tempogram  # noqa: F401
+
+from .optimize import optimize  # noqa: F401
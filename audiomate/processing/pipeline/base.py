@@ -111,12 +111,43 @@ class Buffer:
         self.right_context = right_context
         self.num_buffers = num_buffers
 
-        self.buffers = [None] * self.num_buffers
+        self.buffers_full = None
+        self.current_frame = 0
+        self.current_left_context = 0
+
+        self._storage = None
+        self._owned = None
+        self._start = None
+        self._end = None
+
+        self.reset()
+
+    @property
+    def buffers(self):
+        """
+        list: The frames in every buffer
+        (``None`` for a buffer, that wasn't updated yet).
+        """
+        return [
+            None if storage is None else storage[start:end]
+            for storage, start, end in zip(self._storage, self._start, self._end)
+        ]
+
+    def reset(self):
+        """ Remove all frames from the buffer, to start with a new sequence. """
         self.buffers_full = [False] * self.num_buffers
 
         self.current_frame = 0
         self.current_left_context = 0
 
+        # Every buffer is a window [start:end] of an array.
+        # The array is only written behind the window and replaced by a new one, if it is full.
+        # So chunks returned by ``get`` are views, that are never overwritten.
+        self._storage = [None] * self.num_buffers
+        self._owned = [False] * self.num_buffers
+        self._start = [0] * self.num_buffers
+        self._end = [0] * self.num_buffers
+
     def update(self, data, offset, is_last, buffer_index=0):
         """
         Update the buffer at the given index.
@@ -133,16 +164,22 @@ class Buffer:
         if buffer_index >= self.num_buffers:
             raise ValueError('Expected buffer index < {} but got index {}.'.format(self.num_buffers, buffer_index))
 
-        if self.buffers[buffer_index] is not None and self.buffers[buffer_index].shape[0] > 0:
-            expected_next_frame = self.current_frame + self.buffers[buffer_index].shape[0]
+        num_buffered = self._end[buffer_index] - self._start[buffer_index]
+
+        if self._storage[buffer_index] is not None and num_buffered > 0:
+            expected_next_frame = self.current_frame + num_buffered
             if expected_next_frame != offset:
                 raise ValueError(
                     'There are missing frames. Last frame in buffer is {}. The passed frames start at {}.'.format(
                         expected_next_frame, offset))
 
-            self.buffers[buffer_index] = np.vstack([self.buffers[buffer_index], data])
+            self._append(buffer_index, data)
         else:
-            self.buffers[buffer_index] = data
+            # The frames are used without copying them, until further frames are appended
+            self._storage[buffer_index] = data
+            self._owned[buffer_index] = False
+            self._start[buffer_index] = 0
+            self._end[buffer_index] = data.shape[0]
 
         self.buffers_full[buffer_index] = is_last
 
@@ -173,8 +210,9 @@ class Buffer:
             keep_from = max(0, chunk_size - keep_frames)
 
             for index in range(self.num_buffers):
-                data.append(self.buffers[index][:chunk_size])
-                self.buffers[index] = self.buffers[index][keep_from:]
+                start = self._start[index]
+                data.append(self._storage[index][start:start + chunk_size])
+                self._start[index] = start + keep_from
 
             if self.num_buffers == 1:
                 data = data[0]
@@ -192,16 +230,51 @@ class Buffer:
 
         return None
 
+    def _append(self, buffer_index, data):
+        """
+        Append the frames behind the window of the buffer.
+        If there is no space left, the buffered frames are moved into a new array
+        with twice the needed size. So appending is amortized O(1) per frame.
+        """
+        storage = self._storage[buffer_index]
+        start = self._start[buffer_index]
+        end = self._end[buffer_index]
+
+        if data.shape[1:] != storage.shape[1:]:
+            raise ValueError('The frames have shape {}, but the buffered frames have shape {}.'.format(
+                data.shape[1:], storage.shape[1:]))
+
+        num_frames = data.shape[0]
+        dtype = np.result_type(storage.dtype, data.dtype)
+
+        if not self._owned[buffer_index] or end + num_frames > storage.shape[0] or dtype != storage.dtype:
+            num_buffered = end - start
+            capacity = 2 * (num_buffered + num_frames)
+
+            new_storage = np.empty((capacity,) + storage.shape[1:], dtype=dtype)
+            new_storage[:num_buffered] = storage[start:end]
+
+            storage = new_storage
+            start = 0
+            end = num_buffered
+
+            self._storage[buffer_index] = storage
+            self._owned[buffer_index] = True
+            self._start[buffer_index] = start
+
+        storage[end:end + num_frames] = data
+        self._end[buffer_index] = end + num_frames
+
     def _smallest_buffer(self):
         """ Get the size of the smallest buffer. """
 
         smallest = np.inf
 
-        for buffer in self.buffers:
-            if buffer is None:
+        for storage, start, end in zip(self._storage, self._start, self._end):
+            if storage is None:
                 return 0
-            elif buffer.shape[0] < smallest:
-                smallest = buffer.shape[0]
+            elif end - start < smallest:
+                smallest = end - start
 
         return smallest
 
@@ -214,6 +287,101 @@ class Buffer:
         return True
 
 
+class ExecutionPlan:
+    """
+    The steps of a pipeline, frozen into a flat order of execution.
+    The graph is sorted topologically and the buffers, as well as the steps
+    that receive the output of every step, are determined once.
+    Between two sequences only the buffers are reset.
+
+    It is created by :meth:`Step.compile`.
+
+    Args:
+        graph (networkx.DiGraph): The graph of the pipeline.
+        output_step (Step): The step, whose output is returned (the last step).
+
+    Attributes:
+        steps (list): The steps in order of execution.
+        buffers (list): The buffer of every step (in the order of ``steps``).
+        input_targets (list): Tuples ``(step-index, buffer-index)`` of the buffers
+                              that receive the input data.
+        targets (list): For every step, tuples ``(step-index, buffer-index)``
+                        of the buffers that receive the output of the step.
+    """
+
+    def __init__(self, graph, output_step):
+        self.steps = list(nx.algorithms.dag.topological_sort(graph))
+        self.output_index = self.steps.index(output_step)
+
+        step_indices = {step: index for index, step in enumerate(self.steps)}
+
+        self.buffers = []
+        self.input_targets = []
+        self.targets = []
+
+        for index, step in enumerate(self.steps):
+            num_buffers = 1
+
+            if isinstance(step, Reduction):
+                num_buffers = len(step.parents)
+
+            self.buffers.append(Buffer(step.min_frames, step.left_context, step.right_context, num_buffers))
+
+            if graph.in_degree(step) == 0:
+                self.input_targets.append((index, 0))
+
+            step_targets = []
+
+            for _, child_step in graph.out_edges(step):
+                # if there are multiple inputs we have to get the correct index, to keep the ordering
+                if isinstance(child_step, Reduction):
+                    for buffer_index, parent in enumerate(child_step.parents):
+                        if parent is step:
+                            step_targets.append((step_indices[child_step], buffer_index))
+                else:
+                    step_targets.append((step_indices[child_step], 0))
+
+            self.targets.append(step_targets)
+
+    def reset(self):
+        """ Reset the buffers of all steps, to start with a new sequence. """
+        for buffer in self.buffers:
+            buffer.reset()
+
+    def run(self, data, sampling_rate, offset=0, last=False, utterance=None, corpus=None):
+        """
+        Process the given frames with all steps (see :meth:`Step.process_frames`).
+        If ``offset == 0``, the buffers are reset first.
+
+        Returns:
+            np.ndarray: The output of the last step,
+            ``None`` if it didn't output anything for the given frames.
+        """
+        if offset == 0:
+            self.reset()
+
+        # Update buffers with input data
+        self._update_buffers(self.input_targets, data, offset, last)
+
+        for index, step in enumerate(self.steps):
+            chunk = self.buffers[index].get()
+
+            if chunk is not None:
+                res = step.compute(chunk, sampling_rate, utterance=utterance, corpus=corpus)
+
+                if index == self.output_index:
+                    return res
+
+                self._update_buffers(self.targets[index], res, chunk.offset + chunk.left_context, chunk.is_last)
+
+        return None
+
+    def _update_buffers(self, targets, data, offset, is_last):
+        """ Update the buffers of the given targets with the data. """
+        for step_index, buffer_index in targets:
+            self.buffers[step_index].update(data, offset, is_last, buffer_index=buffer_index)
+
+
 class Step(processing.Processor, metaclass=abc.ABCMeta):
     """
     This class is the base class for a step in a processing pipeline.
@@ -225,6 +393,10 @@ class Step(processing.Processor, metaclass=abc.ABCMeta):
     Every step has to provide a ``compute`` method which is the actual
     processing.
 
+    On the first call of ``process_frames`` the pipeline is compiled
+    into an :class:`ExecutionPlan`, which is reused for all following sequences
+    (see :meth:`compile`).
+
     If the implementation of a step does change the frame or hop-size,
     it is expected to provide a transform via the ``frame_transform_step``
     method.  Frame-size and hop-size are measured in samples regarding the
@@ -242,41 +414,30 @@ class Step(processing.Processor, metaclass=abc.ABCMeta):
         self.left_context = left_context
         self.right_context = right_context
 
-        self.steps_sorted = []
-        self.buffers = {}
-        self.target_buffers = {}
+        self.plan = None
+
+    def compile(self):
+        """
+        Freeze the graph of this step into an :class:`ExecutionPlan`,
+        which is used by ``process_frames`` from now on.
+        This is done automatically on the first call of ``process_frames``.
+        It only has to be called again, if the graph is changed afterwards.
+
+        Returns:
+            ExecutionPlan: The plan.
+        """
+        self.plan = ExecutionPlan(self.graph, self)
+        return self.plan
 
     def process_frames(self, data, sampling_rate, offset=0, last=False, utterance=None, corpus=None):
         """
         Execute the processing of this step and all dependent
         parent steps.
         """
+        if self.plan is None:
+            self.compile()
 
-        if offset == 0:
-            self.steps_sorted = list(nx.algorithms.dag.topological_sort(self.graph))
-            self._create_buffers()
-            self._define_output_buffers()
-
-        # Update buffers with input data
-        self._update_buffers(None, data, offset, last)
-
-        # Go through the ordered (by dependencies) steps
-        for step in self.steps_sorted:
-
-            chunk = self.buffers[step].get()
-
-            if chunk is not None:
-                res = step.compute(chunk, sampling_rate, utterance=utterance, corpus=corpus)
-
-                # If step is self, we know its the last step so return the data
-                if step == self:
-                    return res
-
-                # Otherwise update buffers of child steps
-                else:
-                    self._update_buffers(step, res, chunk.offset + chunk.left_context, chunk.is_last)
-
-        return None
+        return self.plan.run(data, sampling_rate, offset=offset, last=last, utterance=utterance, corpus=corpus)
 
     def frame_transform(self, frame_size, hop_size):
         parent_steps = self._parent_steps(self)
@@ -343,67 +504,25 @@ class Step(processing.Processor, metaclass=abc.ABCMeta):
         """
         return frame_size, hop_size
 
-    def _update_buffers(self, from_step, data, offset, is_last):
-        """
-        Update the buffers of all steps that need data from ``from_step``.
-        If ``from_step`` is None it means the data is the input data.
+    def parameters(self):
         """
+        Return the values of the parameters, that define the output of the step
+        (besides its parents). Steps of the same type with equal parameters
+        and the same parents are merged by :func:`audiomate.processing.pipeline.optimize`.
 
-        for to_step, buffer in self.target_buffers[from_step]:
-            parent_index = 0
-
-            # if there multiple inputs we have to get the correct index, to keep the ordering
-            if isinstance(to_step, Reduction):
-                parent_index = to_step.parents.index(from_step)
+        By default the parameters are unknown, so the step is never merged.
+        A step, that can be merged, has to return all its parameters.
 
-            buffer.update(data, offset, is_last, buffer_index=parent_index)
-
-    def _define_output_buffers(self):
-        """
-        Prepare a dictionary so we know what buffers have to be update with
-        the the output of every step.
+        Returns:
+            tuple: The values of the parameters, ``None`` if unknown.
         """
+        return None
 
-        # First define buffers that need input data
-        self.target_buffers = {
-            None: [(step, self.buffers[step]) for step in self._get_input_steps()]
-        }
-
-        # Go through all steps and append the buffers of their child nodes
-        for step in self.steps_sorted:
-            if step != self:
-                child_steps = [edge[1] for edge in self.graph.out_edges(step)]
-                self.target_buffers[step] = [(child_step, self.buffers[child_step]) for child_step in child_steps]
-
-    def _get_input_steps(self):
+    def _parents_changed(self):
         """
-        Search and return all steps that have no parents.
-        These are the steps that are get the input data.
+        Called after the parents of the step were changed
+        (see :func:`audiomate.processing.pipeline.optimize`).
         """
-        input_steps = []
-
-        for step in self.steps_sorted:
-            parent_steps = self._parent_steps(step)
-
-            if len(parent_steps) == 0:
-                input_steps.append(step)
-
-        return input_steps
-
-    def _create_buffers(self):
-        """ Create a buffer for every step in the pipeline. """
-
-        self.buffers = {}
-
-        for step in self.graph.nodes():
-            num_buffers = 1
-
-            if isinstance(step, Reduction):
-                num_buffers = len(step.parents)
-
-            self.buffers[step] = Buffer(step.min_frames, step.left_context, step.right_context, num_buffers)
-
-        return self.buffers
 
     def _parent_steps(self, step):
         """ Return a list of all parent steps. """
@@ -23,5 +23,8 @@ class PowerToDb(base.Computation):
         self.amin = amin
         self.top_db = top_db
 
+    def parameters(self):
+        return self.ref, self.amin, self.top_db
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         return librosa.power_to_db(chunk.data.T, ref=self.ref, amin=self.amin, top_db=self.top_db).T
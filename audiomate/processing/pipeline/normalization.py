@@ -21,5 +21,8 @@ class MeanVarianceNorm(base.Computation):
         self.variance = variance
         self.std = math.sqrt(variance)
 
+    def parameters(self):
+        return self.mean, self.variance
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         return (chunk.data - self.mean) / self.std
@@ -1,13 +1,13 @@
 import librosa
-import numpy as np
 
-from . import base
 from . import spectral
 
 
-class OnsetStrength(base.Computation):
+class OnsetStrength(spectral.SpectralComputation):
     """
     Compute a spectral flux onset strength envelope.
+    The parent can also be a :class:`PowerSpectrum`, :class:`MelSpectrogram`
+    or :class:`LogMelSpectrogram` step.
 
     Based on http://librosa.github.io/librosa/generated/librosa.onset.onset_strength.html
 
@@ -16,15 +16,12 @@ class OnsetStrength(base.Computation):
     """
 
     def __init__(self, n_mels=128, parent=None, name=None):
-        super(OnsetStrength, self).__init__(left_context=1, right_context=0, parent=parent, name=name)
-
-        self.n_mels = n_mels
+        super(OnsetStrength, self).__init__(n_mels=n_mels, output_kind=spectral.LOG_MEL, left_context=1,
+                                            right_context=0, parent=parent, name=name)
 
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         # Compute mel-spetrogram
-        power_spec = np.abs(spectral.stft_from_frames(chunk.data.T)) ** 2
-        mel = np.abs(librosa.feature.melspectrogram(S=power_spec, n_mels=self.n_mels, sr=sampling_rate))
-        mel_power = librosa.power_to_db(mel)
+        mel_power = self.compute_spectrum(chunk, sampling_rate)
 
         # Compute onset strengths
         oenv = librosa.onset.onset_strength(S=mel_power, center=False)
@@ -0,0 +1,224 @@
+"""
+Optimization of the graph of a processing pipeline (see :func:`optimize`).
+"""
+import networkx as nx
+import numpy as np
+
+from . import base
+from . import spectral
+
+
+def optimize(step, share_spectra=True):
+    """
+    Optimize the pipeline of the given (last) step, so no computation is done twice.
+
+    * Steps of the same type with identical parameters and the same parents
+      compute the same output, so they are merged into one step.
+    * If ``share_spectra`` is ``True``, spectral steps (e.g. :class:`audiomate.processing.pipeline.MFCC`,
+      :class:`audiomate.processing.pipeline.OnsetStrength` and :class:`audiomate.processing.pipeline.Tempogram`),
+      that compute their spectrum from the frames of the same parent,
+      get the intermediate spectra from shared steps instead
+      (:class:`audiomate.processing.pipeline.PowerSpectrum`,
+      :class:`audiomate.processing.pipeline.MelSpectrogram` and
+      :class:`audiomate.processing.pipeline.LogMelSpectrogram`).
+      The ``log-mel`` spectrum is clipped relative to the maximum of a chunk,
+      so it is only shared between steps without context and ``min_frames == 1``,
+      which get the same chunks as the shared step.
+      Steps with context (e.g. ``OnsetStrength`` and ``Tempogram``) share the ``mel`` spectrum only.
+
+    The graphs of the steps are changed in place.
+    Steps are compared by their :meth:`audiomate.processing.pipeline.Step.parameters`,
+    steps with unknown parameters are never merged.
+    In offline mode the output is the same as without optimization.
+    In online mode the spectra of steps with context are computed on chunks of another size,
+    so their output can differ in the order of the floating point precision.
+
+    Args:
+        step (Step): The last step of the pipeline (the one, that is used to process the frames).
+        share_spectra (bool): Whether to share the spectra between spectral steps.
+
+    Returns:
+        Step: The given step.
+
+    Example:
+        >>> mfcc = pipeline.MFCC(n_mfcc=13, n_mels=128)
+        >>> onset = pipeline.OnsetStrength(n_mels=128)
+        >>> tempo = pipeline.Tempogram(n_mels=128, win_length=384)
+        >>> stack = pipeline.optimize(pipeline.Stack([mfcc, onset, tempo]))
+        >>> # The power- and mel-spectrum are computed once for all three steps
+    """
+    parents = {node: _parents(node) for node in step.graph.nodes()}
+    parents = _merge_duplicates(parents, step)
+
+    if share_spectra:
+        parents = _share_spectra(parents)
+        parents = _merge_duplicates(parents, step)
+
+    _rebuild_graphs(parents)
+
+    return step
+
+
+def _parents(step):
+    """ Return the parents of the step in the order of their inputs. """
+    if isinstance(step, base.Reduction):
+        return list(step.parents)
+
+    return step._parent_steps(step)  # skipcq: PYL-W0212
+
+
+def _topological_order(parents):
+    graph = nx.DiGraph()
+
+    for node, node_parents in parents.items():
+        graph.add_node(node)
+
+        for parent in node_parents:
+            graph.add_edge(parent, node)
+
+    return list(nx.algorithms.dag.topological_sort(graph))
+
+
+def _merge_duplicates(parents, output_step):
+    """
+    Replace every step by the first step of the same type,
+    with the same (merged) parents and equal parameters.
+    Return the parents of the remaining steps.
+    """
+    replacements = {}
+    candidates = {}
+
+    for node in _topological_order(parents):
+        node_parents = [replacements[parent] for parent in parents[node]]
+        key = (type(node), tuple(id(parent) for parent in node_parents))
+
+        for candidate in candidates.get(key, []):
+            if node is not output_step and _equal_parameters(candidate, node):
+                replacements[node] = candidate
+                break
+        else:
+            replacements[node] = node
+            candidates.setdefault(key, []).append(node)
+
+    return {
+        node: [replacements[parent] for parent in node_parents]
+        for node, node_parents in parents.items()
+        if replacements[node] is node
+    }
+
+
+def _share_spectra(parents):
+    """
+    Insert shared spectrum steps for all spectral steps, that compute their spectrum
+    from the frames of the same parent (or the input).
+    """
+    consumers = {}
+
+    for node, node_parents in parents.items():
+        if isinstance(node, spectral.SpectralComputation) and _input_kind(node_parents) == spectral.FRAMES:
+            source = node_parents[0] if len(node_parents) > 0 else None
+            consumers.setdefault(source, []).append(node)
+
+    parents = dict(parents)
+
+    for source, nodes in consumers.items():
+        if len(nodes) < 2:
+            continue
+
+        source_parents = [source] if source is not None else []
+        power = spectral.PowerSpectrum()
+        parents[power] = source_parents
+
+        for node in nodes:
+            # A power spectrum step of the same parent is merged with the shared one afterwards
+            if node.spectrum_kind == spectral.POWER:
+                continue
+
+            new_parent = power
+            input_index = _shared_input_index(node)
+
+            if input_index >= spectral.SPECTRUM_KINDS.index(spectral.MEL):
+                mel = spectral.MelSpectrogram(n_mels=node.n_mels)
+                parents[mel] = [power]
+                new_parent = mel
+
+            if input_index >= spectral.SPECTRUM_KINDS.index(spectral.LOG_MEL):
+                log_mel = spectral.LogMelSpectrogram(n_mels=node.n_mels)
+                parents[log_mel] = [mel]
+                new_parent = log_mel
+
+            parents[node] = [new_parent]
+
+    return parents
+
+
+def _shared_input_index(node):
+    """
+    Return the index of the kind of spectrum, the step should get as input.
+    For an intermediate spectrum step the previous kind,
+    otherwise the kind of spectrum the step is based on.
+    """
+    if node.spectrum_kind is not None:
+        return spectral.SPECTRUM_KINDS.index(node.spectrum_kind) - 1
+
+    index = spectral.SPECTRUM_KINDS.index(node.output_kind)
+
+    # The log-mel spectrum of a chunk with context differs from the one of the shared step
+    if node.output_kind == spectral.LOG_MEL and not _has_plain_chunks(node):
+        index -= 1
+
+    return index
+
+
+def _has_plain_chunks(node):
+    """ Return ``True``, if the step processes the chunks as they are (without context or minimal size). """
+    return node.min_frames == 1 and node.left_context == 0 and node.right_context == 0
+
+
+def _input_kind(node_parents):
+    """ Return the kind of the spectrum provided by the parents (``frames``, if no spectrum). """
+    if len(node_parents) == 1 and getattr(node_parents[0], 'spectrum_kind', None) is not None:
+        return node_parents[0].spectrum_kind
+
+    return spectral.FRAMES
+
+
+def _rebuild_graphs(parents):
+    """ Build the graph of every step from the given parents. """
+    for node in _topological_order(parents):
+        graph = nx.DiGraph()
+        graph.add_node(node)
+
+        for parent in parents[node]:
+            graph.add_nodes_from(parent.graph.nodes())
+            graph.add_edges_from(parent.graph.edges())
+            graph.add_edge(parent, node)
+
+        node.graph = graph
+        node.plan = None
+
+        if isinstance(node, base.Reduction):
+            node.parents = list(parents[node])
+
+        node._parents_changed()  # skipcq: PYL-W0212
+
+
+def _equal_parameters(step_a, step_b):
+    """ Return ``True``, if both steps have the same (known) parameters. """
+    params_a = step_a.parameters()
+    params_b = step_b.parameters()
+
+    if params_a is None or params_b is None or len(params_a) != len(params_b):
+        return False
+
+    for value, other in zip(params_a, params_b):
+        try:
+            if isinstance(value, np.ndarray) or isinstance(other, np.ndarray):
+                if not np.array_equal(value, other):
+                    return False
+            elif value != other:
+                return False
+        except (TypeError, ValueError):
+            return False
+
+    return True
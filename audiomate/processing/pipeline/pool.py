@@ -18,6 +18,9 @@ class AvgPool(base.Computation):
         self.size = size
         self.rest = None
 
+    def parameters(self):
+        return (self.size,)
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         # Get rid of old rest frames
         if chunk.offset == 0:
@@ -69,6 +72,9 @@ class VarPool(base.Computation):
         self.size = size
         self.rest = None
 
+    def parameters(self):
+        return (self.size,)
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         # Get rid of old rest frames
         if chunk.offset == 0:
@@ -9,5 +9,8 @@ class Stack(base.Reduction):
     All input matrices have to be of the same length (same number of frames).
     """
 
+    def parameters(self):
+        return ()
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         return np.hstack(chunk.data)
@@ -1,13 +1,14 @@
 import librosa
 import numpy as np
 
-from . import base
 from . import spectral
 
 
-class Tempogram(base.Computation):
+class Tempogram(spectral.SpectralComputation):
     """
-    Computation step to compute tempogram
+    Computation step to compute tempogram.
+    The parent can also be a :class:`PowerSpectrum`, :class:`MelSpectrogram`
+    or :class:`LogMelSpectrogram` step.
 
     Based on http://librosa.github.io/librosa/generated/librosa.feature.tempogram.html
 
@@ -18,23 +19,23 @@ class Tempogram(base.Computation):
     """
 
     def __init__(self, n_mels=128, win_length=384, parent=None, name=None):
-        super(Tempogram, self).__init__(min_frames=win_length, left_context=1, right_context=0,
-                                        parent=parent, name=name)
+        super(Tempogram, self).__init__(n_mels=n_mels, output_kind=spectral.LOG_MEL, min_frames=win_length,
+                                        left_context=1, right_context=0, parent=parent, name=name)
 
-        self.n_mels = n_mels
         self.win_length = win_length
 
         self.rest = None
 
+    def parameters(self):
+        return super(Tempogram, self).parameters() + (self.win_length,)
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         # Cleanup rest if it's the first frame
         if chunk.offset == 0:
             self.rest = None
 
         # Compute mel-spectrogram
-        power_spec = np.abs(spectral.stft_from_frames(chunk.data.T)) ** 2
-        mel = np.abs(librosa.feature.melspectrogram(S=power_spec, n_mels=self.n_mels, sr=sampling_rate))
-        mel_power = librosa.power_to_db(mel)
+        mel_power = self.compute_spectrum(chunk, sampling_rate)
 
         # Compute onset strengths
         oenv = librosa.onset.onset_strength(S=mel_power, center=False)
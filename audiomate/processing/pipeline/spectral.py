@@ -43,9 +43,132 @@ def stft_from_frames(frames, window='hann', dtype=np.complex64):
     return stft_matrix
 
 
-class MelSpectrogram(base.Computation):
+FRAMES = 'frames'
+POWER = 'power'
+MEL = 'mel'
+LOG_MEL = 'log-mel'
+
+SPECTRUM_KINDS = [FRAMES, POWER, MEL, LOG_MEL]
+
+
+def spectrum(data, input_kind, output_kind, sampling_rate, n_mels=128):
+    """
+    Compute a spectrum of the kind ``output_kind`` from data of the kind ``input_kind``.
+    The kinds are ``frames`` (the samples of the frames), ``power`` (power spectrum),
+    ``mel`` (mel spectrum) and ``log-mel`` (mel spectrum in dB).
+    Only the steps between the two kinds are computed.
+
+    Args:
+        data (np.ndarray): The data (num-frames x dimension).
+        input_kind (str): The kind of the data.
+        output_kind (str): The kind of the spectrum to compute.
+        sampling_rate (int): The sampling rate of the underlying signal.
+        n_mels (int): Number of mel bands.
+
+    Returns:
+        np.ndarray: The spectrum (dimension x num-frames, as used by librosa).
+    """
+    input_index = SPECTRUM_KINDS.index(input_kind)
+    output_index = SPECTRUM_KINDS.index(output_kind)
+
+    if input_index > output_index:
+        raise ValueError("A {} spectrum can't be computed from {}!".format(output_kind, input_kind))
+
+    spec = data.T
+
+    if input_index < 1 <= output_index:
+        spec = np.abs(stft_from_frames(spec)) ** 2
+
+    if input_index < 2 <= output_index:
+        spec = librosa.feature.melspectrogram(S=spec, n_mels=n_mels, sr=sampling_rate)
+
+    if input_index < 3 <= output_index:
+        spec = librosa.power_to_db(spec)
+
+    return spec
+
+
+# skipcq: PYL-W0223
+class SpectralComputation(base.Computation):
+    """
+    Base class for computation steps, that are based on a spectrum of the frames.
+    Instead of frames, a step can also get the intermediate spectrum
+    from a parent step (:class:`PowerSpectrum`, :class:`MelSpectrogram` or :class:`LogMelSpectrogram`).
+    So the spectrum is computed only once for multiple steps with the same parent
+    (see also :func:`audiomate.processing.pipeline.optimize`).
+
+    Args:
+        n_mels (int): Number of mel bands. Has to be equal to the one of a mel-spectrum parent.
+        output_kind (str): The kind of spectrum the step is based on (e.g. ``log-mel``).
+        parent (Step, optional): The parent step this step depends on.
+        name (str, optional): A name for identifying the step.
+    """
+
+    spectrum_kind = None
+    """ The kind of spectrum this step outputs, if it can be used as input by other steps. """
+
+    def __init__(self, n_mels=128, output_kind=LOG_MEL, parent=None, name=None,
+                 min_frames=1, left_context=0, right_context=0):
+        self.n_mels = n_mels
+        self.output_kind = output_kind
+        self.input_kind = FRAMES
+
+        super(SpectralComputation, self).__init__(parent=parent, name=name, min_frames=min_frames,
+                                                  left_context=left_context, right_context=right_context)
+
+        self._parents_changed()
+
+    def parameters(self):
+        return self.n_mels, self.output_kind, self.min_frames, self.left_context, self.right_context
+
+    def compute_spectrum(self, chunk, sampling_rate):
+        """
+        Return the spectrum of the data in the chunk (dimension x num-frames),
+        computed from the kind of data provided by the parent.
+        """
+        return spectrum(chunk.data, self.input_kind, self.output_kind, sampling_rate, n_mels=self.n_mels)
+
+    def _parents_changed(self):
+        parents = self._parent_steps(self)
+        self.input_kind = FRAMES
+
+        if len(parents) == 1 and isinstance(parents[0], SpectralComputation):
+            parent = parents[0]
+
+            if parent.spectrum_kind is not None:
+                if SPECTRUM_KINDS.index(parent.spectrum_kind) > SPECTRUM_KINDS.index(self.output_kind):
+                    raise ValueError("{} can't be computed from a {} spectrum!".format(
+                        type(self).__name__, parent.spectrum_kind))
+
+                if parent.spectrum_kind in (MEL, LOG_MEL) and parent.n_mels != self.n_mels:
+                    raise ValueError('The number of mel bands ({}) differs from the parent ({})!'.format(
+                        self.n_mels, parent.n_mels))
+
+                self.input_kind = parent.spectrum_kind
+
+
+class PowerSpectrum(SpectralComputation):
+    """
+    Computation step that computes the power spectrum
+    (squared magnitude of the short-time-fourier-transform) of the given frames.
+
+    It can be used as parent of the spectral steps (e.g. :class:`MelSpectrogram` or :class:`MFCC`),
+    to compute the power spectrum only once for all of them.
+    """
+
+    spectrum_kind = POWER
+
+    def __init__(self, parent=None, name=None):
+        super(PowerSpectrum, self).__init__(output_kind=POWER, parent=parent, name=name)
+
+    def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
+        return self.compute_spectrum(chunk, sampling_rate).T
+
+
+class MelSpectrogram(SpectralComputation):
     """
     Computation step that extracts mel-spectrogram features from the given frames.
+    The parent can also be a :class:`PowerSpectrum` step.
 
     Based on http://librosa.github.io/librosa/generated/librosa.feature.melspectrogram.html
 
@@ -53,21 +176,45 @@ class MelSpectrogram(base.Computation):
         n_mels (int): Number of mel bands to generate.
     """
 
-    def __init__(self, n_mels=128, parent=None, name=None):
-        super(MelSpectrogram, self).__init__(parent=parent, name=name)
+    spectrum_kind = MEL
 
-        self.n_mels = n_mels
+    def __init__(self, n_mels=128, parent=None, name=None):
+        super(MelSpectrogram, self).__init__(n_mels=n_mels, output_kind=MEL, parent=parent, name=name)
 
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
-        power_spec = np.abs(stft_from_frames(chunk.data.T)) ** 2
-        mel = librosa.feature.melspectrogram(S=power_spec, n_mels=self.n_mels, sr=sampling_rate)
+        return self.compute_spectrum(chunk, sampling_rate).T
+
 
-        return mel.T
+class LogMelSpectrogram(SpectralComputation):
+    """
+    Computation step that extracts mel-spectrogram features in dB
+    (``librosa.power_to_db`` with default arguments) from the given frames.
+    The parent can also be a :class:`PowerSpectrum` or :class:`MelSpectrogram` step.
+
+    Note:
 
+        The output can differ depending on offline or online processing,
+        since the values are clipped relative to the maximum of a chunk
+        (see :class:`audiomate.processing.pipeline.PowerToDb`).
 
-class MFCC(base.Computation):
+    Args:
+        n_mels (int): Number of mel bands to generate.
+    """
+
+    spectrum_kind = LOG_MEL
+
+    def __init__(self, n_mels=128, parent=None, name=None):
+        super(LogMelSpectrogram, self).__init__(n_mels=n_mels, output_kind=LOG_MEL, parent=parent, name=name)
+
+    def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
+        return self.compute_spectrum(chunk, sampling_rate).T
+
+
+class MFCC(SpectralComputation):
     """
     Computation step that extracts mfcc features from the given frames.
+    The parent can also be a :class:`PowerSpectrum`, :class:`MelSpectrogram`
+    or :class:`LogMelSpectrogram` step.
 
     Based on http://librosa.github.io/librosa/generated/librosa.feature.mfcc.html
 
@@ -77,16 +224,15 @@ class MFCC(base.Computation):
     """
 
     def __init__(self, n_mfcc=13, n_mels=128, parent=None, name=None):
-        super(MFCC, self).__init__(parent=parent, name=name)
+        super(MFCC, self).__init__(n_mels=n_mels, output_kind=LOG_MEL, parent=parent, name=name)
 
         self.n_mfcc = n_mfcc
-        self.n_mels = n_mels
 
-    def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
-        power_spec = np.abs(stft_from_frames(chunk.data.T)) ** 2
+    def parameters(self):
+        return super(MFCC, self).parameters() + (self.n_mfcc,)
 
-        mel = librosa.feature.melspectrogram(S=power_spec, n_mels=self.n_mels, sr=sampling_rate)
-        mel_power = librosa.power_to_db(mel)
+    def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
+        mel_power = self.compute_spectrum(chunk, sampling_rate)
         mfcc = librosa.feature.mfcc(S=mel_power, n_mfcc=self.n_mfcc)
 
         return mfcc.T
@@ -23,6 +23,9 @@ class Delta(base.Computation):
         self.axis = axis
         self.mode = mode
 
+    def parameters(self):
+        return self.width, self.order, self.axis, self.mode
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         axis = len(chunk.data.shape) - self.axis - 1
         output = librosa.feature.delta(chunk.data.T, width=self.width, order=self.order, axis=axis, mode=self.mode).T
@@ -59,6 +62,9 @@ class AddContext(base.Computation):
         self.left_frames = left_frames
         self.right_frames = right_frames
 
+    def parameters(self):
+        return self.left_frames, self.right_frames
+
     def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
         context = []
 
@@ -8,6 +8,17 @@ for reading the audio samples from a specific source.
 
 from .track import Track  # noqa: F401
 from .file import FileTrack  # noqa: F401
+from .file import FileInfo  # noqa: F401
 from .container import ContainerTrack  # noqa: F401
 
+from .cache import SampleCache  # noqa: F401
+from .cache import enable_sample_cache  # noqa: F401
+from .cache import disable_sample_cache  # noqa: F401
+from .cache import active_sample_cache  # noqa: F401
+
+from .decoded import DecodedCache  # noqa: F401
+from .decoded import enable_decoded_cache  # noqa: F401
+from .decoded import disable_decoded_cache  # noqa: F401
+from .decoded import active_decoded_cache  # noqa: F401
+
 from .utterance import Utterance  # noqa: F401
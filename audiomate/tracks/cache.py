@@ -0,0 +1,255 @@
+"""
+This module provides a cache for the samples read from tracks.
+The cache is disabled by default and can be enabled with
+:func:`enable_sample_cache`. Afterwards every call to
+:meth:`audiomate.tracks.Track.read_samples` first looks
+for the requested samples in the cache.
+
+Note:
+    The cache expects the audio of the tracks not to change.
+    For a :class:`audiomate.tracks.FileTrack` size and modification-time of
+    the file are part of the cache key, but only as far as they are known
+    by the track (see :meth:`audiomate.tracks.FileTrack.invalidate_info`).
+    Otherwise the cache has to be cleared manually
+    (:meth:`SampleCache.clear`).
+"""
+
+import collections
+import hashlib
+import os
+
+import numpy as np
+
+from audiomate.utils import units
+
+_active_cache = None
+
+
+class SampleCache:
+    """
+    A least-recently-used cache for samples of tracks.
+    The samples are held in memory, as long as the total size of
+    all cached samples doesn't exceed ``max_size``.
+    If a ``cache_dir`` is given, resampled samples are additionally
+    stored as files in this directory. So they can be reused
+    in later runs, without having to compute the resampling again.
+
+    Args:
+        max_size (str): The maximal size of all samples held in memory
+                        in bytes. The units ``k`` (kibibytes), ``m``
+                        (mebibytes) and ``g`` (gibibytes) are supported.
+        cache_dir (str): A directory to store resampled samples in.
+                         If ``None``, only the memory is used.
+
+    Attributes:
+        num_hits (int): Number of reads served from memory.
+        num_disk_hits (int): Number of reads served from ``cache_dir``.
+        num_misses (int): Number of reads, where the samples
+                          had to be read from the track.
+        num_evictions (int): Number of samples removed from memory
+                             to stay within ``max_size``.
+    """
+
+    def __init__(self, max_size='512m', cache_dir=None):
+        self.max_size = units.parse_storage_size(max_size)
+        self.cache_dir = cache_dir
+
+        self.num_hits = 0
+        self.num_disk_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+
+        self._entries = collections.OrderedDict()
+        self._size = 0
+
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def size(self):
+        """ Return the number of bytes of all samples held in memory. """
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return the samples stored for the given key.
+        If the samples are only found in ``cache_dir``,
+        they are loaded into memory as well.
+
+        Args:
+            key (tuple): The key of the samples.
+
+        Returns:
+            np.ndarray: A copy of the stored samples,
+            ``None`` if there are no samples for the given key.
+        """
+        samples = self._entries.get(key, None)
+
+        if samples is not None:
+            self._entries.move_to_end(key)
+            self.num_hits += 1
+            return samples.copy()
+
+        disk_path = self._disk_path(key)
+
+        if disk_path is not None and os.path.isfile(disk_path):
+            samples = np.load(disk_path)
+            self._add_to_memory(key, samples)
+            self.num_disk_hits += 1
+            return samples.copy()
+
+        self.num_misses += 1
+        return None
+
+    def set(self, key, samples):
+        """
+        Store the given samples for the given key.
+        If the samples are resampled (the sampling-rate in the key is not
+        ``None``) they are also written to ``cache_dir``, if available.
+
+        Args:
+            key (tuple): The key of the samples. The key is expected to be
+                         ``(track-identity, sr, offset, duration)``.
+            samples (np.ndarray): The samples to store.
+        """
+        disk_path = self._disk_path(key)
+
+        if disk_path is not None and not os.path.isfile(disk_path):
+            tmp_path = '{}.{}.tmp.npy'.format(disk_path[:-len('.npy')], os.getpid())
+            np.save(tmp_path, samples)
+            os.replace(tmp_path, disk_path)
+
+        self._add_to_memory(key, samples)
+
+    def read_through(self, key, read_func):
+        """
+        Return the samples for the given key from the cache.
+        If not cached yet, they are read with ``read_func``
+        and stored in the cache.
+
+        Args:
+            key (tuple): The key of the samples.
+            read_func (func): A function without arguments,
+                              which returns the samples.
+
+        Returns:
+            np.ndarray: The samples.
+        """
+        samples = self.get(key)
+
+        if samples is None:
+            samples = read_func()
+            self.set(key, samples)
+            samples = samples.copy()
+
+        return samples
+
+    def clear(self):
+        """
+        Remove all samples from memory and reset the counters.
+        Files in ``cache_dir`` are kept.
+        """
+        self._entries.clear()
+        self._size = 0
+
+        self.num_hits = 0
+        self.num_disk_hits = 0
+        self.num_misses = 0
+        self.num_evictions = 0
+
+    def _add_to_memory(self, key, samples):
+        if samples.nbytes > self.max_size:
+            return
+
+        if key in self._entries:
+            self._size -= self._entries.pop(key).nbytes
+
+        self._entries[key] = samples
+        self._size += samples.nbytes
+
+        while self._size > self.max_size:
+            __, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.nbytes
+            self.num_evictions += 1
+
+    def _disk_path(self, key):
+        """ Return the path to store the samples in ``cache_dir``, ``None`` if not stored on disk. """
+        if self.cache_dir is None or key[1] is None:
+            return None
+
+        key_hash = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, '{}.npy'.format(key_hash))
+
+
+def enable_sample_cache(max_size='512m', cache_dir=None):
+    """
+    Enable caching of samples read from tracks.
+    An already enabled cache is replaced.
+
+    Args:
+        max_size (str): The maximal size of all samples held in memory
+                        (see :class:`SampleCache`).
+        cache_dir (str): A directory to store resampled samples in.
+
+    Returns:
+        SampleCache: The enabled cache.
+    """
+    global _active_cache
+    _active_cache = SampleCache(max_size=max_size, cache_dir=cache_dir)
+    return _active_cache
+
+
+def disable_sample_cache():
+    """ Disable caching of samples read from tracks. """
+    global _active_cache
+    _active_cache = None
+
+
+def active_sample_cache():
+    """ Return the enabled :class:`SampleCache`, ``None`` if caching is disabled. """
+    return _active_cache
+
+
+def read_samples(track, read_func, sr=None, offset=0, duration=None):
+    """
+    Read samples of the given track through the active cache.
+    If caching is disabled or the track doesn't provide
+    an identity (see :meth:`audiomate.tracks.Track.cache_identity`),
+    ``read_func`` is called directly.
+
+    Args:
+        track (Track): The track to read from.
+        read_func (func): The function that actually reads the samples.
+                          It is called with the arguments
+                          ``sr``, ``offset`` and ``duration``.
+        sr (int): The sampling-rate to read the samples with.
+        offset (float): The time in seconds, from where to start reading.
+        duration (float): The length of the samples to read in seconds.
+
+    Returns:
+        np.ndarray: The samples.
+    """
+    cache = _active_cache
+    identity = None
+
+    if cache is not None:
+        identity = track.cache_identity()
+
+    if identity is None:
+        return read_func(sr=sr, offset=offset, duration=duration)
+
+    if duration is not None:
+        duration = float(duration)
+
+    key = (identity, sr, float(offset), duration)
+
+    return cache.read_through(
+        key,
+        lambda: read_func(sr=sr, offset=offset, duration=duration)
+    )
@@ -1,9 +1,11 @@
 import copy
+import os
 
-import librosa
 import numpy as np
 
+from . import cache
 from . import track
+from audiomate.utils import audio
 
 
 class ContainerTrack(track.Track):
@@ -19,6 +21,8 @@ class ContainerTrack(track.Track):
     """
     __slots__ = ['container', 'key']
 
+    RES_TYPE = 'kaiser_best'
+
     def __init__(self, idx, container, key=None):
         super(ContainerTrack, self).__init__(idx)
 
@@ -46,8 +50,8 @@ class ContainerTrack(track.Track):
     @property
     def sampling_rate(self):
         """ Return the sampling rate. """
-        with self.container.open_if_needed(mode='r') as cnt:
-            return cnt.get(self.key)[1]
+        with self.container.open_pooled() as cnt:
+            return cnt.get_sampling_rate(self.key)
 
     @property
     def num_channels(self):
@@ -57,21 +61,30 @@ class ContainerTrack(track.Track):
     @property
     def num_samples(self):
         """ Return the total number of samples. """
-        with self.container.open_if_needed(mode='r') as cnt:
-            return cnt.get(self.key)[0].shape[0]
+        with self.container.open_pooled() as cnt:
+            return cnt.get_num_samples(self.key)
 
     @property
     def duration(self):
         """ Return the duration in seconds. """
-        with self.container.open_if_needed(mode='r') as cnt:
-            samples, sr = cnt.get(self.key)
+        with self.container.open_pooled() as cnt:
+            return cnt.get_num_samples(self.key) / cnt.get_sampling_rate(self.key)
 
-            return samples.shape[0] / sr
+    def cache_identity(self):
+        """
+        Return a hashable value that identifies the audio of the track.
+        Consists of the absolute path and the modification-time
+        of the container file and the key of the track.
+        """
+        path = os.path.abspath(self.container.path)
+        return ('container', path, self.key, os.path.getmtime(path))
 
     def read_samples(self, sr=None, offset=0, duration=None):
         """
         Return the samples from the track in the container.
         Uses librosa for resampling, if needed.
+        If the sample cache is enabled, the samples are
+        read through the cache (see :mod:`audiomate.tracks.cache`).
 
         Args:
             sr (int): If ``None``, uses the sampling rate given by the file,
@@ -84,25 +97,28 @@ class ContainerTrack(track.Track):
             np.ndarray: A numpy array containing the samples as a
             floating point (numpy.float32) time series.
         """
-        with self.container.open_if_needed(mode='r') as cnt:
-            samples, native_sr = cnt.get(self.key)
+        return cache.read_samples(
+            self,
+            self._read_samples,
+            sr=sr,
+            offset=offset,
+            duration=duration
+        )
+
+    def _read_samples(self, sr=None, offset=0, duration=None):
+        with self.container.open_pooled() as cnt:
+            native_sr = cnt.get_sampling_rate(self.key)
 
             start_sample_index = int(offset * native_sr)
+            end_sample_index = None
 
-            if duration is None:
-                end_sample_index = samples.shape[0]
-            else:
-                end_sample_index = int((offset + duration) * native_sr)
+            if duration is not None:
+                end_sample_index = start_sample_index + int(duration * native_sr)
 
-            samples = samples[start_sample_index:end_sample_index]
+            samples = cnt.get_range(self.key, start=start_sample_index, end=end_sample_index)
 
             if sr is not None and sr != native_sr:
-                samples = librosa.core.resample(
-                    samples,
-                    native_sr,
-                    sr,
-                    res_type='kaiser_best'
-                )
+                samples = audio.resample(samples, native_sr, sr, res_type=self.RES_TYPE)
 
             return samples
 
@@ -124,24 +140,42 @@ class ContainerTrack(track.Track):
             the second the sampling-rate and
             the third a boolean indicating if it is the last frame.
         """
-        with self.container.open_if_needed(mode='r') as cnt:
-            samples, _ = cnt.get(self.key)
+        for frames, is_last in self.read_frame_blocks(frame_size, hop_size, offset=offset,
+                                                      duration=duration, buffer_size=buffer_size):
+            last_index = frames.shape[0] - 1
 
-            current_index = 0
+            for index, frame in enumerate(frames):
+                yield frame, is_last and index == last_index
 
-            while current_index + frame_size < samples.shape[0]:
-                next_frame = samples[current_index:current_index+frame_size]
-                yield next_frame, False
-                current_index += hop_size
+    def read_frame_blocks(self, frame_size, hop_size, offset=0,
+                          duration=None, buffer_size=None):
+        """
+        Generator that reads and returns the samples of the track in blocks of frames.
+        The frames are views on the samples of the track, without copying them.
 
-            next_frame = samples[current_index:]
+        Args:
+            frame_size (int): The number of samples per frame.
+            hop_size (int): The number of samples between two frames.
+            offset (float): The time in seconds, from where to start
+                            reading the samples (rel. to the track start).
+            duration (float): The length of the samples to read in seconds.
+
+        Returns:
+            Generator: A generator yielding a tuple for every block.
+            The first item is a read-only array of frames (num-frames x frame-size)
+            and the second a boolean indicating if the block contains the last frame.
+        """
+        samples = self.read_samples(offset=offset, duration=duration)
+        frames, rest_samples = audio.split_frames(samples, frame_size, hop_size)
 
-            if next_frame.shape[0] < frame_size:
-                next_frame = np.pad(
-                    next_frame,
-                    (0, frame_size - next_frame.shape[0]),
-                    mode='constant',
-                    constant_values=0
-                )
+        if frames.shape[0] > 0:
+            yield frames, False
+
+        rest_samples = np.pad(
+            rest_samples,
+            (0, frame_size - rest_samples.shape[0]),
+            mode='constant',
+            constant_values=0
+        )
 
-            yield next_frame, True
+        yield rest_samples[np.newaxis, :], True
@@ -0,0 +1,223 @@
+"""
+This module provides a persistent store for the decoded samples of
+compressed audio files (e.g. MP3, OGG).
+Decoding these files (via ``audioread``) is much slower than reading
+uncompressed audio. If the decoded cache is enabled with
+:func:`enable_decoded_cache`, a :class:`audiomate.tracks.FileTrack`
+of a compressed file is decoded only once and stored in an
+:class:`audiomate.containers.AudioContainer`.
+All later reads are served from the container.
+"""
+
+import hashlib
+import multiprocessing
+import os
+
+import numpy as np
+
+from audiomate import containers
+from audiomate import logutil
+from audiomate.utils import audio
+from . import container
+
+logger = logutil.getLogger()
+
+_active_cache = None
+
+DEFAULT_EXTENSIONS = ('.mp3', '.ogg', '.opus', '.m4a', '.aac', '.wma')
+
+
+class DecodedCache:
+    """
+    Stores the decoded samples of compressed audio files
+    as 16-Bit integers in an :class:`audiomate.containers.AudioContainer`.
+    The samples are stored as mono signal with the native sampling-rate
+    of the file.
+
+    The key of a file in the container is derived from
+    the absolute path, the size and the modification-time of the file.
+    So the file is decoded again, if it changed.
+
+    Args:
+        path (str): Path of the HDF5 file to store the samples in.
+                    If the file doesn't exist, it is created.
+        extensions (list): File extensions (lowercase, including the dot)
+                           of the files to cache. All other files
+                           are read directly.
+        read_only (bool): If ``True``, nothing is stored.
+                          Files, that are not stored yet, are decoded directly.
+                          This is used in worker processes,
+                          which must not write to the file
+                          (see :meth:`audiomate.processing.Processor.process_corpus`).
+    """
+
+    def __init__(self, path, extensions=DEFAULT_EXTENSIONS, read_only=False):
+        self.path = path
+        self.extensions = tuple(extensions)
+        self.read_only = read_only
+        self.container = containers.AudioContainer(path, mode='a')
+
+    def close(self):
+        """ Close the underlying container. """
+        self.container.close()
+
+    def handles(self, track):
+        """
+        Return ``True``, if the file of the given track
+        is cached, based on its extension.
+        """
+        ext = os.path.splitext(track.path)[1].lower()
+        return ext in self.extensions
+
+    def key_for(self, track):
+        """ Return the key used to store the samples of the given track. """
+        identity = repr(track.cache_identity())
+        return hashlib.sha1(identity.encode('utf-8')).hexdigest()
+
+    def contains(self, track):
+        """
+        Return ``True``, if the decoded samples of the given track
+        are already stored, ``False`` otherwise.
+        """
+        if not self._open_if_needed():
+            return False
+
+        return self.key_for(track) in self.container
+
+    def add(self, track):
+        """
+        Decode the file of the given track and store the samples,
+        if not done already.
+
+        Args:
+            track (FileTrack): The track to decode.
+        """
+        if self.read_only:
+            raise ValueError('Nothing can be stored in a read-only decoded cache!')
+
+        if not self.contains(track):
+            __, samples = _decode(track.path)
+            self.container.set(self.key_for(track), samples, track.sampling_rate)
+
+    def read_samples(self, track, sr=None, offset=0, duration=None):
+        """
+        Return the samples of the given track from the store.
+        If not stored yet, the file is decoded and stored first
+        (in read-only mode it is only decoded).
+
+        Args:
+            track (FileTrack): The track to read the samples of.
+            sr (int): If ``None``, uses the native sampling rate,
+                      otherwise resamples to the given sampling rate.
+            offset (float): The time in seconds, from where to start reading
+                            the samples (rel. to the file start).
+            duration (float): The length of the samples to read in seconds.
+
+        Returns:
+            np.ndarray: A numpy array containing the samples as a
+            floating point (numpy.float32) time series.
+        """
+        if not self.read_only:
+            self.add(track)
+        elif not self.contains(track):
+            return audio.read_samples(track.path, sr=sr, offset=offset, duration=duration)
+
+        stored = container.ContainerTrack(track.idx, self.container, key=self.key_for(track))
+        samples = stored._read_samples(offset=offset, duration=duration)  # skipcq: PYL-W0212
+
+        # Resample the same way as the track itself
+        if sr is not None and sr != track.sampling_rate:
+            samples = audio.resample(samples, track.sampling_rate, sr, res_type=track.RES_TYPE)
+
+        return samples
+
+    def fill(self, tracks, num_workers=4):
+        """
+        Decode and store the files of all given tracks,
+        that are handled by the cache and not stored yet.
+        The files are decoded in parallel by ``num_workers`` processes.
+        The samples are written to the container by the calling process.
+
+        Args:
+            tracks (list): List of :class:`audiomate.tracks.FileTrack`.
+                           Tracks of other types are ignored.
+            num_workers (int): Number of processes to use for decoding.
+        """
+        if self.read_only:
+            raise ValueError('Nothing can be stored in a read-only decoded cache!')
+
+        to_decode = {}
+
+        for track in tracks:
+            if hasattr(track, 'path') and self.handles(track) and not self.contains(track):
+                to_decode[track.path] = track
+
+        if len(to_decode) <= 0:
+            return
+
+        with multiprocessing.Pool(num_workers) as p:
+            for path, samples in logger.progress(
+                    p.imap_unordered(_decode, list(to_decode.keys())),
+                    total=len(to_decode),
+                    description='Decode audio files'):
+                track = to_decode[path]
+                self.container.set(self.key_for(track), samples, track.sampling_rate)
+
+    def _open_if_needed(self):
+        """
+        Open the container, if not done already (read-only in read-only mode).
+        Return ``False``, if there is no file to read from in read-only mode.
+        """
+        if self.container.is_open():
+            return True
+
+        if not self.read_only:
+            self.container.open(mode='a')
+        elif os.path.isfile(self.path):
+            self.container.open(mode='r')
+        else:
+            return False
+
+        return True
+
+
+def _decode(path):
+    """ Read the samples of the file, clipped to the range storable as int16. """
+    samples = audio.read_samples(path)
+    samples = np.clip(samples, -1.0, 1.0)
+
+    return path, samples
+
+
+def enable_decoded_cache(path, extensions=DEFAULT_EXTENSIONS):
+    """
+    Enable storing the decoded samples of compressed audio files.
+    An already enabled cache is replaced.
+
+    Args:
+        path (str): Path of the HDF5 file to store the samples in.
+        extensions (list): File extensions of the files to cache
+                           (see :class:`DecodedCache`).
+
+    Returns:
+        DecodedCache: The enabled cache.
+    """
+    global _active_cache
+    disable_decoded_cache()
+    _active_cache = DecodedCache(path, extensions=extensions)
+    return _active_cache
+
+
+def disable_decoded_cache():
+    """ Disable the decoded cache and close its container. """
+    global _active_cache
+
+    if _active_cache is not None:
+        _active_cache.close()
+
+    _active_cache = None
+
+
+def active_decoded_cache():
+    """ Return the enabled :class:`DecodedCache`, ``None`` if disabled. """
+    return _active_cache
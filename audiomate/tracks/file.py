@@ -1,61 +1,185 @@
 import copy
+import os
 
-import librosa
+import soundfile as sf
 
+from . import cache
+from . import decoded
 from . import track
 from audiomate.utils import audio
 from audiomate.utils import audioread
 
 
+class FileInfo:
+    """
+    Holds the metadata of an audio file, which was read from its header.
+    Additionally size and modification-time of the file are stored,
+    so it can be checked if the info is still valid.
+
+    Args:
+        sampling_rate (int): The sampling rate of the file.
+        num_channels (int): The number of channels.
+        duration (float): The duration in seconds.
+        size (int): The size of the file in bytes.
+        mtime (float): The modification time of the file.
+    """
+
+    __slots__ = ['sampling_rate', 'num_channels', 'duration', 'size', 'mtime']
+
+    def __init__(self, sampling_rate, num_channels, duration, size, mtime):
+        self.sampling_rate = sampling_rate
+        self.num_channels = num_channels
+        self.duration = duration
+        self.size = size
+        self.mtime = mtime
+
+    def __eq__(self, other):
+        return isinstance(other, FileInfo) and self.values == other.values
+
+    @property
+    def values(self):
+        """ Return all values as tuple (sampling-rate, channels, duration, size, mtime). """
+        return (self.sampling_rate, self.num_channels, self.duration, self.size, self.mtime)
+
+    @property
+    def num_samples(self):
+        """ Return the total number of samples. """
+        return int(self.duration * self.sampling_rate)
+
+    def matches_file(self, path):
+        """
+        Return ``True`` if size and modification-time of the file
+        at the given path equal the stored ones, ``False`` otherwise.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+    @classmethod
+    def probe(cls, path):
+        """
+        Read the info from the header of the audio file at the given path.
+        The header is read with ``soundfile``, which doesn't start a decoder process.
+        Only for formats, that are not supported by ``soundfile``, ``audioread`` is used.
+
+        Args:
+            path (str): Path to the audio file.
+
+        Returns:
+            FileInfo: The info of the file.
+        """
+        stat = os.stat(path)
+
+        try:
+            info = sf.info(path)
+        except RuntimeError:
+            with audioread.audio_open(path) as f:
+                return cls(f.samplerate, f.channels, f.duration, stat.st_size, stat.st_mtime)
+
+        return cls(info.samplerate, info.channels, info.duration, stat.st_size, stat.st_mtime)
+
+
 class FileTrack(track.Track):
     """
     A track that is stored in a file.
 
+    The metadata (sampling-rate, number of channels, duration) is read
+    from the header of the file on first access and cached afterwards.
+    If the file is changed after the info was read,
+    :meth:`invalidate_info` has to be called
+    (:meth:`info_is_valid` checks the size and modification-time of the file).
+
     Args:
         idx (str): A identifier to uniquely identify a track.
         path (str): The path to the file.
+        info (FileInfo): The info of the file, if already known.
+                         If ``None``, it is read from the file when needed.
     """
-    __slots__ = ['path']
+    __slots__ = ['path', '_info']
 
-    def __init__(self, idx, path):
+    def __init__(self, idx, path, info=None):
         super(FileTrack, self).__init__(idx)
         self.path = path
+        self._info = info
 
     def __copy__(self):
-        return FileTrack(self.idx, self.path)
+        return FileTrack(self.idx, self.path, info=self._info)
 
     def __deepcopy(self, memo):
         return copy.copy(self)
 
+    @property
+    def info(self):
+        """
+        Return the info (:class:`FileInfo`) of the file.
+        It is only read from the file, if it isn't cached yet.
+        """
+        if self._info is None:
+            self._info = FileInfo.probe(self.path)
+
+        return self._info
+
+    @info.setter
+    def info(self, info):
+        self._info = info
+
+    def has_info(self):
+        """ Return ``True`` if the info of the file is already cached. """
+        return self._info is not None
+
+    def info_is_valid(self):
+        """
+        Return ``True`` if the info is cached and size and modification-time
+        still match the file, ``False`` otherwise.
+        """
+        return self._info is not None and self._info.matches_file(self.path)
+
+    def invalidate_info(self):
+        """ Discard the cached info, so it is read again on next access. """
+        self._info = None
+
     @property
     def sampling_rate(self):
         """ Return the sampling rate. """
-        with audioread.audio_open(self.path) as f:
-            return f.samplerate
+        return self.info.sampling_rate
 
     @property
     def num_channels(self):
         """ Return the number of channels. """
-        with audioread.audio_open(self.path) as f:
-            return f.channels
+        return self.info.num_channels
 
     @property
     def num_samples(self):
         """ Return the total number of samples. """
-        with audioread.audio_open(self.path) as f:
-            return int(f.duration * f.samplerate)
+        return self.info.num_samples
 
     @property
     def duration(self):
         """ Return the duration in seconds. """
-        with audioread.audio_open(self.path) as f:
-            return f.duration
+        return self.info.duration
+
+    def cache_identity(self):
+        """
+        Return a hashable value that identifies the audio of the track.
+        Consists of the absolute path, the size and
+        the modification-time of the file.
+        """
+        return ('file', os.path.abspath(self.path), self.info.size, self.info.mtime)
 
     def read_samples(self, sr=None, offset=0, duration=None):
         """
         Return the samples from the file.
-        Uses librosa for loading
-        (see http://librosa.github.io/librosa/generated/librosa.core.load.html).
+        For formats supported by ``soundfile`` (e.g. WAV, FLAC)
+        only the requested range of samples is read,
+        other formats are decoded with ``audioread``
+        (see :func:`audiomate.utils.audio.read_samples`).
+        If the sample cache is enabled, the samples are
+        read through the cache (see :mod:`audiomate.tracks.cache`).
+        If the decoded cache is enabled, compressed files are decoded
+        only once (see :mod:`audiomate.tracks.decoded`).
 
         Args:
             sr (int): If ``None``, uses the sampling rate given by the file,
@@ -68,13 +192,31 @@ class FileTrack(track.Track):
             np.ndarray: A numpy array containing the samples as a
             floating point (numpy.float32) time series.
         """
-        samples, __ = librosa.core.load(
+        return cache.read_samples(
+            self,
+            self._read_samples,
+            sr=sr,
+            offset=offset,
+            duration=duration
+        )
+
+    def _read_samples(self, sr=None, offset=0, duration=None):
+        decoded_cache = decoded.active_decoded_cache()
+
+        if decoded_cache is not None and decoded_cache.handles(self):
+            return decoded_cache.read_samples(
+                self,
+                sr=sr,
+                offset=offset,
+                duration=duration
+            )
+
+        return audio.read_samples(
             self.path,
             sr=sr,
             offset=offset,
             duration=duration
         )
-        return samples
 
     def read_frames(self, frame_size, hop_size, offset=0,
                     duration=None, buffer_size=5760000):
@@ -106,3 +248,35 @@ class FileTrack(track.Track):
             start=offset,
             end=end,
             buffer_size=buffer_size)
+
+    def read_frame_blocks(self, frame_size, hop_size, offset=0,
+                          duration=None, buffer_size=5760000):
+        """
+        Generator that reads and returns the samples of the track in blocks of frames
+        (see :func:`audiomate.utils.audio.read_frame_blocks`).
+
+        Args:
+            frame_size (int): The number of samples per frame.
+            hop_size (int): The number of samples between two frames.
+            offset (float): The time in seconds, from where to start
+                            reading the samples (rel. to the track start).
+            duration (float): The length of the samples to read in seconds.
+            buffer_size (int): Number of samples to load into memory at once.
+
+        Returns:
+            Generator: A generator yielding a tuple for every block.
+            The first item is a read-only array of frames (num-frames x frame-size)
+            and the second a boolean indicating if the block contains the last frame.
+        """
+        if duration is not None:
+            end = offset + duration
+        else:
+            end = float('inf')
+
+        return audio.read_frame_blocks(
+            self.path,
+            frame_size,
+            hop_size,
+            start=offset,
+            end=end,
+            buffer_size=buffer_size)
@@ -1,6 +1,8 @@
 import abc
 import copy
 
+import numpy as np
+
 
 class Track(abc.ABC):
     """
@@ -8,9 +10,16 @@ class Track(abc.ABC):
 
     Args:
         idx (str): A identifier to uniquely identify a track.
+
+    Attributes:
+        RES_TYPE (str): The resampling method used by :meth:`read_samples`
+                        (see :func:`audiomate.utils.audio.resample`).
+                        ``None`` means the default of ``librosa``.
     """
     __slots__ = ['idx']
 
+    RES_TYPE = None
+
     def __init__(self, idx):
         self.idx = idx
 
@@ -45,6 +54,15 @@ class Track(abc.ABC):
         """ Return the duration in seconds. """
         raise NotImplementedError()
 
+    def cache_identity(self):
+        """
+        Return a hashable value that identifies the audio of the track.
+        It is used as part of the key in the sample cache
+        (:mod:`audiomate.tracks.cache`).
+        If ``None``, samples of the track are never cached.
+        """
+        return None
+
     @abc.abstractmethod
     def read_samples(self, sr=None, offset=0, duration=None):
         """
@@ -83,3 +101,40 @@ class Track(abc.ABC):
             the third a boolean indicating if it is the last frame.
         """
         raise NotImplementedError()
+
+    def read_frame_blocks(self, frame_size, hop_size, offset=0,
+                          duration=None, buffer_size=5760000):
+        """
+        Generator that reads and returns the samples of the track in blocks of frames.
+        In contrast to :meth:`read_frames`, all frames of a block
+        are returned at once as 2-D array.
+
+        By default the blocks are built from the frames of :meth:`read_frames`.
+        Implementations may override it to create the frames of a block without copying.
+
+        Args:
+            frame_size (int): The number of samples per frame.
+            hop_size (int): The number of samples between two frames.
+            offset (float): The time in seconds, from where to start
+                            reading the samples (rel. to the track start).
+            duration (float): The length of the samples to read in seconds.
+            buffer_size (int): Number of samples to load into memory at once.
+
+        Returns:
+            Generator: A generator yielding a tuple for every block.
+            The first item is an array of frames (num-frames x frame-size)
+            and the second a boolean indicating if the block contains the last frame.
+        """
+        max_frames = max(1, buffer_size // frame_size)
+        frames = []
+
+        for frame, is_last in self.read_frames(frame_size, hop_size, offset=offset,
+                                               duration=duration, buffer_size=buffer_size):
+            frames.append(frame)
+
+            if is_last or len(frames) >= max_frames:
+                yield np.array(frames), is_last
+                frames = []
+
+        if len(frames) > 0:
+            yield np.array(frames), False
@@ -2,6 +2,7 @@ import librosa
 from audiomate.utils import audioread
 import numpy as np
 import scipy
+import soundfile as sf
 
 
 def process_buffer(buffer, n_channels):
@@ -86,10 +87,45 @@ def read_blocks(file_path, start=0.0, end=float('inf'), buffer_size=5760000):
             yield process_buffer(buffer, n_channels)
 
 
-def read_frames(file_path, frame_size, hop_size, start=0.0,
-                end=float('inf'), buffer_size=5760000):
+def split_frames(samples, frame_size, hop_size):
     """
-    Read an audio file frame by frame. The frames are yielded one after another.
+    Split the given samples into frames without copying them.
+    Only frames that end before the last sample are returned,
+    the remaining samples are returned separately.
+    So the last frame of a signal is always part of the remaining samples,
+    which allows to mark it as last frame.
+
+    Args:
+        samples (np.ndarray): 1-D array of samples.
+        frame_size (int): The number of samples per frame.
+        hop_size (int): The number of samples between two frames.
+
+    Returns:
+        tuple: A read-only view of the frames (num-frames x frame-size)
+        and the remaining samples, starting with the first sample
+        of the next frame.
+    """
+    num_frames = 0
+
+    if samples.size > frame_size:
+        num_frames = (samples.size - frame_size - 1) // hop_size + 1
+
+    frames = np.lib.stride_tricks.as_strided(
+        samples,
+        shape=(num_frames, frame_size),
+        strides=(samples.strides[0] * hop_size, samples.strides[0]),
+        writeable=False
+    )
+
+    return frames, samples[num_frames * hop_size:]
+
+
+def read_frame_blocks(file_path, frame_size, hop_size, start=0.0,
+                      end=float('inf'), buffer_size=5760000):
+    """
+    Read an audio file block after block, where every block is split into frames.
+    In contrast to :func:`read_frames` all frames of a block
+    are yielded at once as 2-D array.
 
     Args:
         file_path (str): Path to the file to read.
@@ -105,27 +141,23 @@ def read_frames(file_path, frame_size, hop_size, start=0.0,
                            of x higher, where the x is typically 1024 or 4096.
 
     Returns:
-        Generator: A generator yielding a tuple for every frame.
-        The first item is the frame and
-        the second a boolean indicating if it is the last frame.
+        Generator: A generator yielding a tuple for every block.
+        The first item is a read-only array of frames
+        (num-frames x frame-size) and the second a boolean
+        indicating if the block contains the last frame.
     """
     rest_samples = np.array([], dtype=np.float32)
 
     for block in read_blocks(file_path, start=start, end=end, buffer_size=buffer_size):
 
         # Prepend rest samples from previous block
-        block = np.concatenate([rest_samples, block])
+        if rest_samples.size > 0:
+            block = np.concatenate([rest_samples, block])
 
-        current_sample = 0
+        frames, rest_samples = split_frames(block, frame_size, hop_size)
 
-        # Get frames that are fully contained in the block
-        while current_sample + frame_size < block.size:
-            frame = block[current_sample:current_sample + frame_size]
-            yield frame, False
-            current_sample += hop_size
-
-        # Store rest samples for next block
-        rest_samples = block[current_sample:]
+        if frames.shape[0] > 0:
+            yield frames, False
 
     if rest_samples.size > 0:
         rest_samples = np.pad(
@@ -134,7 +166,160 @@ def read_frames(file_path, frame_size, hop_size, start=0.0,
             mode='constant',
             constant_values=0
         )
-        yield rest_samples, True
+        yield rest_samples[np.newaxis, :], True
+
+
+def read_frames(file_path, frame_size, hop_size, start=0.0,
+                end=float('inf'), buffer_size=5760000):
+    """
+    Read an audio file frame by frame. The frames are yielded one after another.
+
+    Args:
+        file_path (str): Path to the file to read.
+        frame_size (int): The number of samples per frame.
+        hop_size (int): The number of samples between two frames.
+        start (float): Start in seconds to read from.
+        end (float): End in seconds to read to.
+                     ``inf`` means to the end of the file.
+        buffer_size (int): Number of samples to load into memory at once
+                           and return as a single block.
+                           The exact number of loaded samples depends on the
+                           block-size of the audioread library. So it can be
+                           of x higher, where the x is typically 1024 or 4096.
+
+    Returns:
+        Generator: A generator yielding a tuple for every frame.
+        The first item is the frame and
+        the second a boolean indicating if it is the last frame.
+    """
+    for frames, is_last in read_frame_blocks(file_path, frame_size, hop_size,
+                                             start=start, end=end, buffer_size=buffer_size):
+        last_index = frames.shape[0] - 1
+
+        for index, frame in enumerate(frames):
+            yield frame, is_last and index == last_index
+
+
+def read_samples(file_path, sr=None, offset=0.0, duration=None):
+    """
+    Read the samples of an audio file.
+
+    If the format is supported by ``soundfile`` (e.g. WAV, FLAC, OGG),
+    it seeks directly to the requested range and
+    only decodes the samples that are actually needed.
+    Otherwise the samples are read via ``audioread``,
+    where all samples up to the end of the range are decoded.
+
+    Args:
+        file_path (str): Path to the file to read.
+        sr (int): If ``None``, uses the sampling rate given by the file,
+                  otherwise resamples to the given sampling rate.
+        offset (float): The time in seconds, from where to start reading.
+        duration (float): The length of the samples to read in seconds.
+                          If ``None``, reads until the end of the file.
+
+    Returns:
+        np.ndarray: A numpy array containing the (mono) samples as a
+        floating point (numpy.float32) time series.
+    """
+    try:
+        with sf.SoundFile(file_path) as f:
+            native_sr = f.samplerate
+
+            # Same conversion to frames as the soundfile loader of librosa,
+            # so the range matches ``librosa.core.load`` exactly
+            start_frame = min(int(offset * native_sr), f.frames)
+            num_frames = -1
+
+            if duration is not None:
+                num_frames = int(duration * native_sr)
+
+            if start_frame > 0:
+                f.seek(start_frame)
+
+            samples = f.read(frames=num_frames, dtype='float32', always_2d=False).T
+
+    except RuntimeError:
+        with audioread.audio_open(file_path) as f:
+            native_sr = f.samplerate
+
+        end = float('inf')
+
+        if duration is not None:
+            end = offset + duration
+
+        blocks = list(read_blocks(file_path, start=offset, end=end))
+
+        if len(blocks) > 0:
+            samples = np.concatenate(blocks)
+        else:
+            samples = np.array([], dtype=np.float32)
+
+    if samples.ndim > 1:
+        samples = librosa.to_mono(samples)
+
+    if sr is not None and sr != native_sr:
+        samples = resample(samples, native_sr, sr)
+
+    return samples
+
+
+def resample(samples, orig_sr, target_sr, res_type=None):
+    """
+    Resample the given samples with ``librosa``.
+
+    Args:
+        samples (np.ndarray): 1-D array of samples.
+        orig_sr (int): The sampling rate of the samples.
+        target_sr (int): The sampling rate to resample to.
+        res_type (str): The resampling method (see ``librosa.core.resample``).
+                        If ``None``, the default of ``librosa`` is used.
+
+    Returns:
+        np.ndarray: The resampled samples.
+    """
+    if res_type is None:
+        return librosa.core.resample(samples, orig_sr=orig_sr, target_sr=target_sr)
+
+    return librosa.core.resample(samples, orig_sr=orig_sr, target_sr=target_sr, res_type=res_type)
+
+
+def is_pcm16_mono(file_path):
+    """
+    Return ``True``, if the given file is a single channel file with 16-Bit PCM samples,
+    that can be read by ``soundfile`` (e.g. WAV). The samples of such files
+    can be read as they are stored with :func:`read_pcm16_blocks`.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        bool: ``True`` if the file contains 16-Bit PCM mono samples.
+    """
+    try:
+        info = sf.info(file_path)
+    except RuntimeError:
+        return False
+
+    return info.subtype == 'PCM_16' and info.channels == 1
+
+
+def read_pcm16_blocks(file_path, block_size=1048576):
+    """
+    Read the samples of a 16-Bit PCM mono file (see :func:`is_pcm16_mono`)
+    block after block as they are stored (``np.int16``),
+    without converting them to floats.
+
+    Args:
+        file_path (str): Path to the file to read.
+        block_size (int): Number of samples per block.
+
+    Returns:
+        Generator: A generator yielding the samples (``np.int16``) for every block.
+    """
+    with sf.SoundFile(file_path) as f:
+        for block in f.blocks(blocksize=block_size, dtype='int16', always_2d=False):
+            yield block
 
 
 def write_wav(path, samples, sr=16000):
@@ -0,0 +1,231 @@
+"""
+Run a stage of a processing loop (e.g. reading or writing data) in a background thread,
+connected to the calling thread by a bounded queue.
+So the stages can overlap, e.g. the next file is read and the previous result is written,
+while the current one is computed.
+Every stage records its timings and queue depths, to find the slowest stage.
+"""
+import queue
+import threading
+import time
+
+_END = object()
+_PUT_TIMEOUT_SECONDS = 0.1
+
+
+class _Error:
+    """ Wraps an exception raised in the background thread. """
+
+    def __init__(self, exception):
+        self.exception = exception
+
+
+class _BackgroundStage:
+    """ Base class with the queue and the statistics of a stage. """
+
+    def __init__(self, queue_size):
+        if queue_size < 1:
+            raise ValueError('The queue size has to be at least 1!')
+
+        self.queue_size = queue_size
+        self.busy_time = 0.0
+        self.wait_time = 0.0
+        self.max_depth = 0
+        self.num_items = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._depth_sum = 0
+        self._thread = None
+
+    @property
+    def mean_depth(self):
+        """ The mean number of items in the queue, when an item was put or taken. """
+        if self.num_items == 0:
+            return 0.0
+
+        return self._depth_sum / self.num_items
+
+    def _record_depth(self):
+        depth = self._queue.qsize()
+        self._depth_sum += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.num_items += 1
+
+    def _start(self, target, *args):
+        self._thread = threading.Thread(target=target, args=args, daemon=True)
+        self._thread.start()
+
+
+class BackgroundReader(_BackgroundStage):
+    """
+    Iterate over an iterable in a background thread.
+    At most ``queue_size`` items are read in advance.
+    An exception raised by the iterable is raised again in the consuming thread.
+
+    Args:
+        iterable (iterable): The items to read (e.g. a generator reading files).
+        queue_size (int): Maximal number of items read in advance.
+
+    Attributes:
+        busy_time (float): Seconds spent in the iterable (reading).
+        wait_time (float): Seconds the consuming thread waited for the next item.
+        max_depth (int): The maximal number of items in the queue.
+
+    Example:
+        >>> with BackgroundReader(corpus.read_utterance_samples(), queue_size=4) as reader:
+        >>>     for utterance, samples in reader:
+        >>>         ...
+    """
+
+    def __init__(self, iterable, queue_size=4):
+        super(BackgroundReader, self).__init__(queue_size)
+
+        self._stop = threading.Event()
+        self._start(self._run, iterable)
+
+    def __iter__(self):
+        while True:
+            self._record_depth()
+
+            start = time.perf_counter()
+            item = self._queue.get()
+            self.wait_time += time.perf_counter() - start
+
+            if item is _END:
+                return
+
+            if isinstance(item, _Error):
+                raise item.exception
+
+            yield item
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stop reading and wait for the background thread.
+        Items read in advance are discarded.
+        """
+        self._stop.set()
+
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=_PUT_TIMEOUT_SECONDS)
+            except queue.Empty:
+                pass
+
+        self._thread.join()
+
+    def _run(self, iterable):
+        try:
+            iterator = iter(iterable)
+
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                item = next(iterator, _END)
+                self.busy_time += time.perf_counter() - start
+
+                self._put(item)
+
+                if item is _END:
+                    return
+        except Exception as e:  # skipcq: PYL-W0703
+            self._put(_Error(e))
+
+    def _put(self, item):
+        """ Put the item into the queue, unless the reader is stopped. """
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                return
+            except queue.Full:
+                pass
+
+
+class BackgroundWriter(_BackgroundStage):
+    """
+    Call a function with the given items in a background thread (e.g. to write them to a file).
+    At most ``queue_size`` items are queued, :meth:`write` blocks if the queue is full.
+    The items are passed to the function in the order they were written.
+    An exception raised by the function is raised again in the writing thread
+    (on the next call of :meth:`write` or on :meth:`close`),
+    all further items are discarded.
+
+    Args:
+        write_func (func): The function called with the arguments of every :meth:`write` call.
+        queue_size (int): Maximal number of queued items.
+
+    Attributes:
+        busy_time (float): Seconds spent in ``write_func``.
+        wait_time (float): Seconds the writing thread waited for a free place in the queue.
+        max_depth (int): The maximal number of items in the queue.
+
+    Example:
+        >>> with BackgroundWriter(container.set, queue_size=4) as writer:
+        >>>     for key, data in items:
+        >>>         writer.write(key, data)
+    """
+
+    def __init__(self, write_func, queue_size=4):
+        super(BackgroundWriter, self).__init__(queue_size)
+
+        self._error = None
+        self._start(self._run, write_func)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_without_error()
+
+    def write(self, *args):
+        """ Queue the arguments for the next call of the write function. """
+        self._raise_error_if_failed()
+        self._record_depth()
+
+        start = time.perf_counter()
+        self._queue.put(args)
+        self.wait_time += time.perf_counter() - start
+
+    def close(self):
+        """ Wait until all queued items are written and stop the background thread. """
+        self._close_without_error()
+        self._raise_error_if_failed()
+
+    def _close_without_error(self):
+        if self._thread.is_alive():
+            self._queue.put(_END)
+            self._thread.join()
+
+    def _raise_error_if_failed(self):
+        if self._error is not None:
+            error = self._error
+            self._error = None
+            raise error
+
+    def _run(self, write_func):
+        failed = False
+
+        while True:
+            args = self._queue.get()
+
+            if args is _END:
+                return
+
+            if failed:
+                continue
+
+            try:
+                start = time.perf_counter()
+                write_func(*args)
+                self.busy_time += time.perf_counter() - start
+            except Exception as e:  # skipcq: PYL-W0703
+                self._error = e
+                failed = True
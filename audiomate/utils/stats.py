@@ -80,3 +80,139 @@ class DataStats:
         num_value = int(np.sum(all_counts))
 
         return cls(mean_value, var_value, min_value, max_value, num_value)
+
+
+class StreamingStats(DataStats):
+    """
+    Statistics, that are computed from chunks of data one after another,
+    without keeping the data in memory.
+    Stats of different sets of data points can be merged,
+    so they can be computed in parallel.
+    The mean and variance are updated with the numerically stable
+    algorithm of Welford / Chan et al.
+
+    If ``per_dimension`` is ``True``, mean, var, min and max are arrays
+    with the statistics for every feature dimension (last dimension of the data)
+    and ``num`` is the number of data points per dimension.
+
+    Args:
+        per_dimension (bool): If ``True``, compute the stats for every
+                              dimension separately.
+
+    Example:
+        >>> s = StreamingStats(per_dimension=True)
+        >>> for chunk in chunks:
+        >>>     s.update(chunk)
+        >>> s.mean
+        array([0.2, 1.3, ...])
+    """
+
+    __slots__ = ['per_dimension']
+
+    def __init__(self, per_dimension=False):
+        super(StreamingStats, self).__init__(0.0, 0.0, np.inf, -np.inf, 0)
+        self.per_dimension = per_dimension
+
+    @property
+    def values(self):
+        """ Return all values as numpy-array (mean, var, min, max, num), one row per dimension. """
+        if not self.per_dimension:
+            return super(StreamingStats, self).values
+
+        num = np.full(np.shape(self.mean), self.num)
+        return np.stack([self.mean, self.var, self.min, self.max, num], axis=-1)
+
+    def update(self, data):
+        """
+        Add the data points of the given array to the stats.
+
+        Args:
+            data (numpy.ndarray): The data. If ``per_dimension`` is ``True``,
+                                  the last axis is the feature dimension.
+        """
+        data = np.asarray(data)
+
+        if self.per_dimension:
+            data = data.reshape(-1, data.shape[-1])
+            axis = 0
+        else:
+            axis = None
+
+        if data.size == 0:
+            return
+
+        other = StreamingStats(per_dimension=self.per_dimension)
+        other.num = data.shape[0] if self.per_dimension else data.size
+        other.mean = np.mean(data, axis=axis, dtype=np.float64)
+        other.var = np.var(data, axis=axis, dtype=np.float64)
+        other.min = np.min(data, axis=axis)
+        other.max = np.max(data, axis=axis)
+
+        self.merge(other)
+
+    def merge(self, other):
+        """
+        Add the stats of another set of data points.
+
+        Args:
+            other (StreamingStats): The stats to merge into these stats.
+        """
+        if other.num == 0:
+            return
+
+        if self.num == 0:
+            self.mean = other.mean
+            self.var = other.var
+            self.min = other.min
+            self.max = other.max
+            self.num = other.num
+        else:
+            num = self.num + other.num
+            delta = other.mean - self.mean
+            m2 = self.var * self.num + other.var * other.num + delta ** 2 * self.num * other.num / num
+
+            self.mean = self.mean + delta * other.num / num
+            self.var = m2 / num
+            self.min = np.minimum(self.min, other.min)
+            self.max = np.maximum(self.max, other.max)
+            self.num = num
+
+        if not self.per_dimension:
+            self.mean = float(self.mean)
+            self.var = float(self.var)
+            self.min = float(self.min)
+            self.max = float(self.max)
+
+    def to_dict(self):
+        """ Return the stats as a dictionary (arrays are converted to lists). """
+        return {
+            'mean': np.asarray(self.mean).tolist(),
+            'var': np.asarray(self.var).tolist(),
+            'min': np.asarray(self.min).tolist(),
+            'max': np.asarray(self.max).tolist(),
+            'num': int(self.num),
+            'per_dimension': self.per_dimension
+        }
+
+    @classmethod
+    def from_dict(cls, dict_with_stats):
+        """
+        Create a StreamingStats object from a dictionary created with :meth:`to_dict`.
+
+        Args:
+            dict_with_stats (dict): Dictionary containing stats.
+
+        Returns:
+            (StreamingStats): Statistics
+        """
+        per_dimension = dict_with_stats.get('per_dimension', False)
+        convert = np.array if per_dimension else float
+
+        result = cls(per_dimension=per_dimension)
+        result.mean = convert(dict_with_stats['mean'])
+        result.var = convert(dict_with_stats['var'])
+        result.min = convert(dict_with_stats['min'])
+        result.max = convert(dict_with_stats['max'])
+        result.num = dict_with_stats['num']
+
+        return result
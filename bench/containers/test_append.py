@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+
+
+def run_append(path, chunks, buffered):
+    cnt = containers.FeatureContainer(path, mode='w')
+    cnt.open()
+
+    if buffered:
+        with cnt.buffered_append():
+            for key, chunk in chunks:
+                cnt.append(key, chunk)
+    else:
+        for key, chunk in chunks:
+            cnt.append(key, chunk)
+
+    cnt.close()
+
+
+@pytest.mark.parametrize('buffered', [False, True])
+def test_append_single_frames(benchmark, tmpdir, buffered):
+    path = os.path.join(tmpdir.strpath, 'features.hdf5')
+    chunks = []
+
+    for utt_index in range(20):
+        for _ in range(500):
+            chunks.append(('utt-{}'.format(utt_index), np.random.random((1, 40)).astype(np.float32)))
+
+    benchmark(run_append, path, chunks, buffered)
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+
+
+@pytest.fixture(scope='module')
+def source_path(tmpdir_factory):
+    path = os.path.join(tmpdir_factory.mktemp('operations').strpath, 'features.hdf5')
+    cnt = containers.FeatureContainer(path, mode='w')
+    cnt.open()
+
+    for index in range(2000):
+        cnt.set('utt-{}'.format(index), np.random.random((200, 40)).astype(np.float32))
+
+    cnt.close()
+
+    return path
+
+
+def run_read_write(source_path, target_path, keys):
+    source = containers.FeatureContainer(source_path, mode='r')
+    target = containers.FeatureContainer(target_path, mode='w')
+    source.open()
+    target.open()
+
+    for key in keys:
+        target.set(key, source.get(key, mem_map=False))
+
+    source.close()
+    target.close()
+
+
+def run_copy_keys(source_path, target_path, keys):
+    source = containers.FeatureContainer(source_path, mode='r')
+    target = containers.FeatureContainer(target_path, mode='w')
+    target.open()
+    containers.copy_keys(source, target, keys)
+    target.close()
+
+
+@pytest.mark.parametrize('method', ['read_write', 'copy_keys'])
+def test_copy_half_of_keys(benchmark, tmpdir, source_path, method):
+    keys = ['utt-{}'.format(index) for index in range(0, 2000, 2)]
+    target_path = os.path.join(tmpdir.strpath, 'target.hdf5')
+
+    if method == 'read_write':
+        benchmark(run_read_write, source_path, target_path, keys)
+    else:
+        benchmark(run_copy_keys, source_path, target_path, keys)
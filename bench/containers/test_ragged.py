@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+
+
+@pytest.fixture(scope='module')
+def container_paths(tmpdir_factory):
+    base_dir = tmpdir_factory.mktemp('ragged').strpath
+    hdf5_path = os.path.join(base_dir, 'features.hdf5')
+
+    cnt = containers.FeatureContainer(hdf5_path, mode='w')
+    cnt.open()
+
+    for index in range(5000):
+        cnt.set('utt-{}'.format(index), np.random.random((index % 20 + 1, 13)).astype(np.float32))
+
+    cnt.close()
+
+    ragged_path = os.path.join(base_dir, 'features.bin')
+    containers.RaggedContainer.from_container(cnt, ragged_path)
+
+    return {
+        'hdf5': hdf5_path,
+        'ragged': ragged_path
+    }
+
+
+def run_read_all(cnt):
+    cnt.open(mode='r')
+
+    for key in cnt.keys():
+        cnt.get(key, mem_map=False)
+
+    cnt.close()
+
+
+@pytest.mark.parametrize('backend', ['hdf5', 'ragged'])
+def test_read_small_arrays(benchmark, container_paths, backend):
+    if backend == 'hdf5':
+        cnt = containers.FeatureContainer(container_paths[backend])
+    else:
+        cnt = containers.RaggedContainer(container_paths[backend])
+
+    benchmark(run_read_all, cnt)
@@ -0,0 +1,53 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+
+NUM_KEYS = [10 ** 4, 10 ** 5, 10 ** 6]
+SHARD_LEVELS = [0, 2]
+
+_paths = {}
+
+
+def container_path(base_dir, num_keys, shard_levels):
+    """ Create the container once per configuration. """
+    config = (num_keys, shard_levels)
+
+    if config not in _paths:
+        path = os.path.join(base_dir, 'keys-{}-levels-{}.hdf5'.format(num_keys, shard_levels))
+        cnt = containers.Container(path, mode='w', shard_levels=shard_levels)
+        cnt.open()
+
+        data = np.zeros(4, dtype=np.float32)
+
+        for index in range(num_keys):
+            cnt.set('utt-{}'.format(index), data)
+
+        cnt.close()
+        _paths[config] = path
+
+    return _paths[config]
+
+
+def run_lookup(path, keys):
+    cnt = containers.Container(path, mode='r')
+    cnt.open()
+
+    for key in keys:
+        cnt.get(key)
+
+    cnt.close()
+
+
+@pytest.mark.parametrize('shard_levels', SHARD_LEVELS)
+@pytest.mark.parametrize('num_keys', NUM_KEYS)
+def test_lookup(benchmark, tmpdir_factory, num_keys, shard_levels):
+    base_dir = str(tmpdir_factory.getbasetemp())
+    path = container_path(base_dir, num_keys, shard_levels)
+    keys = ['utt-{}'.format(index) for index in random.Random(42).sample(range(num_keys), 1000)]
+
+    benchmark.extra_info['file_size'] = os.path.getsize(path)
+    benchmark(run_lookup, path, keys)
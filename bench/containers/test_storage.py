@@ -0,0 +1,47 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+
+SETTINGS = {
+    'default': containers.StorageOptions(),
+    'lzf': containers.StorageOptions(compression='lzf'),
+    'gzip-1': containers.StorageOptions(compression='gzip', compression_level=1),
+    'gzip-4-shuffle': containers.StorageOptions(compression='gzip', compression_level=4, shuffle=True),
+    'gzip-4-shuffle-256-frames': containers.StorageOptions(compression='gzip', compression_level=4,
+                                                           shuffle=True, frames_per_chunk=256)
+}
+
+
+def create_container(path, options):
+    cnt = containers.FeatureContainer(path, mode='w', storage=options)
+    cnt.open()
+
+    for index in range(50):
+        # Smooth features (like MFCCs) compress better than random data
+        num_frames = 500 + index * 20
+        features = np.cumsum(np.random.normal(0, 0.1, (num_frames, 40)), axis=0).astype(np.float32)
+        cnt.set('utt-{}'.format(index), features)
+
+    cnt.close()
+
+
+def run_read(cnt):
+    cnt.open()
+
+    for key in cnt.keys():
+        cnt.get(key, mem_map=False)
+
+    cnt.close()
+
+
+@pytest.mark.parametrize('setting', sorted(SETTINGS.keys()))
+def test_read_container(benchmark, tmpdir, setting):
+    path = os.path.join(tmpdir.strpath, 'features.hdf5')
+    create_container(path, SETTINGS[setting])
+    cnt = containers.FeatureContainer(path, mode='r')
+
+    benchmark.extra_info['file_size'] = os.path.getsize(path)
+    benchmark(run_read, cnt)
@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate.feeding import partitioning
+
+
+@pytest.fixture(scope='module')
+def container_path(tmpdir_factory):
+    path = os.path.join(tmpdir_factory.mktemp('index').strpath, 'features.hdf5')
+    cnt = containers.FeatureContainer(path, mode='w')
+    cnt.open()
+
+    for index in range(5000):
+        cnt.set('utt-{}'.format(index), np.zeros((index % 50 + 1, 13), dtype=np.float32))
+
+    cnt.close()
+
+    return path
+
+
+def run_create_loader(path):
+    cnt = containers.FeatureContainer(path, mode='r')
+    cnt.open()
+
+    utt_ids = cnt.keys()
+    loader = partitioning.PartitioningContainerLoader(utt_ids, cnt, '1m', shuffle=False)
+
+    cnt.close()
+
+    return loader
+
+
+def test_create_partitioning_loader(benchmark, container_path):
+    loader = benchmark(run_create_loader, container_path)
+
+    assert len(loader.partitions) > 0
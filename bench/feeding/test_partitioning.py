@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate.feeding import partitioning
+
+# The container is created in this directory (if set),
+# to compare the throughput on different disks (e.g. spinning disk vs. SSD).
+# To measure the disk and not the page-cache, the caches have to be dropped between runs.
+BENCH_DIR_VARIABLE = 'AUDIOMATE_BENCH_DIR'
+
+
+@pytest.fixture(scope='module')
+def container_path(tmpdir_factory):
+    base_dir = os.environ.get(BENCH_DIR_VARIABLE, None)
+
+    if base_dir is None:
+        base_dir = tmpdir_factory.mktemp('partitioning').strpath
+
+    path = os.path.join(base_dir, 'partitioning_bench.hdf5')
+    cnt = containers.FeatureContainer(path, mode='w')
+    cnt.open()
+
+    # Append in turns, so the data of the utterances is interleaved in the file
+    with cnt.buffered_append(max_buffer_size='1m'):
+        for _ in range(4):
+            for index in range(500):
+                cnt.append('utt-{}'.format(index), np.random.random((50, 40)).astype(np.float32))
+
+    cnt.close()
+
+    yield path
+
+    os.remove(path)
+
+
+def load_per_key(loader, cnt):
+    for info in loader.partitions:
+        for utt_id in info.utt_ids:
+            cnt._file[utt_id][:]  # skipcq: PYL-W0212
+
+
+def load_partitions(loader, cnt):
+    for index in range(len(loader.partitions)):
+        loader.load_partition_data(index)
+
+
+@pytest.mark.parametrize('load_func', [load_per_key, load_partitions])
+def test_load_partitions(benchmark, container_path, load_func):
+    cnt = containers.FeatureContainer(container_path, mode='r')
+    cnt.open()
+
+    loader = partitioning.PartitioningContainerLoader(cnt.keys(), cnt, '16m', shuffle=True, seed=42)
+
+    benchmark.extra_info['bytes_per_round'] = int(sum(loader.utt_sizes.values()))
+    benchmark(load_func, loader, cnt)
+
+    cnt.close()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from audiomate.processing import pipeline
+
+
+def create_pipeline():
+    norm = pipeline.MeanVarianceNorm(0.0, 1.0)
+    context = pipeline.AddContext(2, 2, parent=norm)
+    scaled = pipeline.MeanVarianceNorm(1.0, 2.0, parent=norm)
+    return pipeline.Stack([context, scaled])
+
+
+def run_utterances(step, utterances, recompile):
+    for frames in utterances:
+        # Rebuilding the plan for every utterance, corresponds to the former behaviour
+        if recompile:
+            step.compile()
+
+        step.process_frames(frames, 16000, offset=0, last=True)
+
+
+@pytest.mark.parametrize('recompile', [False, True])
+def test_process_short_utterances(benchmark, recompile):
+    # 1.5 seconds with a hop-size of 10 ms
+    utterances = [np.random.random((150, 13)) for _ in range(500)]
+    step = create_pipeline()
+
+    benchmark.extra_info['utterances'] = len(utterances)
+    benchmark(run_utterances, step, utterances, recompile)
+
+
+def run_online(step, frames, chunk_size):
+    for offset in range(0, frames.shape[0], chunk_size):
+        chunk = frames[offset:offset + chunk_size]
+        step.process_frames(chunk, 16000, offset=offset, last=offset + chunk_size >= frames.shape[0])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 10])
+def test_process_online(benchmark, chunk_size):
+    # 60 seconds with a hop-size of 10 ms, pooled over 10 seconds
+    frames = np.random.random((6000, 128))
+    step = pipeline.AvgPool(1000)
+
+    benchmark(run_online, step, frames, chunk_size)
+
+
+def create_music_pipeline():
+    mfcc = pipeline.MFCC(n_mfcc=13, n_mels=128)
+    onset = pipeline.OnsetStrength(n_mels=128)
+    tempo = pipeline.Tempogram(n_mels=128, win_length=384)
+    return pipeline.Stack([mfcc, onset, tempo])
+
+
+@pytest.mark.parametrize('optimized', [False, True])
+def test_process_music_features(benchmark, optimized):
+    # 30 seconds at 22.05 kHz with a hop-size of 512 samples
+    frames = np.random.uniform(-1.0, 1.0, (1290, 2048)).astype(np.float32)
+    step = create_music_pipeline()
+
+    if optimized:
+        step = pipeline.optimize(step)
+
+    benchmark(step.process_frames, frames, 22050, offset=0, last=True)
@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+import pytest
+
+import audiomate
+from audiomate.processing import pipeline
+from audiomate.utils import audio
+
+
+@pytest.fixture(scope='module')
+def corpus(tmp_path_factory):
+    base_dir = str(tmp_path_factory.mktemp('process_corpus'))
+    ds = audiomate.Corpus()
+
+    for index in range(20):
+        path = os.path.join(base_dir, 'audio-{}.wav'.format(index))
+        samples = np.random.uniform(-1.0, 1.0, 16000 * 10).astype(np.float32)
+        audio.write_wav(path, samples, sr=16000)
+
+        track = ds.new_file(path, 'track-{}'.format(index))
+        ds.new_utterance('utt-{}'.format(index), track.idx)
+
+    return ds
+
+
+@pytest.mark.parametrize('num_workers,pipelined', [(1, False), (1, True), (4, False), (4, True)])
+def test_process_corpus(benchmark, corpus, tmpdir, num_workers, pipelined):
+    mfcc = pipeline.MFCC(n_mfcc=13, n_mels=40)
+    path = os.path.join(tmpdir.strpath, 'features.hdf5')
+
+    benchmark(mfcc.process_corpus, corpus, path, num_workers=num_workers, pipelined=pipelined)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import processing
+from audiomate import tracks
+from audiomate.utils import audio
+
+
+class SumProcessor(processing.Processor):
+
+    def process_frames(self, data, sampling_rate, offset=0, last=False, utterance=None, corpus=None):
+        return np.sum(data, axis=1)
+
+
+@pytest.fixture(scope='module')
+def wav_path(tmp_path_factory):
+    path = os.path.join(str(tmp_path_factory.mktemp('online_wav')), 'audio.wav')
+    samples = np.random.uniform(-1.0, 1.0, 16000 * 60).astype(np.float32)
+    audio.write_wav(path, samples, sr=16000)
+    return path
+
+
+def run_frames(path):
+    for _ in audio.read_frames(path, frame_size=400, hop_size=160):
+        pass
+
+
+def run_frame_blocks(path):
+    for _ in audio.read_frame_blocks(path, frame_size=400, hop_size=160):
+        pass
+
+
+def run_online(track, chunk_size):
+    for _ in SumProcessor().process_track_online(track, frame_size=400, hop_size=160, chunk_size=chunk_size):
+        pass
+
+
+def test_read_frames(benchmark, wav_path):
+    benchmark(run_frames, wav_path)
+
+
+def test_read_frame_blocks(benchmark, wav_path):
+    benchmark(run_frame_blocks, wav_path)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100, 1000])
+def test_process_track_online(benchmark, wav_path, chunk_size):
+    track = tracks.FileTrack('idx', wav_path)
+    benchmark(run_online, track, chunk_size)
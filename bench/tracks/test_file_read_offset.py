@@ -0,0 +1,26 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import tracks
+from audiomate.utils import audio
+
+
+@pytest.fixture(scope='module')
+def long_wav_path(tmp_path_factory):
+    path = os.path.join(str(tmp_path_factory.mktemp('long_wav')), 'long.wav')
+    samples = np.random.uniform(-1.0, 1.0, 16000 * 60 * 10).astype(np.float32)
+    audio.write_wav(path, samples, sr=16000)
+    return path
+
+
+def run(track, offset):
+    for _ in range(50):
+        track.read_samples(offset=offset, duration=1.0)
+
+
+@pytest.mark.parametrize('offset', [0.0, 60.0, 300.0, 590.0])
+def test_read_samples_with_offset(benchmark, long_wav_path, offset):
+    track = tracks.FileTrack('idx', long_wav_path)
+    benchmark(run, track, offset)
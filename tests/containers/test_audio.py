@@ -1,4 +1,6 @@
 import os
+import shutil
+
 import numpy as np
 
 from audiomate import containers
@@ -8,10 +10,9 @@ from tests import resources
 
 
 @pytest.fixture()
-def sample_container():
-    container_path = resources.get_resource_path(
-        ['sample_files', 'audio_container']
-    )
+def sample_container(tmpdir):
+    container_path = os.path.join(tmpdir.strpath, 'audio_container')
+    shutil.copyfile(resources.get_resource_path(['sample_files', 'audio_container']), container_path)
     sample_container = containers.AudioContainer(container_path)
     sample_container.open()
     yield sample_container
@@ -30,6 +31,74 @@ class TestAudioContainer:
         )
         assert sr == 16000
 
+    def test_get_range(self, sample_container):
+        samples = sample_container.get_range('track1', start=2, end=5)
+
+        assert samples.dtype == np.float32
+        assert np.allclose(samples, np.array([0.3, 0.4, 0.5]), atol=1.e-4)
+
+    def test_get_range_until_end(self, sample_container):
+        samples = sample_container.get_range('track1', start=7)
+
+        assert np.allclose(samples, np.array([0.8, 0.9, 1.0]), atol=1.e-4)
+
+    def test_get_range_with_missing_key_returns_none(self, sample_container):
+        assert sample_container.get_range('not_existing') is None
+
+    def test_get_raw(self, sample_container):
+        samples, sr = sample_container.get_raw('track1', mem_map=False)
+
+        assert samples.dtype == np.int16
+        assert np.array_equal(samples, (np.arange(1, 11) / 10 * 32767).astype(np.int16))
+        assert sr == 16000
+        assert sample_container.get_raw('not_existing') is None
+
+    def test_get_raw_range(self, sample_container):
+        samples = sample_container.get_raw_range('track1', start=2, end=5)
+
+        assert samples.dtype == np.int16
+        assert np.array_equal(samples, sample_container.get_raw('track1', mem_map=False)[0][2:5])
+
+    def test_get_raw_range_into_array(self, sample_container):
+        out = np.zeros(3, dtype=np.int16)
+        samples = sample_container.get_raw_range('track1', start=7, out=out)
+
+        assert samples is out
+        assert np.array_equal(out, sample_container.get_raw('track1', mem_map=False)[0][7:])
+
+        with pytest.raises(ValueError):
+            sample_container.get_raw_range('track1', start=2, end=4, out=out)
+
+    def test_set_raw_and_append_raw(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+
+        samples = np.array([-32767, -5, 0, 7, 32767], dtype=np.int16)
+        cnt.set_raw('track1', samples, 8000)
+        cnt.append_raw('track2', samples[:2], 8000)
+        cnt.append_raw('track2', samples[2:], 8000)
+
+        assert np.array_equal(cnt.get_raw('track1', mem_map=False)[0], samples)
+        assert np.array_equal(cnt.get_raw('track2', mem_map=False)[0], samples)
+        assert cnt.get_sampling_rate('track2') == 8000
+
+        with pytest.raises(ValueError):
+            cnt.set_raw('track3', samples.astype(np.float32), 8000)
+
+        with pytest.raises(ValueError):
+            cnt.append_raw('track2', samples, 16000)
+
+        cnt.close()
+
+    def test_get_sampling_rate(self, sample_container):
+        assert sample_container.get_sampling_rate('track1') == 16000
+        assert sample_container.get_sampling_rate('not_existing') is None
+
+    def test_get_num_samples(self, sample_container):
+        assert sample_container.get_num_samples('track1') == 10
+        assert sample_container.get_num_samples('not_existing') is None
+
     def test_set(self, tmpdir):
         path = os.path.join(tmpdir.strpath, 'audio')
         cnt = containers.AudioContainer(path)
@@ -93,3 +162,27 @@ class TestAudioContainer:
         assert sr == 16000
 
         cnt.close()
+
+    def test_buffered_append(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+
+        chunk_a = np.random.random(10).astype(np.float32)
+        chunk_b = np.random.random(5).astype(np.float32)
+
+        with cnt.buffered_append():
+            cnt.append('track1', chunk_a, 16000)
+            cnt.append('track1', chunk_b, 16000)
+
+            assert cnt.get_sampling_rate('track1') == 16000
+
+            with pytest.raises(ValueError):
+                cnt.append('track1', chunk_b, 8000)
+
+        samples, sr = cnt.get('track1')
+
+        assert np.allclose(samples, np.concatenate([chunk_a, chunk_b]), atol=1.e-4)
+        assert sr == 16000
+
+        cnt.close()
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 import numpy as np
 
@@ -9,10 +10,9 @@ from tests import resources
 
 
 @pytest.fixture()
-def sample_container():
-    container_path = resources.get_resource_path(
-        ['sample_files', 'feat_container']
-    )
+def sample_container(tmpdir):
+    container_path = os.path.join(tmpdir.strpath, 'feat_container')
+    shutil.copyfile(resources.get_resource_path(['sample_files', 'feat_container']), container_path)
     sample_container = containers.Container(container_path)
     sample_container.open()
     yield sample_container
@@ -34,6 +34,46 @@ class TestContainer:
     def test_get(self, sample_container):
         assert sample_container.get('utt-1', mem_map=False).shape == (20, 5)
 
+    def test_get_many(self, sample_container):
+        keys = ['utt-3', 'utt-1']
+        data = sample_container.get_many(keys)
+
+        assert len(data) == 2
+
+        for key, value in zip(keys, data):
+            assert np.array_equal(value, sample_container.get(key, mem_map=False))
+
+    def test_get_many_contiguous(self, tmpdir):
+        tmp_container = containers.Container(os.path.join(tmpdir.strpath, 'container'))
+        tmp_container.open()
+        tmp_container.set('utt-1', np.arange(10).reshape(5, 2))
+        tmp_container.append('utt-2', np.arange(4).reshape(2, 2))
+        tmp_container.set('utt-3', np.zeros((0, 2), dtype=np.int64))
+
+        data, offsets = tmp_container.get_many(['utt-2', 'utt-3', 'utt-1'], contiguous=True)
+
+        assert data.shape == (7, 2)
+        assert offsets.tolist() == [0, 2, 2, 7]
+        assert np.array_equal(data[0:2], np.arange(4).reshape(2, 2))
+        assert np.array_equal(data[2:7], np.arange(10).reshape(5, 2))
+
+        tmp_container.close()
+
+    def test_get_many_contiguous_with_different_dimensions_raises_error(self, tmpdir):
+        tmp_container = containers.Container(os.path.join(tmpdir.strpath, 'container'))
+        tmp_container.open()
+        tmp_container.set('utt-1', np.zeros((5, 2)))
+        tmp_container.set('utt-2', np.zeros((5, 3)))
+
+        with pytest.raises(ValueError):
+            tmp_container.get_many(['utt-1', 'utt-2'], contiguous=True)
+
+        tmp_container.close()
+
+    def test_get_many_with_missing_key_raises_error(self, sample_container):
+        with pytest.raises(ValueError):
+            sample_container.get_many(['utt-1', 'utt-10'])
+
     def test_remove(self, sample_container):
         sample_container.set('some-key', np.arange(20))
         assert sample_container.keys() == ['some-key', 'utt-1', 'utt-2', 'utt-3']
@@ -68,3 +108,101 @@ class TestContainer:
             tmp_container.append('utt-1', np.arange(42).reshape(7, 2, 3))
 
         tmp_container.close()
+
+    def test_buffered_append(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        tmp_container = containers.Container(path)
+        tmp_container.open()
+
+        data = np.arange(100).reshape(20, 5)
+
+        with tmp_container.buffered_append():
+            for index in range(20):
+                tmp_container.append('utt-1', data[index:index + 1])
+
+            assert 'utt-1' not in tmp_container._file
+            assert 'utt-1' in tmp_container
+
+        res = tmp_container.get('utt-1', mem_map=False)
+
+        assert np.array_equal(data, res)
+        assert tmp_container._file['utt-1'].chunks == (20, 5)
+
+        tmp_container.close()
+
+    def test_buffered_append_writes_when_buffer_is_full(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        tmp_container = containers.Container(path)
+        tmp_container.open()
+
+        data = np.arange(100, dtype=np.float32).reshape(20, 5)
+
+        with tmp_container.buffered_append(max_buffer_size='100'):
+            for index in range(20):
+                tmp_container.append('utt-1', data[index:index + 1])
+
+            assert tmp_container._file['utt-1'].shape == (18, 5)
+
+        res = tmp_container.get('utt-1', mem_map=False)
+
+        assert np.array_equal(data, res)
+
+        tmp_container.close()
+
+    def test_buffered_append_to_existing_data(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        tmp_container = containers.Container(path)
+        tmp_container.open()
+
+        data = np.arange(100).reshape(20, 5)
+        tmp_container.append('utt-1', data[:8])
+
+        with tmp_container.buffered_append():
+            tmp_container.append('utt-1', data[8:12])
+            tmp_container.append('utt-1', data[12:])
+
+        assert np.array_equal(data, tmp_container.get('utt-1', mem_map=False))
+
+        tmp_container.close()
+
+    def test_buffered_append_get_writes_buffered_data(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        tmp_container = containers.Container(path)
+        tmp_container.open()
+
+        data = np.arange(100).reshape(20, 5)
+
+        with tmp_container.buffered_append():
+            tmp_container.append('utt-1', data[:8])
+            tmp_container.append('utt-2', data[8:])
+
+            assert np.array_equal(data[:8], tmp_container.get('utt-1', mem_map=False))
+            assert 'utt-2' not in tmp_container._file
+
+            tmp_container.append('utt-1', data[8:])
+            tmp_container.remove('utt-2')
+
+        assert tmp_container.keys() == ['utt-1']
+        assert np.array_equal(data, tmp_container.get('utt-1', mem_map=False))
+
+        tmp_container.close()
+
+    def test_buffered_append_with_different_dimension_raises_error(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        tmp_container = containers.Container(path)
+        tmp_container.open()
+
+        with tmp_container.buffered_append():
+            tmp_container.append('utt-1', np.arange(20).reshape(5, 2, 2))
+
+            with pytest.raises(ValueError):
+                tmp_container.append('utt-1', np.arange(42).reshape(7, 2, 3))
+
+        tmp_container.close()
+
+
+def test_chunk_shape():
+    assert containers.storage.chunk_shape((1000, 40), np.float32, target_size=1600) == (10, 40)
+    assert containers.storage.chunk_shape((5, 40), np.float32, target_size=1600) == (5, 40)
+    assert containers.storage.chunk_shape((1000, 1000), np.float32, target_size=1600) == (1, 1000)
+    assert containers.storage.chunk_shape((0, 40), np.float32) is True
@@ -1,3 +1,7 @@
+import os
+import shutil
+
+import numpy as np
 import pytest
 
 from audiomate import containers
@@ -5,10 +9,9 @@ from tests import resources
 
 
 @pytest.fixture()
-def sample_feature_container():
-    container_path = resources.get_resource_path(
-        ['sample_files', 'feat_container']
-    )
+def sample_feature_container(tmpdir):
+    container_path = os.path.join(tmpdir.strpath, 'feat_container')
+    shutil.copyfile(resources.get_resource_path(['sample_files', 'feat_container']), container_path)
     sample_container = containers.FeatureContainer(container_path)
     sample_container.open()
     yield sample_container
@@ -66,3 +69,56 @@ class TestFeatureContainer:
 
         with pytest.raises(ValueError):
             sample_feature_container.stats()
+
+    def test_stats_per_dimension(self, sample_feature_container):
+        data = np.concatenate([sample_feature_container.get(key, mem_map=False)
+                               for key in sample_feature_container.keys()])
+
+        stats = sample_feature_container.stats(per_dimension=True)
+
+        assert np.allclose(stats.mean, np.mean(data, axis=0))
+        assert np.allclose(stats.var, np.var(data, axis=0))
+        assert np.allclose(stats.min, np.min(data, axis=0))
+        assert stats.num == data.shape[0]
+
+    def test_stats_with_keys(self, sample_feature_container):
+        stats = sample_feature_container.stats(keys=['utt-1'])
+
+        assert stats.mean == pytest.approx(0.51029100520776705)
+        assert stats.num == 100
+
+        with pytest.raises(ValueError):
+            sample_feature_container.stats(keys=['utt-1', 'not-existing'])
+
+    def test_stats_are_not_cached_by_default(self, sample_feature_container):
+        sample_feature_container.stats()
+        sample_feature_container.stats(keys=['utt-1'], per_dimension=True)
+
+        assert not any(n.startswith('cached-') for n in sample_feature_container._file.attrs.keys())
+
+    def test_stats_are_cached_and_invalidated(self, sample_feature_container):
+        stats = sample_feature_container.stats(cache=True)
+        cached = [n for n in sample_feature_container._file.attrs.keys() if n.startswith('cached-')]
+
+        assert len(cached) == 1
+        assert sample_feature_container.stats(cache=True).mean == pytest.approx(stats.mean)
+
+        sample_feature_container.set('utt-4', np.full((10, 2), 5.0))
+
+        assert not any(n.startswith('cached-') for n in sample_feature_container._file.attrs.keys())
+        assert sample_feature_container.stats(cache=True).max == pytest.approx(5.0)
+
+    def test_stats_with_multiple_workers(self, sample_feature_container):
+        expected = sample_feature_container.stats(per_dimension=True)
+
+        with pytest.raises(ValueError):
+            sample_feature_container.stats(num_workers=2)
+
+        sample_feature_container.close()
+        sample_feature_container.open(mode='r')
+
+        stats = sample_feature_container.stats(per_dimension=True, num_workers=2)
+
+        assert np.allclose(stats.mean, expected.mean)
+        assert np.allclose(stats.var, expected.var)
+        assert stats.num == expected.num
@@ -0,0 +1,195 @@
+import os
+
+import h5py
+import numpy as np
+
+from audiomate import containers
+from audiomate.containers import index
+
+
+class TestContainerIndex:
+
+    def test_lookup(self):
+        idx = containers.ContainerIndex(['a', 'b'], [(10, 5), (3,)], [np.float32, np.int16])
+
+        assert len(idx) == 2
+        assert 'a' in idx
+        assert 'c' not in idx
+        assert idx.shape('a') == (10, 5)
+        assert idx.shape('b') == (3,)
+        assert idx.dtype('b') == np.int16
+        assert idx.num_rows('a') == 10
+        assert idx.byte_size('a') == 200
+        assert idx.byte_size('b') == 6
+        assert idx.shape('c') is None
+
+    def test_arrays(self):
+        idx = containers.ContainerIndex(['a', 'b'], [(10, 5), (3,)], [np.float32, np.int16])
+
+        assert idx.keys.tolist() == ['a', 'b']
+        assert idx.ndims.tolist() == [2, 1]
+        assert idx.shapes.tolist() == [[10, 5], [3, 0]]
+        assert idx.byte_sizes.tolist() == [200, 6]
+
+    def test_update_and_remove(self):
+        idx = containers.ContainerIndex(['a', 'b'], [(10, 5), (3,)], [np.float32, np.int16])
+
+        idx.update('a', (12, 5), np.float32)
+        idx.update('c', (2, 2, 2), np.float64)
+        idx.remove('b')
+
+        assert idx.sorted_keys() == ['a', 'c']
+        assert idx.shape('a') == (12, 5)
+        assert idx.shape('c') == (2, 2, 2)
+        assert idx.byte_size('c') == 64
+        assert list(idx) == ['a', 'c']
+        assert idx.shapes.tolist() == [[12, 5, 0], [2, 2, 2]]
+
+    def test_write_and_read(self, tmpdir):
+        idx = containers.ContainerIndex(['utt-1', 'ütt-2', 'scalar'], [(10, 5), (3,), ()],
+                                        [np.float32, np.int16, np.int64])
+
+        with h5py.File(os.path.join(tmpdir.strpath, 'file.hdf5'), 'w') as f:
+            idx.write(f.require_group('index'))
+            loaded = containers.ContainerIndex.read(f['index'])
+
+        assert loaded.sorted_keys() == ['scalar', 'utt-1', 'ütt-2']
+        assert loaded.shape('ütt-2') == (3,)
+        assert loaded.shape('scalar') == ()
+        assert loaded.dtype('utt-1') == np.float32
+        assert loaded.byte_sizes.tolist() == [200, 6, 8]
+
+    def test_write_and_read_empty(self, tmpdir):
+        with h5py.File(os.path.join(tmpdir.strpath, 'file.hdf5'), 'w') as f:
+            containers.ContainerIndex().write(f.require_group('index'))
+            loaded = containers.ContainerIndex.read(f['index'])
+
+        assert len(loaded) == 0
+
+    def test_scan(self, tmpdir):
+        with h5py.File(os.path.join(tmpdir.strpath, 'file.hdf5'), 'w') as f:
+            f.create_dataset('a', data=np.zeros((4, 3), dtype=np.float32))
+            f.create_dataset('group/b', data=np.zeros(7, dtype=np.int16))
+            f.create_dataset(index.INDEX_GROUP + '/keys', data=np.zeros(1))
+
+            idx = containers.ContainerIndex.scan(f)
+
+        assert idx.sorted_keys() == ['a', 'group/b']
+        assert idx.shape('group/b') == (7,)
+
+
+class TestContainerWithIndex:
+
+    def test_index_is_stored_on_close(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros((10, 4), dtype=np.float32))
+        cnt.append('utt-2', np.zeros((3, 4)))
+        cnt.append('utt-2', np.zeros((2, 4)))
+        cnt.close()
+
+        with h5py.File(path, 'r') as f:
+            stored = containers.ContainerIndex.read(f[index.INDEX_GROUP])
+
+        assert stored.sorted_keys() == ['utt-1', 'utt-2']
+        assert stored.shape('utt-2') == (5, 4)
+        assert stored.dtype('utt-1') == np.float32
+
+    def test_keys_and_shapes_from_stored_index(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros((10, 4)))
+        cnt.set('utt-2', np.zeros((3, 4)))
+        cnt.close()
+
+        cnt.open(mode='r')
+
+        assert cnt.keys() == ['utt-1', 'utt-2']
+        assert cnt.get_shape('utt-2') == (3, 4)
+        assert cnt.get_shape('utt-3') is None
+        assert cnt.index.byte_size('utt-1') == 320
+
+        cnt.close()
+
+    def test_remove_updates_index(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros((10, 4)))
+        cnt.set('utt-2', np.zeros((3, 4)))
+        cnt.close()
+
+        cnt.open()
+        cnt.remove('utt-1')
+
+        assert cnt.keys() == ['utt-2']
+        assert 'utt-1' not in cnt
+
+        cnt.close()
+        cnt.open()
+
+        assert cnt.keys() == ['utt-2']
+
+        cnt.close()
+
+    def test_buffered_append_updates_index(self, tmpdir):
+        cnt = containers.Container(os.path.join(tmpdir.strpath, 'container'))
+        cnt.open()
+
+        with cnt.buffered_append():
+            cnt.append('utt-1', np.zeros((3, 2)))
+            cnt.append('utt-1', np.zeros((4, 2)))
+
+            assert cnt.get_shape('utt-1') == (7, 2)
+
+        cnt.close()
+
+    def test_stored_index_is_removed_while_changed(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros(3))
+        cnt.close()
+
+        cnt.open()
+        cnt.set('utt-2', np.zeros(3))
+
+        assert index.INDEX_GROUP not in cnt._file
+
+        cnt.close()
+
+    def test_container_without_index_is_scanned(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('utt-1', data=np.zeros((5, 2)))
+
+        cnt = containers.Container(path)
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1']
+        assert cnt.get_shape('utt-1') == (5, 2)
+
+        cnt.close()
+
+        with h5py.File(path, 'r') as f:
+            assert index.INDEX_GROUP not in f
+
+    def test_outdated_index_is_detected(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros(3))
+        cnt.close()
+
+        with h5py.File(path, 'a') as f:
+            f.create_dataset('utt-2', data=np.zeros(8))
+
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1', 'utt-2']
+        assert cnt.get_shape('utt-2') == (8,)
+
+        cnt.close()
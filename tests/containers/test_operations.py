@@ -0,0 +1,218 @@
+import os
+
+import numpy as np
+import pytest
+
+import audiomate
+from audiomate import containers
+from audiomate import tracks
+
+
+def create_container(path, data, frame_size=400, storage=None, shard_levels=None):
+    cnt = containers.FeatureContainer(path, storage=storage, shard_levels=shard_levels)
+    cnt.open()
+    cnt.frame_size = frame_size
+    cnt.hop_size = 160
+    cnt.sampling_rate = 16000
+
+    for key, value in data.items():
+        cnt.set(key, value)
+
+    cnt.close()
+
+    return containers.FeatureContainer(path)
+
+
+@pytest.fixture()
+def source(tmpdir):
+    return create_container(os.path.join(tmpdir.strpath, 'source.hdf5'), {
+        'utt-1': np.arange(20, dtype=np.float32).reshape(5, 4),
+        'utt-2': np.arange(8, dtype=np.float32).reshape(2, 4),
+        'utt-3': np.arange(12, dtype=np.float32).reshape(3, 4)
+    })
+
+
+class TestCopyKeys:
+
+    def test_copy_keys(self, tmpdir, source):
+        target = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'target.hdf5'))
+        containers.copy_keys(source, target, ['utt-1', 'utt-3'])
+
+        target.open()
+
+        assert target.keys() == ['utt-1', 'utt-3']
+        assert np.array_equal(target.get('utt-3', mem_map=False), np.arange(12).reshape(3, 4))
+        assert target.frame_size == 400
+        assert target.hop_size == 160
+        assert target.sampling_rate == 16000
+
+        target.close()
+
+        assert not source.is_open()
+
+    def test_copy_keys_keeps_storage(self, tmpdir):
+        options = containers.StorageOptions(compression='gzip', dtype='int16')
+        source = create_container(os.path.join(tmpdir.strpath, 'source.hdf5'), {
+            'utt-1': np.random.random((10, 3))
+        }, storage=options)
+        target = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'target.hdf5'), shard_levels=1)
+        containers.copy_keys(source, target, ['utt-1'])
+
+        source.open()
+        target.open()
+
+        assert target._dataset('utt-1').compression == 'gzip'
+        assert target._dataset('utt-1').dtype == np.int16
+        assert target.index.dtype('utt-1') == np.float32
+        assert np.array_equal(target.get('utt-1', mem_map=False), source.get('utt-1', mem_map=False))
+
+        source.close()
+        target.close()
+
+    def test_copy_keys_overwrites_existing_data(self, tmpdir, source):
+        target = create_container(os.path.join(tmpdir.strpath, 'target.hdf5'), {
+            'utt-1': np.ones(3)
+        })
+        containers.copy_keys(source, target, ['utt-1'])
+
+        target.open()
+        assert target.get_shape('utt-1') == (5, 4)
+        target.close()
+
+    def test_copy_keys_with_missing_key_raises_error(self, tmpdir, source):
+        target = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'target.hdf5'))
+
+        with pytest.raises(ValueError):
+            containers.copy_keys(source, target, ['utt-1', 'utt-4'])
+
+    def test_copy_keys_with_different_attributes_raises_error(self, tmpdir, source):
+        target = create_container(os.path.join(tmpdir.strpath, 'target.hdf5'), {}, frame_size=200)
+
+        with pytest.raises(ValueError):
+            containers.copy_keys(source, target, ['utt-1'])
+
+    def test_copy_keys_to_ragged_container(self, tmpdir, source):
+        target = containers.RaggedContainer(os.path.join(tmpdir.strpath, 'target.bin'))
+        containers.copy_keys(source, target, ['utt-2'], batch_size=1)
+
+        target.open()
+
+        assert target.keys() == ['utt-2']
+        assert np.array_equal(target.get('utt-2'), np.arange(8).reshape(2, 4))
+        assert target.attrs['frame-size'] == 400
+
+        target.close()
+
+
+class TestSubset:
+
+    def test_subset(self, tmpdir, source):
+        corpus = audiomate.Corpus()
+        corpus.new_file('/some/path.wav', 'track-1')
+        corpus.new_utterance('utt-1', 'track-1')
+        corpus.new_utterance('utt-3', 'track-1')
+
+        target = containers.subset(source, corpus, os.path.join(tmpdir.strpath, 'subset.hdf5'))
+
+        assert isinstance(target, containers.FeatureContainer)
+        assert not target.is_open()
+
+        target.open()
+        assert target.keys() == ['utt-1', 'utt-3']
+        assert target.frame_size == 400
+        target.close()
+
+    def test_subset_of_audio_container_uses_tracks(self, tmpdir):
+        source = containers.AudioContainer(os.path.join(tmpdir.strpath, 'audio.hdf5'))
+        source.open()
+        source.set('track-1', np.zeros(10, dtype=np.float32), 16000)
+        source.set('track-2', np.zeros(20, dtype=np.float32), 16000)
+        source.close()
+
+        corpus = audiomate.Corpus()
+        corpus.import_tracks([tracks.ContainerTrack('track-2', source)])
+
+        target = containers.subset(source, corpus, os.path.join(tmpdir.strpath, 'subset.hdf5'))
+
+        assert isinstance(target, containers.AudioContainer)
+
+        target.open()
+        assert target.keys() == ['track-2']
+        assert target.get_sampling_rate('track-2') == 16000
+        target.close()
+
+    def test_subset_of_audio_container_uses_keys_of_container_tracks(self, tmpdir):
+        source = containers.AudioContainer(os.path.join(tmpdir.strpath, 'audio.hdf5'))
+        source.open()
+        source.set('key-1', np.zeros(10, dtype=np.float32), 16000)
+        source.set('key-2', np.zeros(20, dtype=np.float32), 16000)
+        source.close()
+
+        other = containers.AudioContainer(os.path.join(tmpdir.strpath, 'other.hdf5'))
+        other.open()
+        other.set('key-1', np.zeros(5, dtype=np.float32), 16000)
+        other.close()
+
+        corpus = audiomate.Corpus()
+        corpus.import_tracks([
+            tracks.ContainerTrack('track-1', source, key='key-2'),
+            tracks.ContainerTrack('track-2', other, key='key-1'),
+            tracks.FileTrack('key-1', '/some/path.wav')
+        ])
+
+        target = containers.subset(source, corpus, os.path.join(tmpdir.strpath, 'subset.hdf5'))
+
+        target.open()
+        assert target.keys() == ['key-2']
+        assert target.get('key-2', mem_map=False)[0].shape == (20,)
+        target.close()
+
+
+class TestMerge:
+
+    def test_merge(self, tmpdir, source):
+        other = create_container(os.path.join(tmpdir.strpath, 'other.hdf5'), {
+            'utt-4': np.ones((2, 4), dtype=np.float32)
+        })
+
+        target = containers.merge([source, other], os.path.join(tmpdir.strpath, 'merged.hdf5'))
+        target.open()
+
+        assert target.keys() == ['utt-1', 'utt-2', 'utt-3', 'utt-4']
+        assert np.array_equal(target.get('utt-4', mem_map=False), np.ones((2, 4)))
+        assert target.sampling_rate == 16000
+
+        target.close()
+
+    def test_merge_with_duplicate_key_raises_error(self, tmpdir, source):
+        other = create_container(os.path.join(tmpdir.strpath, 'other.hdf5'), {
+            'utt-1': np.ones((2, 4), dtype=np.float32)
+        })
+        path = os.path.join(tmpdir.strpath, 'merged.hdf5')
+
+        with pytest.raises(ValueError):
+            containers.merge([source, other], path)
+
+        assert not os.path.exists(path)
+
+    def test_merge_with_different_attributes_raises_error(self, tmpdir, source):
+        other = create_container(os.path.join(tmpdir.strpath, 'other.hdf5'), {
+            'utt-4': np.ones((2, 4), dtype=np.float32)
+        }, frame_size=200)
+
+        with pytest.raises(ValueError):
+            containers.merge([source, other], os.path.join(tmpdir.strpath, 'merged.hdf5'))
+
+    def test_merge_virtual_container(self, tmpdir, source):
+        other = create_container(os.path.join(tmpdir.strpath, 'other.hdf5'), {
+            'utt-4': np.ones((2, 4), dtype=np.float32)
+        })
+        virtual = containers.VirtualFeatureContainer([source.path, other.path])
+
+        target = containers.merge([virtual], os.path.join(tmpdir.strpath, 'merged.hdf5'))
+        target.open()
+
+        assert target.keys() == ['utt-1', 'utt-2', 'utt-3', 'utt-4']
+        assert target.frame_size == 400
+
+        target.close()
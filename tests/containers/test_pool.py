@@ -0,0 +1,220 @@
+import os
+import time
+
+import h5py
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate import tracks
+
+
+@pytest.fixture()
+def hdf5_paths(tmpdir):
+    paths = []
+
+    for index in range(3):
+        path = os.path.join(tmpdir.strpath, 'file_{}.hdf5'.format(index))
+
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('data', data=np.arange(index + 1))
+
+        paths.append(path)
+
+    return paths
+
+
+class TestHandlePool:
+
+    def test_acquire_opens_file(self, hdf5_paths):
+        pool = containers.HandlePool()
+        handle = pool.acquire(hdf5_paths[0])
+
+        assert np.array_equal(handle['data'][()], [0])
+        assert pool.num_opens == 1
+        assert pool.num_open == 1
+
+        pool.release(hdf5_paths[0])
+        pool.close_all()
+
+    def test_released_handle_is_reused(self, hdf5_paths):
+        pool = containers.HandlePool(max_idle=None)
+
+        for _ in range(3):
+            with pool.handle(hdf5_paths[0]):
+                pass
+
+        assert pool.num_opens == 1
+        assert pool.num_reuses == 2
+        assert pool.num_closes == 0
+        assert pool.num_open == 1
+
+        pool.close_all()
+
+        assert pool.num_closes == 1
+        assert pool.num_open == 0
+
+    def test_least_recently_used_handle_is_closed(self, hdf5_paths):
+        pool = containers.HandlePool(max_open=2, max_idle=None)
+
+        for path in [hdf5_paths[0], hdf5_paths[1], hdf5_paths[0], hdf5_paths[2]]:
+            with pool.handle(path):
+                pass
+
+        assert pool.num_open == 2
+        assert pool.num_closes == 1
+        assert pool.discard(hdf5_paths[1])
+        assert pool.num_closes == 1
+
+        pool.close_all()
+
+    def test_handle_in_use_is_not_closed(self, hdf5_paths):
+        pool = containers.HandlePool(max_open=1, max_idle=None)
+        handle = pool.acquire(hdf5_paths[0])
+
+        with pool.handle(hdf5_paths[1]):
+            assert pool.num_open == 2
+
+        assert pool.num_open == 1
+        assert np.array_equal(handle['data'][()], [0])
+
+        pool.release(hdf5_paths[0])
+        pool.close_all()
+
+    def test_discard_handle_in_use(self, hdf5_paths):
+        pool = containers.HandlePool(max_idle=None)
+
+        with pool.handle(hdf5_paths[0]):
+            assert not pool.discard(hdf5_paths[0])
+
+        assert pool.discard(hdf5_paths[0])
+        assert pool.num_open == 0
+
+    def test_released_handle_is_closed_without_idle_time(self, hdf5_paths):
+        pool = containers.HandlePool(max_idle=0)
+
+        with pool.handle(hdf5_paths[0]):
+            with pool.handle(hdf5_paths[0]):
+                pass
+
+            assert pool.num_open == 1
+
+        assert pool.num_open == 0
+        assert pool.num_closes == 1
+
+    def test_idle_handle_is_closed(self, hdf5_paths):
+        pool = containers.HandlePool(max_idle=0.05)
+
+        with pool.handle(hdf5_paths[0]):
+            pass
+
+        with pool.handle(hdf5_paths[1]):
+            pass
+
+        assert pool.num_open == 2
+
+        deadline = time.monotonic() + 5.0
+
+        while pool.num_open > 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert pool.num_open == 0
+        assert pool.num_closes == 2
+
+        with h5py.File(hdf5_paths[0], 'a') as f:
+            f['data'][0] = 5
+
+    def test_handles_are_not_reused_after_fork(self, hdf5_paths):
+        pool = containers.HandlePool(max_idle=None)
+
+        with pool.handle(hdf5_paths[0]):
+            pass
+
+        inherited = pool._handles[os.path.abspath(hdf5_paths[0])]
+        pool._pid = -1
+
+        with pool.handle(hdf5_paths[0]) as handle:
+            assert handle is not inherited
+
+        assert pool.num_opens == 2
+        assert pool.num_open == 1
+
+        pool.close_all()
+        inherited.close()
+
+
+class TestOpenPooled:
+
+    def test_open_pooled_uses_default_pool(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio.hdf5')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+        cnt.set('track', np.zeros(10, dtype=np.float32), 16000)
+        cnt.close()
+
+        pool = containers.default_handle_pool()
+        num_opens = pool.num_opens
+
+        track = tracks.ContainerTrack('track', cnt)
+
+        assert track.sampling_rate == 16000
+        assert track.num_samples == 10
+        assert track.read_samples().shape == (10,)
+        assert pool.num_opens == num_opens + 1
+        assert not cnt.is_open()
+
+        pool.discard(path)
+
+    def test_open_after_pooled_read(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio.hdf5')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+        cnt.set('track', np.zeros(10, dtype=np.float32), 16000)
+        cnt.close()
+
+        with cnt.open_pooled():
+            assert cnt.keys() == ['track']
+
+        cnt.open()
+        cnt.set('track2', np.zeros(5, dtype=np.float32), 16000)
+        cnt.close()
+
+        with cnt.open_pooled():
+            assert cnt.keys() == ['track', 'track2']
+
+        containers.default_handle_pool().discard(path)
+
+    def test_pooled_read_of_quantized_container(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'features.hdf5')
+        data = np.random.random((20, 4)).astype(np.float32)
+
+        cnt = containers.FeatureContainer(path, storage=containers.StorageOptions(dtype='int16'))
+        cnt.open()
+        cnt.set('utt-1', data)
+        cnt.close()
+
+        reader = containers.FeatureContainer(path)
+
+        with reader.open_pooled():
+            assert np.allclose(reader.get('utt-1', mem_map=False), data, atol=1e-3)
+            assert np.allclose(reader.get_many(['utt-1'])[0], data, atol=1e-3)
+
+        containers.default_handle_pool().discard(path)
+
+    def test_close_within_open_pooled_releases_handle(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio.hdf5')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+        cnt.set('track', np.zeros(10, dtype=np.float32), 16000)
+        cnt.close()
+
+        other = containers.AudioContainer(path)
+
+        with other.open_pooled():
+            with cnt.open_pooled():
+                cnt.close()
+                assert not cnt.is_open()
+
+            assert other.keys() == ['track']
+
+        containers.default_handle_pool().discard(path)
@@ -0,0 +1,211 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate.feeding import partitioning
+
+
+@pytest.fixture()
+def ragged_path(tmpdir):
+    return os.path.join(tmpdir.strpath, 'data.bin')
+
+
+class TestRaggedContainer:
+
+    def test_set_and_get(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+
+        cnt.set('utt-1', np.arange(20, dtype=np.float32).reshape(5, 4))
+        cnt.set('utt-2', np.arange(3, dtype=np.int16))
+
+        assert cnt.keys() == ['utt-1', 'utt-2']
+        assert np.array_equal(cnt.get('utt-1'), np.arange(20).reshape(5, 4))
+        assert cnt.get('utt-1').dtype == np.float32
+        assert np.array_equal(cnt.get('utt-2', mem_map=False), [0, 1, 2])
+        assert cnt.get('utt-3') is None
+
+        cnt.close()
+
+    def test_get_returns_read_only_view(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.zeros((5, 4)))
+
+        assert not cnt.get('utt-1').flags.writeable
+        assert cnt.get('utt-1', mem_map=False).flags.writeable
+
+        cnt.close()
+
+    def test_data_is_stored(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(20).reshape(5, 4))
+        cnt.attrs['frame-size'] = 400
+        cnt.close()
+
+        cnt = containers.RaggedContainer(ragged_path, mode='r')
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1']
+        assert np.array_equal(cnt.get('utt-1'), np.arange(20).reshape(5, 4))
+        assert cnt.attrs == {'frame-size': 400}
+
+        with pytest.raises(ValueError):
+            cnt.set('utt-2', np.arange(3))
+
+        cnt.close()
+
+    def test_set_overwrites_existing_data(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(20).reshape(5, 4))
+        cnt.set('utt-1', np.ones(3))
+
+        assert np.array_equal(cnt.get('utt-1'), np.ones(3))
+
+        cnt.close()
+
+    def test_remove(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(20).reshape(5, 4))
+        cnt.set('utt-2', np.arange(3))
+        cnt.remove('utt-1')
+
+        assert cnt.keys() == ['utt-2']
+        assert 'utt-1' not in cnt
+
+        cnt.close()
+        cnt.open()
+
+        assert cnt.keys() == ['utt-2']
+
+        cnt.close()
+
+    def test_append(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+
+        data = np.arange(100, dtype=np.float32).reshape(20, 5)
+
+        cnt.append('utt-1', data[:8])
+        cnt.append('utt-2', data[:2])
+        cnt.append('utt-1', data[8:12])
+        cnt.append('utt-1', data[12:])
+
+        assert np.array_equal(cnt.get('utt-1'), data)
+        assert np.array_equal(cnt.get('utt-2'), data[:2])
+        assert cnt.get_shape('utt-1') == (20, 5)
+
+        cnt.close()
+
+    def test_append_with_different_dimension_raises_error(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.append('utt-1', np.arange(20).reshape(5, 2, 2))
+
+        with pytest.raises(ValueError):
+            cnt.append('utt-1', np.arange(42).reshape(7, 2, 3))
+
+        cnt.close()
+
+    def test_buffered_append(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+
+        with cnt.buffered_append():
+            for index in range(5):
+                cnt.append('utt-1', np.full((2, 3), index))
+                cnt.append('utt-2', np.full(4, index))
+
+        assert cnt.get_shape('utt-1') == (10, 3)
+        assert np.array_equal(cnt.get('utt-2'), np.repeat(np.arange(5), 4))
+
+        cnt.close()
+
+    def test_declare(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+
+        cnt.declare('utt-1', (2,), dtype=np.int16)
+
+        assert cnt.keys() == ['utt-1']
+        assert cnt.get_shape('utt-1') == (0, 2)
+
+        cnt.append('utt-1', np.arange(6).reshape(3, 2))
+        cnt.close()
+
+        cnt.open(mode='r')
+
+        assert cnt.get('utt-1').dtype == np.int16
+        assert np.array_equal(cnt.get('utt-1'), np.arange(6).reshape(3, 2))
+
+        with pytest.raises(ValueError):
+            cnt.declare('utt-2', (2,))
+
+        cnt.close()
+
+    def test_swmr_is_not_supported(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(4))
+
+        with pytest.raises(ValueError):
+            cnt.start_swmr()
+
+        with pytest.raises(ValueError):
+            cnt.publish('utt-1')
+
+        assert cnt.refresh() == []
+
+        cnt.close()
+
+    def test_get_many_contiguous(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(10).reshape(5, 2))
+        cnt.set('utt-2', np.arange(4).reshape(2, 2))
+
+        data, offsets = cnt.get_many(['utt-2', 'utt-1'], contiguous=True)
+
+        assert offsets.tolist() == [0, 2, 7]
+        assert np.array_equal(data[:2], np.arange(4).reshape(2, 2))
+        assert np.array_equal(data[2:], np.arange(10).reshape(5, 2))
+
+        cnt.close()
+
+    def test_from_container(self, tmpdir, ragged_path):
+        source = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'features.hdf5'))
+        source.open()
+        source.frame_size = 400
+        source.set('utt-1', np.arange(20, dtype=np.float32).reshape(5, 4))
+        source.set('utt-2', np.arange(8, dtype=np.float32).reshape(2, 4))
+        source.close()
+
+        target = containers.RaggedContainer.from_container(source, ragged_path, batch_size=1)
+        target.open()
+
+        assert target.keys() == ['utt-1', 'utt-2']
+        assert np.array_equal(target.get('utt-2'), np.arange(8).reshape(2, 4))
+        assert target.attrs['frame-size'] == 400
+        assert not source.is_open()
+
+        target.close()
+
+    def test_partitioning_loader(self, ragged_path):
+        cnt = containers.RaggedContainer(ragged_path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(12, dtype=np.float32).reshape(6, 2))
+        cnt.set('utt-2', np.arange(4, dtype=np.float32).reshape(2, 2))
+
+        loader = partitioning.PartitioningContainerLoader(['utt-1', 'utt-2'], cnt, '1000', shuffle=False)
+        partition = loader.load_partition_data(0)
+
+        assert partition.info.utt_ids == ['utt-1', 'utt-2']
+        assert partition.info.utt_lengths == [(6,), (2,)]
+        assert np.array_equal(partition.utt_data[1][0], np.arange(4).reshape(2, 2))
+
+        cnt.close()
@@ -0,0 +1,167 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate import tracks
+from audiomate.containers import container
+from audiomate.containers import index
+from audiomate.feeding import partitioning
+
+
+def test_shard_path():
+    assert container.shard_path('utt-1', 0) == 'utt-1'
+    assert container.shard_path('utt-1', 2) == '2a/f4/utt-1'
+    assert container.shard_path('a/b', 1).endswith('/a/b')
+
+
+class TestShardedContainer:
+
+    def test_set_get_and_keys(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path, shard_levels=2)
+        cnt.open()
+
+        cnt.set('utt-1', np.arange(10))
+        cnt.append('utt-2', np.ones((2, 3)))
+        cnt.append('utt-2', np.ones((4, 3)))
+
+        assert cnt.keys() == ['utt-1', 'utt-2']
+        assert np.array_equal(cnt.get('utt-1', mem_map=False), np.arange(10))
+        assert cnt.get('utt-2').shape == (6, 3)
+        assert '2a/f4/utt-1' in cnt._file
+        assert 'utt-1' not in cnt._file
+
+        cnt.remove('utt-1')
+
+        assert cnt.keys() == ['utt-2']
+        assert cnt.get('utt-1') is None
+
+        cnt.close()
+
+    def test_layout_is_read_from_file(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path, shard_levels=1)
+        cnt.open()
+        cnt.set('utt-1', np.arange(10))
+        cnt.close()
+
+        cnt = containers.Container(path)
+        cnt.open()
+
+        assert cnt.shard_levels == 1
+        assert np.array_equal(cnt.get('utt-1', mem_map=False), np.arange(10))
+        assert cnt.get_many(['utt-1'])[0].shape == (10,)
+
+        cnt.close()
+
+    def test_flat_container_without_attribute(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+
+        with h5py.File(path, 'w') as f:
+            f.create_dataset('utt-1', data=np.arange(5))
+
+        cnt = containers.Container(path)
+        cnt.open()
+
+        assert cnt.shard_levels == 0
+        assert cnt.keys() == ['utt-1']
+
+        cnt.close()
+
+    def test_change_layout_of_container_with_data_raises_error(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.set('utt-1', np.arange(10))
+        cnt.close()
+
+        with pytest.raises(ValueError):
+            containers.Container(path, shard_levels=2).open()
+
+    def test_change_layout_of_container_with_published_keys_only(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+
+        with h5py.File(path, 'w') as f:
+            f.create_dataset(index.PUBLISHED_DATASET, data=np.zeros(0, dtype=np.uint8))
+
+        cnt = containers.Container(path, shard_levels=2)
+        cnt.open()
+        cnt.set('utt-1', np.arange(10))
+        cnt.close()
+
+        cnt = containers.Container(path)
+        cnt.open()
+
+        assert cnt.shard_levels == 2
+        assert cnt.keys() == ['utt-1']
+
+        cnt.close()
+
+    def test_index_is_scanned_with_shards(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.Container(path, shard_levels=2)
+        cnt.open()
+        cnt.set('utt-1', np.arange(10))
+        cnt.set('utt-2', np.arange(3))
+        cnt.close()
+
+        with h5py.File(path, 'a') as f:
+            del f[index.INDEX_GROUP]
+
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1', 'utt-2']
+        assert cnt.get_shape('utt-2') == (3,)
+
+        cnt.close()
+
+    def test_audio_container(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio')
+        cnt = containers.AudioContainer(path, shard_levels=2)
+        cnt.open()
+        cnt.append('track', np.zeros(100, dtype=np.float32), 16000)
+        cnt.append('track', np.zeros(50, dtype=np.float32), 16000)
+        cnt.close()
+
+        track = tracks.ContainerTrack('track', containers.AudioContainer(path))
+
+        assert track.sampling_rate == 16000
+        assert track.num_samples == 150
+        assert track.read_samples().shape == (150,)
+
+        containers.default_handle_pool().discard(path)
+
+    @pytest.mark.parametrize('use_container', [True, False])
+    def test_partitioning_feature_iterator(self, tmpdir, use_container):
+        path = os.path.join(tmpdir.strpath, 'features')
+        data = {
+            'utt-1': np.arange(10, dtype=np.float32).reshape(5, 2),
+            'utt-2': np.arange(6, dtype=np.float32).reshape(3, 2)
+        }
+
+        cnt = containers.FeatureContainer(path, shard_levels=2)
+        cnt.open()
+
+        for key, value in data.items():
+            cnt.set(key, value)
+
+        cnt.close()
+
+        if use_container:
+            source = containers.FeatureContainer(path, mode='r')
+            source.open()
+        else:
+            source = h5py.File(path, 'r')
+
+        features = list(partitioning.PartitioningFeatureIterator(source, 1000, shuffle=False))
+        source.close()
+
+        expected = [('utt-1', i) for i in range(5)] + [('utt-2', i) for i in range(3)]
+
+        assert [(key, idx) for key, idx, _ in features] == expected
+
+        for key, idx, feature in features:
+            assert np.array_equal(feature, data[key][idx])
@@ -0,0 +1,297 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate.containers import storage
+from audiomate.feeding import partitioning
+
+
+class TestStorageOptions:
+
+    def test_dataset_kwargs_default(self):
+        assert storage.StorageOptions().dataset_kwargs((10, 5)) == {}
+
+    def test_dataset_kwargs_default_growable(self):
+        kwargs = storage.StorageOptions().dataset_kwargs((10, 5), growable=True)
+
+        assert kwargs == {'chunks': True, 'maxshape': (None, 5)}
+
+    def test_dataset_kwargs_with_compression(self):
+        options = storage.StorageOptions(compression='gzip', compression_level=4, shuffle=True)
+
+        assert options.dataset_kwargs((10, 5)) == {
+            'compression': 'gzip',
+            'compression_opts': 4,
+            'shuffle': True
+        }
+
+    def test_dataset_kwargs_with_chunk_shape_larger_than_data(self):
+        options = storage.StorageOptions(chunk_shape=(100, 10))
+
+        assert options.dataset_kwargs((10, 5)) == {'chunks': (10, 5)}
+        assert options.dataset_kwargs((10, 5), growable=True) == {'chunks': (100, 5), 'maxshape': (None, 5)}
+
+    def test_dataset_kwargs_with_frames_per_chunk(self):
+        options = storage.StorageOptions(frames_per_chunk=8)
+
+        assert options.dataset_kwargs((10, 5)) == {'chunks': (8, 5)}
+        assert options.dataset_kwargs((4, 5)) == {'chunks': (4, 5)}
+
+    def test_dataset_kwargs_for_scalar(self):
+        options = storage.StorageOptions(compression='gzip', frames_per_chunk=8)
+
+        assert options.dataset_kwargs(()) == {}
+
+    def test_write_and_read_attrs(self, tmpdir):
+        options = storage.StorageOptions(compression='gzip', compression_level=4, shuffle=True,
+                                         chunk_shape=(20, 5), frames_per_chunk=10,
+                                         dtype='int8', scale_per='dimension')
+
+        with h5py.File(os.path.join(tmpdir.strpath, 'file.hdf5'), 'w') as f:
+            options.write_attrs(f.attrs)
+            assert storage.StorageOptions.read_attrs(f.attrs) == options
+
+            storage.StorageOptions().write_attrs(f.attrs)
+            assert len(f.attrs) == 0
+
+    def test_invalid_dtype_raises_error(self):
+        with pytest.raises(ValueError):
+            storage.StorageOptions(dtype='int32')
+
+        with pytest.raises(ValueError):
+            storage.StorageOptions(dtype='int16', scale_per='frame')
+
+    def test_encode_float16(self):
+        data = np.random.random((10, 3))
+        encoded, attrs = storage.StorageOptions(dtype='float16').encode(data)
+
+        assert encoded.dtype == np.float16
+        assert attrs == {storage.DECODED_DTYPE_ATTR: 'float32'}
+        assert storage.decode(encoded, attrs).dtype == np.float32
+
+    def test_encode_int_per_dimension(self):
+        data = np.random.random((10, 3)) * [1, 100, 1000] - 5
+        encoded, attrs = storage.StorageOptions(dtype='int16', scale_per='dimension').encode(data)
+
+        assert encoded.dtype == np.int16
+        assert attrs[storage.SCALE_ATTR].shape == (3,)
+        assert np.allclose(storage.decode(encoded, attrs), data, atol=np.max(attrs[storage.SCALE_ATTR]))
+
+    def test_encode_int_with_constant_data(self):
+        data = np.full((4, 2), 3.0)
+        encoded, attrs = storage.StorageOptions(dtype='int8').encode(data)
+
+        assert np.array_equal(storage.decode(encoded, attrs), data)
+
+    def test_widen_range(self):
+        data = np.array([[0.0, 1.0], [1.0, 0.0]])
+        encoded, attrs = storage.StorageOptions(dtype='int8').encode(data)
+
+        assert storage.widen_range(np.array([[0.5, 1.0]]), encoded.dtype, attrs) is None
+
+        widened = storage.widen_range(np.array([[100.0, -1.0]]), encoded.dtype, attrs)
+
+        assert widened[storage.DECODED_DTYPE_ATTR] == attrs[storage.DECODED_DTYPE_ATTR]
+        assert widened[storage.OFFSET_ATTR] - 127 * widened[storage.SCALE_ATTR] == pytest.approx(-1.0)
+        assert widened[storage.OFFSET_ATTR] + 127 * widened[storage.SCALE_ATTR] == pytest.approx(100.0)
+
+    def test_encode_ignores_non_float_data(self):
+        data = np.arange(10)
+
+        assert storage.StorageOptions(dtype='int8').encode(data) == (data, {})
+
+
+class TestContainerStorage:
+
+    def test_set_uses_container_options(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        options = containers.StorageOptions(compression='gzip', frames_per_chunk=4)
+        cnt = containers.FeatureContainer(path, storage=options)
+        cnt.open()
+
+        data = np.random.random((10, 5)).astype(np.float32)
+        cnt.set('utt-1', data)
+
+        assert cnt._file['utt-1'].compression == 'gzip'
+        assert cnt._file['utt-1'].chunks == (4, 5)
+        assert np.array_equal(cnt.get('utt-1', mem_map=False), data)
+
+        cnt.close()
+
+    def test_options_are_stored_in_container(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        options = containers.StorageOptions(compression='lzf', shuffle=True)
+
+        cnt = containers.Container(path, storage=options)
+        cnt.open()
+        cnt.close()
+
+        cnt = containers.Container(path)
+        cnt.open()
+        cnt.append('utt-1', np.ones((3, 2)))
+
+        assert cnt.storage == options
+        assert cnt._file['utt-1'].compression == 'lzf'
+        assert cnt._file['utt-1'].shuffle
+
+        cnt.close()
+
+    def test_set_with_options_per_call(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio')
+        cnt = containers.AudioContainer(path)
+        cnt.open()
+
+        options = containers.StorageOptions(compression='gzip', compression_level=9)
+        cnt.set('track1', np.zeros(100, dtype=np.float32), 16000, storage=options)
+        cnt.set('track2', np.zeros(100, dtype=np.float32), 16000)
+
+        assert cnt._file['track1'].compression == 'gzip'
+        assert cnt._file['track1'].compression_opts == 9
+        assert cnt._file['track2'].compression is None
+        assert cnt.get_sampling_rate('track1') == 16000
+
+        cnt.close()
+
+    @pytest.mark.parametrize('buffered', [False, True])
+    def test_append_with_options(self, tmpdir, buffered):
+        path = os.path.join(tmpdir.strpath, 'container')
+        options = containers.StorageOptions(compression='gzip', frames_per_chunk=16)
+        cnt = containers.Container(path, storage=options)
+        cnt.open()
+
+        data = np.random.random((20, 5))
+
+        if buffered:
+            with cnt.buffered_append():
+                cnt.append('utt-1', data[:5])
+                cnt.append('utt-1', data[5:])
+        else:
+            cnt.append('utt-1', data[:5])
+            cnt.append('utt-1', data[5:])
+
+        assert cnt._file['utt-1'].compression == 'gzip'
+        assert cnt._file['utt-1'].chunks == (16, 5)
+        assert np.array_equal(cnt.get('utt-1', mem_map=False), data)
+
+        cnt.close()
+
+    def test_partitioning_loader_reads_compressed_container(self, tmpdir):
+        options = containers.StorageOptions(compression='gzip', shuffle=True, frames_per_chunk=2)
+        cnt = containers.Container(os.path.join(tmpdir.strpath, 'c1.h5'), storage=options)
+        cnt.open()
+
+        data = {
+            'utt-1': np.random.random((6, 6)).astype(np.float32),
+            'utt-2': np.random.random((2, 6)).astype(np.float32)
+        }
+
+        for key, value in data.items():
+            cnt.set(key, value)
+
+        loader = partitioning.PartitioningContainerLoader(['utt-1', 'utt-2'], cnt, '1000', shuffle=False)
+        partition = loader.load_partition_data(0)
+
+        assert len(partition.utt_data) == 2
+
+        for utt_id, utt_data in zip(partition.info.utt_ids, partition.utt_data):
+            assert np.array_equal(utt_data[0], data[utt_id])
+
+        cnt.close()
+
+    @pytest.mark.parametrize('dtype,scale_per', [
+        ('float16', 'key'),
+        ('int16', 'key'),
+        ('int8', 'dimension'),
+    ])
+    def test_set_and_get_quantized(self, tmpdir, dtype, scale_per):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.FeatureContainer(path, storage=containers.StorageOptions(dtype=dtype, scale_per=scale_per))
+        cnt.open()
+
+        data = np.random.random((20, 4)) * [1, 10, 100, 1000]
+        cnt.set('utt-1', data)
+        cnt.close()
+
+        cnt = containers.FeatureContainer(path)
+        cnt.open()
+
+        tolerance = 1000 / np.iinfo(np.int8).max if dtype == 'int8' else 1.0
+
+        assert cnt._file['utt-1'].dtype == np.dtype(dtype)
+        assert cnt.get('utt-1', mem_map=False).dtype == np.float32
+        assert np.allclose(cnt.get('utt-1', mem_map=False), data, rtol=1e-2, atol=tolerance)
+        assert np.allclose(cnt.get('utt-1')[2:5, 1:3], data[2:5, 1:3], rtol=1e-2, atol=tolerance)
+        assert np.allclose(cnt.get_many(['utt-1'])[0], data, rtol=1e-2, atol=tolerance)
+        assert cnt.index.dtype('utt-1') == np.float32
+
+        cnt.close()
+
+    def test_append_quantized(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.FeatureContainer(path, storage=containers.StorageOptions(dtype='int16'))
+        cnt.open()
+
+        cnt.append('utt-1', np.array([[0.0, 1.0], [2.0, 3.0]]))
+        cnt.append('utt-1', np.array([[1.5, 2.5]]))
+
+        assert np.allclose(cnt.get('utt-1', mem_map=False), [[0.0, 1.0], [2.0, 3.0], [1.5, 2.5]], atol=1e-3)
+
+        cnt.close()
+
+    @pytest.mark.parametrize('scale_per', ['key', 'dimension'])
+    def test_append_quantized_out_of_range_rescales_existing_data(self, tmpdir, scale_per):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.FeatureContainer(path, storage=containers.StorageOptions(dtype='int16', scale_per=scale_per))
+        cnt.open()
+
+        cnt.append('utt-1', np.array([[0.0, 1.0], [1.0, 0.0]]))
+        cnt.append('utt-1', np.array([[100.0, 100.0]]))
+        cnt.append('utt-1', np.array([[-50.0, 0.5]]))
+
+        expected = [[0.0, 1.0], [1.0, 0.0], [100.0, 100.0], [-50.0, 0.5]]
+        assert np.allclose(cnt.get('utt-1', mem_map=False), expected, atol=0.01)
+
+        cnt.close()
+
+    def test_buffered_append_quantized_out_of_range(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'container')
+        cnt = containers.FeatureContainer(path, storage=containers.StorageOptions(dtype='int16'))
+        cnt.open()
+
+        with cnt.buffered_append():
+            cnt.append('utt-1', np.array([[0.0, 1.0]]))
+            cnt.flush()
+            cnt.append('utt-1', np.array([[100.0, -3.0]]))
+
+        assert np.allclose(cnt.get('utt-1', mem_map=False), [[0.0, 1.0], [100.0, -3.0]], atol=0.01)
+
+        cnt.close()
+
+    def test_partitioning_loader_uses_size_in_memory(self, tmpdir):
+        options = containers.StorageOptions(dtype='int8')
+        cnt = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'c1.h5'), storage=options)
+        cnt.open()
+
+        data = {
+            'utt-1': np.random.random((10, 5)),
+            'utt-2': np.random.random((10, 5))
+        }
+
+        for key, value in data.items():
+            cnt.set(key, value)
+
+        assert cnt._file['utt-1'].nbytes == 50
+
+        loader = partitioning.PartitioningContainerLoader(['utt-1', 'utt-2'], cnt, '250', shuffle=False)
+
+        assert len(loader.partitions) == 2
+
+        data_read, offsets = cnt.get_many(['utt-1', 'utt-2'], contiguous=True)
+
+        assert data_read.dtype == np.float32
+        assert np.allclose(data_read[offsets[1]:], data['utt-2'], atol=0.01)
+
+        cnt.close()
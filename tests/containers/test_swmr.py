@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate.containers import index
+from audiomate.feeding import partitioning
+
+
+@pytest.fixture()
+def writer(tmpdir):
+    cnt = containers.FeatureContainer(os.path.join(tmpdir.strpath, 'features.hdf5'), swmr=True)
+    cnt.open()
+    cnt.frame_size = 400
+
+    for key in ['utt-1', 'utt-2', 'utt-3']:
+        cnt.declare(key, row_shape=(3,))
+
+    yield cnt
+    cnt.close()
+
+
+class TestSWMR:
+
+    def test_reader_sees_published_keys(self, writer):
+        writer.start_swmr()
+        writer.append('utt-1', np.ones((4, 3)))
+        writer.publish('utt-1')
+
+        reader = containers.FeatureContainer(writer.path, mode='r', swmr=True)
+        reader.open()
+
+        assert reader.keys() == ['utt-1']
+        assert reader.frame_size == 400
+        assert reader.get('utt-2') is None
+        assert np.array_equal(reader.get('utt-1', mem_map=False), np.ones((4, 3)))
+
+        writer.append('utt-2', np.zeros((2, 3)))
+        writer.append('utt-2', np.zeros((3, 3)))
+        writer.append('utt-3', np.zeros((1, 3)))
+        writer.publish('utt-2')
+
+        assert reader.keys() == ['utt-1']
+        assert reader.refresh() == ['utt-2']
+        assert reader.keys() == ['utt-1', 'utt-2']
+        assert reader.get_shape('utt-2') == (5, 3)
+        assert reader.get_many(['utt-2'])[0].shape == (5, 3)
+        assert reader.refresh() == []
+
+        reader.close()
+
+    def test_partitioning_loader_reads_published_keys(self, writer):
+        writer.start_swmr()
+        writer.append('utt-1', np.ones((4, 3), dtype=np.float32))
+        writer.publish('utt-1')
+
+        reader = containers.FeatureContainer(writer.path, mode='r', swmr=True)
+        reader.open()
+
+        loader = partitioning.PartitioningContainerLoader(reader.keys(), reader, '1000', shuffle=False)
+        partition = loader.load_partition_data(0)
+
+        assert partition.info.utt_ids == ['utt-1']
+        assert np.array_equal(partition.utt_data[0][0], np.ones((4, 3)))
+
+        reader.close()
+
+    def test_structural_changes_raise_error_in_swmr_mode(self, writer):
+        writer.start_swmr()
+
+        with pytest.raises(ValueError):
+            writer.set('utt-4', np.ones(3))
+
+        with pytest.raises(ValueError):
+            writer.append('utt-4', np.ones((1, 3)))
+
+        with pytest.raises(ValueError):
+            writer.remove('utt-1')
+
+        with pytest.raises(ValueError):
+            writer.declare('utt-4', row_shape=(3,))
+
+    def test_publish_requires_swmr_mode(self, writer):
+        writer.append('utt-1', np.ones((1, 3)))
+
+        with pytest.raises(ValueError):
+            writer.publish('utt-1')
+
+    def test_start_swmr_requires_swmr_container(self, tmpdir):
+        cnt = containers.Container(os.path.join(tmpdir.strpath, 'container'))
+        cnt.open()
+
+        with pytest.raises(ValueError):
+            cnt.start_swmr()
+
+        cnt.close()
+
+    def test_open_after_writer_closed(self, writer):
+        writer.start_swmr()
+        writer.append('utt-1', np.ones((4, 3)))
+        writer.publish('utt-1')
+        writer.close()
+
+        cnt = containers.FeatureContainer(writer.path, mode='r')
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1', 'utt-2', 'utt-3']
+        assert cnt.get_shape('utt-1') == (4, 3)
+
+        cnt.close()
+
+        cnt = containers.FeatureContainer(writer.path, swmr=True, mode='r')
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1']
+
+        cnt.close()
+
+    def test_changes_without_swmr_remove_published_keys(self, writer):
+        writer.start_swmr()
+        writer.append('utt-1', np.ones((4, 3)))
+        writer.publish('utt-1')
+        writer.close()
+
+        cnt = containers.FeatureContainer(writer.path)
+        cnt.open()
+        cnt.remove('utt-3')
+
+        assert index.PUBLISHED_DATASET not in cnt._file
+
+        cnt.close()
@@ -0,0 +1,145 @@
+import os
+
+import numpy as np
+import pytest
+
+from audiomate import containers
+from audiomate import feeding
+
+
+def create_part(path, data, frame_size=400, hop_size=160, sampling_rate=16000):
+    cnt = containers.FeatureContainer(path)
+    cnt.open()
+    cnt.frame_size = frame_size
+    cnt.hop_size = hop_size
+    cnt.sampling_rate = sampling_rate
+
+    for key, value in data.items():
+        cnt.set(key, value)
+
+    cnt.close()
+
+
+@pytest.fixture()
+def part_paths(tmpdir):
+    path_a = os.path.join(tmpdir.strpath, 'features-a.hdf5')
+    path_b = os.path.join(tmpdir.strpath, 'features-b.hdf5')
+
+    create_part(path_a, {
+        'utt-1': np.arange(20, dtype=np.float32).reshape(5, 4),
+        'utt-3': np.arange(12, dtype=np.float32).reshape(3, 4)
+    })
+    create_part(path_b, {
+        'utt-2': np.arange(8, dtype=np.float32).reshape(2, 4)
+    })
+
+    return [path_a, path_b]
+
+
+class TestVirtualFeatureContainer:
+
+    def test_keys_and_get(self, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        cnt.open()
+
+        assert cnt.keys() == ['utt-1', 'utt-2', 'utt-3']
+        assert np.array_equal(cnt.get('utt-2', mem_map=False), np.arange(8).reshape(2, 4))
+        assert cnt.get('utt-4') is None
+        assert cnt.get_shape('utt-3') == (3, 4)
+        assert cnt.frame_size == 400
+        assert cnt.hop_size == 160
+        assert cnt.sampling_rate == 16000
+
+        cnt.close()
+
+    def test_get_many(self, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        cnt.open()
+
+        data = cnt.get_many(['utt-2', 'utt-1'])
+        assert np.array_equal(data[0], np.arange(8).reshape(2, 4))
+        assert np.array_equal(data[1], np.arange(20).reshape(5, 4))
+
+        data, offsets = cnt.get_many(['utt-2', 'utt-1'], contiguous=True)
+        assert data.shape == (7, 4)
+        assert offsets.tolist() == [0, 2, 7]
+
+        cnt.close()
+
+    def test_from_glob(self, tmpdir, part_paths):
+        cnt = containers.VirtualFeatureContainer.from_glob(os.path.join(tmpdir.strpath, 'features-*.hdf5'))
+        assert cnt.paths == part_paths
+
+    def test_from_manifest(self, tmpdir, part_paths):
+        manifest_path = os.path.join(tmpdir.strpath, 'manifest.txt')
+
+        with open(manifest_path, 'w') as f:
+            f.write('features-b.hdf5\n\nfeatures-a.hdf5\n')
+
+        cnt = containers.VirtualFeatureContainer.from_manifest(manifest_path)
+        assert cnt.paths == [part_paths[1], part_paths[0]]
+
+    def test_inconsistent_attributes_raise_error(self, tmpdir, part_paths):
+        path_c = os.path.join(tmpdir.strpath, 'features-c.hdf5')
+        create_part(path_c, {'utt-5': np.zeros((2, 4))}, hop_size=200)
+
+        cnt = containers.VirtualFeatureContainer(part_paths + [path_c])
+
+        with pytest.raises(ValueError):
+            cnt.open()
+
+        assert not cnt.is_open()
+
+    def test_duplicate_key_raises_error(self, tmpdir, part_paths):
+        path_c = os.path.join(tmpdir.strpath, 'features-c.hdf5')
+        create_part(path_c, {'utt-1': np.zeros((2, 4))})
+
+        with pytest.raises(ValueError):
+            containers.VirtualFeatureContainer(part_paths + [path_c]).open()
+
+    def test_write_raises_error(self, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        cnt.open()
+
+        with pytest.raises(ValueError):
+            cnt.set('utt-5', np.zeros(3))
+
+        cnt.close()
+
+    def test_materialize(self, tmpdir, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        merged = cnt.materialize(os.path.join(tmpdir.strpath, 'merged.hdf5'))
+
+        merged.open()
+
+        assert merged.keys() == ['utt-1', 'utt-2', 'utt-3']
+        assert np.array_equal(merged.get('utt-1', mem_map=False), np.arange(20).reshape(5, 4))
+        assert np.array_equal(merged.get_many(['utt-3'])[0], np.arange(12).reshape(3, 4))
+        assert merged.hop_size == 160
+        assert merged._file['utt-1'].is_virtual
+
+        merged.close()
+
+    def test_utterance_dataset(self, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        cnt.open()
+
+        ds = feeding.UtteranceDataset(['utt-1', 'utt-2', 'utt-3'], cnt, pad=True)
+
+        assert len(ds) == 3
+        assert ds[1][0].shape == (5, 4)
+        assert ds.longest_utterances_per_container() == [5]
+
+        cnt.close()
+
+    def test_multi_frame_iterator(self, part_paths):
+        cnt = containers.VirtualFeatureContainer(part_paths)
+        cnt.open()
+
+        it = feeding.MultiFrameIterator(['utt-1', 'utt-2', 'utt-3'], cnt, '1000', 2, shuffle=False)
+        chunks = list(it)
+
+        assert len(chunks) == 6
+        assert np.array_equal(chunks[0][0], np.arange(8).reshape(2, 4))
+
+        cnt.close()
@@ -1,9 +1,13 @@
 import os
 
+import numpy as np
 import pytest
 
+import audiomate
 from audiomate import issuers
+from audiomate import tracks
 from audiomate.corpus import io
+from audiomate.utils import audio
 from audiomate.utils import jsonfile
 
 from tests import resources
@@ -172,6 +176,48 @@ class TestDefaultWriter:
                                                                                        file_3_path,
                                                                                        file_4_path)
 
+    def test_save_track_info(self, writer, sample_corpus, tmpdir):
+        sample_corpus.tracks['wav_2'].info = tracks.FileInfo(16000, 1, 2.5951875, 83072, 1584.25)
+        sample_corpus.tracks['wav-1'].info = tracks.FileInfo(8000, 2, 1.5, 1200, 1234.5)
+
+        writer.save(sample_corpus, tmpdir.strpath)
+
+        with open(os.path.join(tmpdir.strpath, 'track_info.txt'), 'r') as f:
+            file_content = f.read()
+
+        # Tracks without cached info are not written
+        assert file_content.strip() == 'wav-1 8000 2 1.5 1200 1234.5\n' \
+                                       'wav_2 16000 1 2.5951875 83072 1584.25'
+
+    def test_save_and_load_track_info(self, writer, sample_corpus, tmpdir):
+        for track in sample_corpus.tracks.values():
+            assert track.duration > 0
+
+        writer.save(sample_corpus, tmpdir.strpath)
+        loaded = io.DefaultReader().load(tmpdir.strpath)
+
+        for track_idx, track in sample_corpus.tracks.items():
+            assert loaded.tracks[track_idx].has_info()
+            assert loaded.tracks[track_idx].info == track.info
+
+    def test_load_track_info_ignores_changed_files(self, writer, tmpdir):
+        wav_path = os.path.join(tmpdir.strpath, 'a.wav')
+        audio.write_wav(wav_path, np.zeros(100, dtype=np.float32))
+
+        corpus = audiomate.Corpus()
+        track = corpus.new_file(wav_path, 'a')
+        assert track.num_samples == 100
+
+        out_path = os.path.join(tmpdir.strpath, 'corpus')
+        os.makedirs(out_path)
+        writer.save(corpus, out_path)
+
+        audio.write_wav(wav_path, np.zeros(200, dtype=np.float32))
+        loaded = io.DefaultReader().load(out_path)
+
+        assert not loaded.tracks['a'].has_info()
+        assert loaded.tracks['a'].num_samples == 200
+
     def test_save_container_tracks(self, writer, tmpdir):
         # make sure relative path changes in contrast to self.ds.path
         out_path = os.path.join(tmpdir.strpath, 'somesubdir')
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 import audiomate
@@ -66,6 +67,65 @@ class TestCorpusView:
         assert stats['utt-3'].var == pytest.approx(0.017659103)
         assert stats['utt-3'].num == 24000
 
+    def test_read_utterance_samples(self, ds):
+        result = list(ds.read_utterance_samples())
+
+        assert [utt.idx for utt, _ in result] == ['utt-1', 'utt-2', 'utt-3', 'utt-4', 'utt-5',
+                                                  'utt-6', 'utt-7', 'utt-8']
+
+        for utterance, samples in result:
+            assert np.array_equal(samples, utterance.read_samples())
+
+    def test_read_utterance_samples_reads_every_track_once(self, ds, monkeypatch):
+        read_calls = []
+        original_read = tracks.FileTrack.read_samples
+
+        def read_samples(track, *args, **kwargs):
+            read_calls.append(track.idx)
+            return original_read(track, *args, **kwargs)
+
+        monkeypatch.setattr(tracks.FileTrack, 'read_samples', read_samples)
+
+        result = list(ds.read_utterance_samples())
+
+        assert len(result) == 8
+        assert sorted(read_calls) == ['wav-1', 'wav_2', 'wav_3', 'wav_4']
+
+    def test_read_utterance_samples_with_max_buffer_size(self, ds, monkeypatch):
+        read_calls = []
+        original_read = tracks.FileTrack.read_samples
+
+        def read_samples(track, *args, **kwargs):
+            read_calls.append(track.idx)
+            return original_read(track, *args, **kwargs)
+
+        monkeypatch.setattr(tracks.FileTrack, 'read_samples', read_samples)
+
+        # 30 seconds of samples at 16kHz as float32
+        result = list(ds.read_utterance_samples(max_buffer_size=30 * 16000 * 4))
+
+        assert sorted(read_calls) == ['wav-1', 'wav_2', 'wav_3', 'wav_3', 'wav_4', 'wav_4']
+
+        for utterance, samples in result:
+            assert np.array_equal(samples, original_read(utterance.track,
+                                                         offset=utterance.start,
+                                                         duration=utterance.end - utterance.start
+                                                         if utterance.end != float('inf') else None))
+
+    def test_read_utterance_samples_of_utterances(self, ds):
+        utterance_ids = ['utt-5', 'utt-1', 'utt-4', 'utt-2']
+        result = list(ds.read_utterance_samples(utterance_ids=utterance_ids))
+        expected = [utt.idx for utt, _ in ds.read_utterance_samples() if utt.idx in utterance_ids]
+
+        assert [utt.idx for utt, _ in result] == expected
+        assert len(expected) == 4
+
+    def test_read_utterance_samples_with_resampling(self):
+        corpus = resources.create_dataset()
+
+        for utterance, samples in corpus.read_utterance_samples(sr=8000):
+            assert np.array_equal(samples, utterance.read_samples(sr=8000))
+
     def test_label_duration(self, ds):
         durations = ds.label_durations()
 
@@ -2,6 +2,7 @@ import os
 
 import numpy as np
 import pytest
+import soundfile as sf
 
 import audiomate
 from audiomate import tracks
@@ -625,6 +626,27 @@ class TestCorpus:
 
         cont.close()
 
+    def test_relocate_audio_to_single_container_copies_pcm_samples(self, tmpdir):
+        corpus = audiomate.Corpus.load(resources.sample_corpus_path('default'))
+        wav_path = corpus.tracks['file-1'].path
+        source_container = corpus.tracks['file-5'].container
+        expected_wav, _ = sf.read(wav_path, dtype='int16')
+
+        with source_container.open_pooled() as cnt:
+            expected_container, _ = cnt.get_raw('file-5', mem_map=False)
+
+        target_container_path = os.path.join(tmpdir.strpath, 'audio')
+        corpus.relocate_audio_to_single_container(target_container_path)
+
+        cont = containers.AudioContainer(target_container_path)
+        cont.open()
+
+        assert np.array_equal(cont.get_raw('file-1', mem_map=False)[0], expected_wav)
+        assert np.array_equal(cont.get_raw('file-5', mem_map=False)[0], expected_container)
+        assert cont.get_sampling_rate('file-1') == 16000
+
+        cont.close()
+
     def test_relocate_audio_to_wav_files(self, tmpdir):
         old_corpus = audiomate.Corpus.load(resources.sample_corpus_path('default'))
         new_corpus = audiomate.Corpus.from_corpus(old_corpus)
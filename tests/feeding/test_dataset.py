@@ -31,11 +31,11 @@ def container_dim_x_4(tmpdir):
     return cnt
 
 
-@pytest.fixture
-def container_dim_x(tmpdir):
+@pytest.fixture(params=[containers.Container, containers.RaggedContainer])
+def container_dim_x(tmpdir, request):
     inputs_path = os.path.join(tmpdir.strpath, 'outputs.hdf5')
 
-    cnt = containers.Container(inputs_path)
+    cnt = request.param(inputs_path)
     cnt.open()
 
     cnt.set('utt-1', np.arange(6))
@@ -235,14 +235,14 @@ class TestUtteranceDataset:
             )
 
 
-@pytest.fixture
-def sample_multi_frame_dataset(tmpdir):
+@pytest.fixture(params=[containers.Container, containers.RaggedContainer])
+def sample_multi_frame_dataset(tmpdir, request):
     inputs_path = os.path.join(tmpdir.strpath, 'inputs.hdf5')
     targets_path = os.path.join(tmpdir.strpath, 'targets.hdf5')
 
     corpus = resources.create_dataset()
-    container_inputs = containers.Container(inputs_path)
-    container_targets = containers.Container(targets_path)
+    container_inputs = request.param(inputs_path)
+    container_targets = request.param(targets_path)
 
     container_inputs.open()
     container_targets.open()
@@ -350,14 +350,14 @@ class TestMultiFrameDataset:
         assert ds_pad_enabled[11][2] == 3
 
 
-@pytest.fixture
-def sample_frame_dataset(tmpdir):
+@pytest.fixture(params=[containers.Container, containers.RaggedContainer])
+def sample_frame_dataset(tmpdir, request):
     inputs_path = os.path.join(tmpdir.strpath, 'inputs.hdf5')
     targets_path = os.path.join(tmpdir.strpath, 'targets.hdf5')
 
     corpus = resources.create_dataset()
-    container_inputs = containers.Container(inputs_path)
-    container_targets = containers.Container(targets_path)
+    container_inputs = request.param(inputs_path)
+    container_targets = request.param(targets_path)
 
     container_inputs.open()
     container_targets.open()
@@ -1,3 +1,4 @@
+import networkx as nx
 import numpy as np
 
 from audiomate.processing import pipeline
@@ -136,6 +137,55 @@ class TestStep:
         assert np.array_equal(out_data, np.array([[26, 28, 30, 32, 10, 11, 12, 13, 16, 17, 18, 19],
                                                   [34, 36, 38, 40, 14, 15, 16, 17, 20, 21, 22, 23]]))
 
+    def test_process_compiles_plan_once(self, monkeypatch):
+        context = StepDummy(min_frames=2, left_context=2, right_context=1)
+        concat = Concat(parents=[context, Add(5)])
+
+        sort_calls = []
+        original_sort = nx.algorithms.dag.topological_sort
+
+        def topological_sort(graph):
+            sort_calls.append(graph)
+            return original_sort(graph)
+
+        monkeypatch.setattr(nx.algorithms.dag, 'topological_sort', topological_sort)
+
+        for _ in range(3):
+            concat.process_frames(np.arange(8).reshape(2, 4), 4, offset=0, last=False)
+            concat.process_frames(np.arange(8).reshape(2, 4), 4, offset=2, last=True)
+
+        assert len(sort_calls) == 1
+
+    def test_process_resets_buffers_for_new_sequence(self):
+        context = StepDummy(min_frames=2, left_context=2, right_context=1)
+        concat = Concat(parents=[context, Add(5)])
+
+        concat.process_frames(np.array([[0, 1, 2, 3]]), 4, offset=0, last=False)
+        concat.process_frames(np.array([[4, 5, 6, 7]]), 4, offset=1, last=False)
+
+        # Start a new sequence, without finishing the previous one
+        out_data = concat.process_frames(np.array([[8, 9, 10, 11], [12, 13, 14, 15]]), 4, offset=0, last=True)
+
+        assert np.array_equal(out_data, np.array([[8, 9, 10, 11, 13, 14, 15, 16],
+                                                  [12, 13, 14, 15, 17, 18, 19, 20]]))
+
+    def test_compile(self):
+        add_a = Add(5)
+        mul = Multiply(2, parent=add_a)
+        add_b = Add(2)
+        concat = Concat(parents=[mul, add_b])
+
+        plan = concat.compile()
+
+        assert concat.plan is plan
+        assert plan.steps[-1] is concat
+        assert plan.output_index == 3
+        assert plan.steps.index(add_a) < plan.steps.index(mul)
+        assert {plan.steps[index] for index, _ in plan.input_targets} == {add_a, add_b}
+        assert plan.targets[plan.steps.index(mul)] == [(3, 0)]
+        assert plan.targets[plan.steps.index(add_b)] == [(3, 1)]
+        assert plan.buffers[3].num_buffers == 2
+
     def test_frame_transform(self):
         add_a = Add(5)
         mul = Multiply(2, parent=add_a)
@@ -365,6 +415,18 @@ class TestBuffer:
         assert res.left_context == 1
         assert res.right_context == 0
 
+    def test_reset(self):
+        buffer = base.Buffer(2, 1, 1)
+        buffer.update(np.arange(12).reshape(3, 4), 0, False)
+        buffer.get()
+
+        buffer.reset()
+
+        assert buffer.buffers == [None]
+        assert buffer.current_frame == 0
+        assert buffer.current_left_context == 0
+        assert buffer.get() is None
+
     def test_multiple_buffers(self):
         buffer = base.Buffer(3, 2, 0, num_buffers=2)
 
@@ -0,0 +1,212 @@
+import random
+
+import numpy as np
+import pytest
+
+from audiomate.processing.pipeline import base
+
+
+class ReferenceBuffer:
+    """
+    The former implementation of ``Buffer`` (concatenating the frames with ``np.vstack``),
+    used as reference for the behaviour of the buffer.
+    """
+
+    def __init__(self, min_frames, left_context, right_context, num_buffers=1):
+        self.min_frames = min_frames
+        self.left_context = left_context
+        self.right_context = right_context
+        self.num_buffers = num_buffers
+
+        self.buffers = [None] * self.num_buffers
+        self.buffers_full = [False] * self.num_buffers
+
+        self.current_frame = 0
+        self.current_left_context = 0
+
+    def update(self, data, offset, is_last, buffer_index=0):
+        if self.buffers[buffer_index] is not None and self.buffers[buffer_index].shape[0] > 0:
+            expected_next_frame = self.current_frame + self.buffers[buffer_index].shape[0]
+            if expected_next_frame != offset:
+                raise ValueError('There are missing frames.')
+
+            self.buffers[buffer_index] = np.vstack([self.buffers[buffer_index], data])
+        else:
+            self.buffers[buffer_index] = data
+
+        self.buffers_full[buffer_index] = is_last
+
+    def get(self):
+        chunk_size = self._smallest_buffer()
+        all_full = all(self.buffers_full)
+
+        if all_full:
+            right_context = 0
+            num_frames = chunk_size - self.current_left_context
+        else:
+            right_context = self.right_context
+            num_frames = self.min_frames
+
+        chunk_size_needed = num_frames + self.current_left_context + right_context
+
+        if chunk_size >= chunk_size_needed:
+            data = []
+            keep_frames = self.left_context + self.right_context
+            keep_from = max(0, chunk_size - keep_frames)
+
+            for index in range(self.num_buffers):
+                data.append(self.buffers[index][:chunk_size])
+                self.buffers[index] = self.buffers[index][keep_from:]
+
+            if self.num_buffers == 1:
+                data = data[0]
+
+            chunk = base.Chunk(data, self.current_frame, all_full, self.current_left_context, right_context)
+
+            self.current_left_context = min(self.left_context, chunk_size)
+            self.current_frame = max(self.current_frame + chunk_size - keep_frames, 0)
+
+            return chunk
+
+        return None
+
+    def _smallest_buffer(self):
+        smallest = np.inf
+
+        for buffer in self.buffers:
+            if buffer is None:
+                return 0
+            elif buffer.shape[0] < smallest:
+                smallest = buffer.shape[0]
+
+        return smallest
+
+
+def assert_chunks_equal(chunk, expected):
+    if expected is None:
+        assert chunk is None
+        return
+
+    assert chunk is not None
+    assert chunk.offset == expected.offset
+    assert chunk.is_last == expected.is_last
+    assert chunk.left_context == expected.left_context
+    assert chunk.right_context == expected.right_context
+
+    if isinstance(expected.data, list):
+        assert len(chunk.data) == len(expected.data)
+
+        for data, expected_data in zip(chunk.data, expected.data):
+            assert data.dtype == expected_data.dtype
+            assert np.array_equal(data, expected_data)
+    else:
+        assert chunk.data.dtype == expected.data.dtype
+        assert np.array_equal(chunk.data, expected.data)
+
+
+def random_sequences(rng, num_buffers):
+    """ Split a random number of frames into blocks for every buffer. """
+    num_frames = rng.randint(1, 60)
+    frames = np.arange(num_frames * 3, dtype=np.float32).reshape(num_frames, 3)
+    sequences = []
+
+    for index in range(num_buffers):
+        blocks = []
+        start = 0
+
+        while start < num_frames:
+            end = min(num_frames, start + rng.randint(1, 8))
+            blocks.append((frames[start:end] + 100 * index, start, end == num_frames))
+            start = end
+
+        sequences.append(blocks)
+
+    return sequences
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_same_chunks_as_reference(seed):
+    rng = random.Random(seed)
+
+    min_frames = rng.randint(1, 6)
+    left_context = rng.randint(0, 4)
+    right_context = rng.randint(0, 4)
+    num_buffers = rng.randint(1, 3)
+
+    buffer = base.Buffer(min_frames, left_context, right_context, num_buffers=num_buffers)
+    reference = ReferenceBuffer(min_frames, left_context, right_context, num_buffers=num_buffers)
+
+    # The frames of two sequences, to check resetting too
+    for _ in range(2):
+        buffer.reset()
+        reference = ReferenceBuffer(min_frames, left_context, right_context, num_buffers=num_buffers)
+
+        sequences = random_sequences(rng, num_buffers)
+        positions = [0] * num_buffers
+        outputs = []
+
+        while any(pos < len(seq) for pos, seq in zip(positions, sequences)):
+            buffer_index = rng.choice([i for i in range(num_buffers) if positions[i] < len(sequences[i])])
+            data, offset, is_last = sequences[buffer_index][positions[buffer_index]]
+            positions[buffer_index] += 1
+
+            try:
+                reference.update(data, offset, is_last, buffer_index=buffer_index)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    buffer.update(data, offset, is_last, buffer_index=buffer_index)
+                break
+
+            buffer.update(data, offset, is_last, buffer_index=buffer_index)
+
+            expected = reference.get()
+            chunk = buffer.get()
+
+            assert_chunks_equal(chunk, expected)
+
+            if chunk is not None:
+                outputs.append((chunk, expected))
+
+        # Chunks returned earlier must not be changed by later updates
+        for chunk, expected in outputs:
+            assert_chunks_equal(chunk, expected)
+
+
+def test_chunk_is_view_of_buffered_frames():
+    buffer = base.Buffer(2, 1, 1)
+    buffer.update(np.zeros((3, 2)), 0, False)
+    buffer.update(np.ones((5, 2)), 3, False)
+
+    chunk = buffer.get()
+
+    assert chunk.data.shape == (8, 2)
+    assert np.shares_memory(chunk.data, buffer.buffers[0])
+
+
+def test_append_promotes_dtype():
+    buffer = base.Buffer(4, 0, 0)
+    buffer.update(np.arange(4, dtype=np.int16).reshape(2, 2), 0, False)
+    buffer.update(np.full((2, 2), 0.5), 2, False)
+
+    chunk = buffer.get()
+
+    assert chunk.data.dtype == np.float64
+    assert np.array_equal(chunk.data, [[0, 1], [2, 3], [0.5, 0.5], [0.5, 0.5]])
+
+
+def test_append_with_different_dimension_raises_error():
+    buffer = base.Buffer(4, 0, 0)
+    buffer.update(np.zeros((2, 3)), 0, False)
+
+    with pytest.raises(ValueError):
+        buffer.update(np.zeros((2, 1)), 2, False)
+
+
+def test_append_doesnt_change_passed_frames():
+    frames = np.zeros((2, 2))
+
+    buffer = base.Buffer(4, 0, 0)
+    buffer.update(frames, 0, False)
+    buffer.update(np.ones((2, 2)), 2, False)
+
+    assert np.array_equal(frames, np.zeros((2, 2)))
@@ -0,0 +1,150 @@
+import numpy as np
+import librosa
+import pytest
+
+from audiomate.processing import pipeline
+
+from tests import resources
+
+
+@pytest.fixture(scope='module')
+def frames():
+    y, _ = librosa.load(resources.sample_wav_file('wav_1.wav'), sr=None)
+    return librosa.util.frame(y, frame_length=2048, hop_length=512).T
+
+
+def create_music_pipeline():
+    mfcc = pipeline.MFCC(n_mfcc=13, n_mels=128)
+    onset = pipeline.OnsetStrength(n_mels=128)
+    tempo = pipeline.Tempogram(n_mels=128, win_length=32)
+
+    return pipeline.Stack([mfcc, onset, tempo])
+
+
+def step_types(step):
+    return sorted(type(s).__name__ for s in step.graph.nodes())
+
+
+class Scale(pipeline.Computation):
+    def __init__(self, factor, parent=None, name=None):
+        super(Scale, self).__init__(parent=parent, name=name)
+        self.factor = factor
+
+    def compute(self, chunk, sampling_rate, corpus=None, utterance=None):
+        return chunk.data * self.factor
+
+
+class TestOptimize:
+
+    def test_shares_spectra(self, frames):
+        expected = create_music_pipeline().process_frames(frames, 16000, last=True)
+
+        stack = pipeline.optimize(create_music_pipeline())
+
+        assert step_types(stack) == ['LogMelSpectrogram', 'MFCC', 'MelSpectrogram', 'OnsetStrength',
+                                     'PowerSpectrum', 'Stack', 'Tempogram']
+        assert np.array_equal(stack.process_frames(frames, 16000, last=True), expected)
+
+    def test_log_mel_is_only_shared_with_steps_without_context(self):
+        stack = pipeline.optimize(create_music_pipeline())
+        mfcc, onset, tempo = stack.parents
+
+        assert [type(p).__name__ for p in mfcc._parent_steps(mfcc)] == ['LogMelSpectrogram']
+        assert [type(p).__name__ for p in onset._parent_steps(onset)] == ['MelSpectrogram']
+        assert onset._parent_steps(onset) == tempo._parent_steps(tempo)
+
+    def test_without_sharing_spectra(self):
+        stack = pipeline.optimize(create_music_pipeline(), share_spectra=False)
+
+        assert step_types(stack) == ['MFCC', 'OnsetStrength', 'Stack', 'Tempogram']
+
+    def test_spectra_with_different_n_mels_are_not_merged(self, frames):
+        mfcc = pipeline.MFCC(n_mfcc=13, n_mels=40)
+        onset = pipeline.OnsetStrength(n_mels=128)
+        expected = pipeline.Stack([mfcc, onset]).process_frames(frames, 16000, last=True)
+
+        stack = pipeline.optimize(pipeline.Stack([pipeline.MFCC(n_mfcc=13, n_mels=40),
+                                                  pipeline.OnsetStrength(n_mels=128)]))
+
+        assert step_types(stack) == ['LogMelSpectrogram', 'MFCC', 'MelSpectrogram', 'MelSpectrogram',
+                                     'OnsetStrength', 'PowerSpectrum', 'Stack']
+        assert np.array_equal(stack.process_frames(frames, 16000, last=True), expected)
+
+    def test_merges_duplicate_steps(self, frames):
+        expected = pipeline.Stack([
+            pipeline.MFCC(n_mfcc=13, n_mels=40),
+            pipeline.Delta(parent=pipeline.MFCC(n_mfcc=13, n_mels=40))
+        ]).process_frames(frames, 16000, last=True)
+
+        stack = pipeline.optimize(pipeline.Stack([
+            pipeline.MFCC(n_mfcc=13, n_mels=40),
+            pipeline.Delta(parent=pipeline.MFCC(n_mfcc=13, n_mels=40))
+        ]))
+
+        assert step_types(stack) == ['Delta', 'MFCC', 'Stack']
+        assert np.array_equal(stack.process_frames(frames, 16000, last=True), expected)
+
+    def test_merges_duplicate_parents_of_reduction(self):
+        norm_a = pipeline.MeanVarianceNorm(1.0, 1.0)
+        norm_b = pipeline.MeanVarianceNorm(1.0, 1.0)
+        data = np.arange(24, dtype=np.float64).reshape(6, 4)
+
+        stack = pipeline.optimize(pipeline.Stack([norm_a, norm_b]))
+
+        assert stack.parents == [norm_a, norm_a]
+        assert np.array_equal(stack.process_frames(data, 16000, last=True), np.hstack([data - 1, data - 1]))
+
+    def test_steps_with_different_parameters_are_not_merged(self):
+        stack = pipeline.optimize(pipeline.Stack([
+            pipeline.MeanVarianceNorm(1.0, 1.0),
+            pipeline.MeanVarianceNorm(0.0, 1.0)
+        ]))
+
+        assert step_types(stack) == ['MeanVarianceNorm', 'MeanVarianceNorm', 'Stack']
+
+    def test_steps_without_parameters_are_not_merged(self):
+        data = np.arange(12, dtype=np.float32).reshape(4, 3)
+        stack = pipeline.optimize(pipeline.Stack([Scale(1.0), Scale(2.0)]))
+
+        assert step_types(stack) == ['Scale', 'Scale', 'Stack']
+        assert np.array_equal(stack.process_frames(data, 16000, last=True), np.hstack([data, data * 2]))
+
+    def test_frame_transform_is_kept(self):
+        stack = create_music_pipeline()
+        expected = stack.frame_transform(2048, 512)
+
+        assert pipeline.optimize(stack).frame_transform(2048, 512) == expected
+
+    def test_process_online(self, frames):
+        stack = pipeline.optimize(create_music_pipeline())
+        expected = stack.process_frames(frames, 16000, last=True)
+
+        chunks = []
+
+        for offset in range(0, frames.shape[0], 10):
+            chunk = stack.process_frames(frames[offset:offset + 10], 16000, offset=offset,
+                                         last=offset + 10 >= frames.shape[0])
+
+            if chunk is not None:
+                chunks.append(chunk)
+
+        assert np.vstack(chunks).shape == expected.shape
+
+    @pytest.mark.parametrize('chunk_size', [1, 10, 37])
+    def test_process_online_matches_unoptimized(self, frames, chunk_size):
+        expected = create_music_pipeline()
+        stack = pipeline.optimize(create_music_pipeline())
+
+        for offset in range(0, frames.shape[0], chunk_size):
+            chunk = frames[offset:offset + chunk_size]
+            last = offset + chunk_size >= frames.shape[0]
+
+            expected_chunk = expected.process_frames(chunk, 16000, offset=offset, last=last)
+            actual_chunk = stack.process_frames(chunk, 16000, offset=offset, last=last)
+
+            # The shared spectra are computed on chunks of other sizes, which only affects the rounding
+            if expected_chunk is None:
+                assert actual_chunk is None
+            else:
+                assert np.array_equal(actual_chunk[:, :13], expected_chunk[:, :13])
+                assert np.allclose(actual_chunk, expected_chunk, rtol=1e-5, atol=1e-6)
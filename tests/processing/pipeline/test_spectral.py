@@ -1,5 +1,6 @@
 import numpy as np
 import librosa
+import pytest
 
 from audiomate.processing import pipeline
 
@@ -18,6 +19,47 @@ class TestMelSpectrogram:
         assert np.allclose(expected[1], res[1])
 
 
+class TestPowerSpectrum:
+
+    def test_compute(self):
+        samples = np.arange(8096).astype(np.float32)
+        expected = np.abs(librosa.core.stft(samples, n_fft=2048, hop_length=512, center=False)) ** 2
+
+        frames = librosa.util.frame(samples, frame_length=2048, hop_length=512).T
+        res = pipeline.PowerSpectrum().process_frames(frames, sampling_rate=16000)
+
+        assert res.shape == expected.T.shape
+        assert np.allclose(expected.T, res)
+
+    def test_as_parent_of_mel_spectrogram(self):
+        frames = np.random.RandomState(3).uniform(-1, 1, (20, 400)).astype(np.float32)
+
+        expected = pipeline.MelSpectrogram(n_mels=40).process_frames(frames, 16000, last=True)
+        mel = pipeline.MelSpectrogram(n_mels=40, parent=pipeline.PowerSpectrum())
+
+        assert mel.input_kind == 'power'
+        assert np.array_equal(mel.process_frames(frames, 16000, last=True), expected)
+
+
+class TestLogMelSpectrogram:
+
+    def test_compute(self):
+        frames = np.random.RandomState(3).uniform(-1, 1, (20, 400)).astype(np.float32)
+        mel = pipeline.MelSpectrogram(n_mels=40).process_frames(frames, 16000, last=True)
+
+        res = pipeline.LogMelSpectrogram(n_mels=40).process_frames(frames, 16000, last=True)
+
+        assert np.array_equal(res, librosa.power_to_db(mel.T).T)
+
+    def test_with_different_n_mels_than_parent_raises_error(self):
+        with pytest.raises(ValueError):
+            pipeline.LogMelSpectrogram(n_mels=40, parent=pipeline.MelSpectrogram(n_mels=80))
+
+    def test_mel_spectrogram_from_log_mel_raises_error(self):
+        with pytest.raises(ValueError):
+            pipeline.MelSpectrogram(n_mels=40, parent=pipeline.LogMelSpectrogram(n_mels=40))
+
+
 class TestMFCC:
 
     def test_compute(self):
@@ -31,3 +73,21 @@ class TestMFCC:
         res = mfcc.process_frames(frames, sampling_rate=16000)
 
         assert np.array_equal(expected, res)
+
+    @pytest.mark.parametrize('parent_kind', ['power', 'mel', 'log-mel'])
+    def test_compute_from_spectrum_parent(self, parent_kind):
+        frames = np.random.RandomState(3).uniform(-1, 1, (20, 400)).astype(np.float32)
+        expected = pipeline.MFCC(n_mfcc=13, n_mels=40).process_frames(frames, 16000, last=True)
+
+        parent = pipeline.PowerSpectrum()
+
+        if parent_kind in ['mel', 'log-mel']:
+            parent = pipeline.MelSpectrogram(n_mels=40, parent=parent)
+
+        if parent_kind == 'log-mel':
+            parent = pipeline.LogMelSpectrogram(n_mels=40, parent=parent)
+
+        mfcc = pipeline.MFCC(n_mfcc=13, n_mels=40, parent=parent)
+
+        assert mfcc.input_kind == parent_kind
+        assert np.array_equal(mfcc.process_frames(frames, 16000, last=True), expected)
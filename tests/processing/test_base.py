@@ -1,3 +1,4 @@
+import logging
 import os
 
 import numpy as np
@@ -9,6 +10,7 @@ import pytest
 from audiomate import tracks
 from audiomate import containers
 from audiomate import processing
+from audiomate.utils import audio
 
 from tests import resources
 
@@ -43,6 +45,46 @@ class ProcessorDummy(processing.Processor):
         return tf_frame_size, tf_hop_size
 
 
+class ReadingProcessorDummy(ProcessorDummy):
+    """ Reads the features written so far as SWMR reader, before processing the next utterance. """
+
+    def __init__(self, feat_path):
+        super(ReadingProcessorDummy, self).__init__()
+
+        self.feat_path = feat_path
+        self.reader = None
+        self.read_keys = []
+
+    def process_frames(self, data, sampling_rate, offset=0, last=False, utterance=None, corpus=None):
+        if len(self.called_with_data) > 0:
+            if self.reader is None:
+                self.reader = containers.FeatureContainer(self.feat_path, mode='r', swmr=True)
+                self.reader.open()
+            else:
+                self.reader.refresh()
+
+            self.read_keys.append(self.reader.keys())
+
+            for key in self.reader.keys():
+                assert self.reader.get(key, mem_map=False).shape[0] > 0
+
+        return super(ReadingProcessorDummy, self).process_frames(data, sampling_rate, offset=offset, last=last,
+                                                                 utterance=utterance, corpus=corpus)
+
+
+def assert_containers_equal(path_a, path_b):
+    cnt_a = containers.FeatureContainer(path_a)
+    cnt_b = containers.FeatureContainer(path_b)
+
+    with cnt_a, cnt_b:
+        assert cnt_a.keys() == cnt_b.keys()
+        assert (cnt_a.frame_size, cnt_a.hop_size, cnt_a.sampling_rate) == \
+               (cnt_b.frame_size, cnt_b.hop_size, cnt_b.sampling_rate)
+
+        for key in cnt_a.keys():
+            assert np.array_equal(cnt_a.get(key, mem_map=False), cnt_b.get(key, mem_map=False))
+
+
 @pytest.fixture()
 def processor():
     return ProcessorDummy()
@@ -169,6 +211,22 @@ class TestProcessor:
         assert processor.called_with_utterance == [None, None]
         assert processor.called_with_corpus == [None, None]
 
+    def test_process_track_online_with_frames_across_blocks(self, processor, tmpdir):
+        wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+        wav_content = np.random.random(1074).astype(np.float32)
+
+        audio.write_wav(wav_path, wav_content, sr=16000)
+        track = tracks.FileTrack('idx', wav_path)
+
+        chunks = list(processor.process_track_online(track, frame_size=20, hop_size=10,
+                                                     chunk_size=8, buffer_size=100))
+        expected = np.array([x[0] for x in track.read_frames(frame_size=20, hop_size=10)])
+
+        assert [c.shape[0] for c in chunks] == [8] * 13 + [3]
+        assert np.array_equal(np.vstack(chunks), expected)
+        assert processor.called_with_offset == list(range(0, 112, 8))
+        assert processor.called_with_last == [False] * 13 + [True]
+
     #
     #   process_utterance_...
     #
@@ -214,7 +272,7 @@ class TestProcessor:
         processor.process_corpus(ds, feat_path, frame_size=4096, hop_size=2048)
 
         with h5py.File(feat_path, 'r') as f:
-            utts = set(f.keys())
+            utts = set(f.keys()) - {containers.index.INDEX_GROUP}
 
             assert utts == set(ds.utterances.keys())
 
@@ -224,6 +282,17 @@ class TestProcessor:
             assert f['utt-4'].shape == (7, 4096)
             assert f['utt-5'].shape == (20, 4096)
 
+    def test_process_corpus_matches_process_utterance(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        feat_path = os.path.join(tmpdir.strpath, 'feats')
+
+        processor.process_corpus(ds, feat_path, frame_size=400, hop_size=160)
+
+        with h5py.File(feat_path, 'r') as f:
+            for utterance in ds.utterances.values():
+                expected = processor.process_utterance(utterance, frame_size=400, hop_size=160)
+                assert np.array_equal(f[utterance.idx][()], expected)
+
     def test_process_corpus_with_downsampling(self, processor, tmpdir):
         ds = resources.create_dataset()
         feat_path = os.path.join(tmpdir.strpath, 'feats')
@@ -231,7 +300,7 @@ class TestProcessor:
         processor.process_corpus(ds, feat_path, frame_size=4096, hop_size=2048, sr=8000)
 
         with h5py.File(feat_path, 'r') as f:
-            utts = set(f.keys())
+            utts = set(f.keys()) - {containers.index.INDEX_GROUP}
 
             assert utts == set(ds.utterances.keys())
 
@@ -283,6 +352,83 @@ class TestProcessor:
     #   process_corpus_online
     #
 
+    def test_process_corpus_with_workers_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        parallel_path = os.path.join(tmpdir.strpath, 'parallel')
+
+        processor.process_corpus(ds, serial_path, frame_size=400, hop_size=160)
+        processor.process_corpus(ds, parallel_path, frame_size=400, hop_size=160, num_workers=2)
+
+        assert_containers_equal(serial_path, parallel_path)
+
+    def test_process_corpus_with_workers_and_decoded_cache_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        parallel_path = os.path.join(tmpdir.strpath, 'parallel')
+
+        cache = tracks.enable_decoded_cache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+
+        try:
+            processor.process_corpus(ds, parallel_path, frame_size=400, hop_size=160, num_workers=2)
+
+            assert all(cache.contains(track) for track in ds.tracks.values() if cache.handles(track))
+
+            processor.process_corpus(ds, serial_path, frame_size=400, hop_size=160)
+        finally:
+            tracks.disable_decoded_cache()
+
+        assert_containers_equal(serial_path, parallel_path)
+
+    def test_process_corpus_pipelined_matches_serial(self, processor, tmpdir, caplog):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        pipelined_path = os.path.join(tmpdir.strpath, 'pipelined')
+
+        processor.process_corpus(ds, serial_path, frame_size=400, hop_size=160)
+
+        with caplog.at_level(logging.INFO, logger='audiomate'):
+            processor.process_corpus(ds, pipelined_path, frame_size=400, hop_size=160, pipelined=True)
+
+        assert_containers_equal(serial_path, pipelined_path)
+        assert 'Processed 5 utterances' in caplog.text
+        assert 'queue depth' in caplog.text
+
+    def test_process_corpus_pipelined_with_workers_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        parallel_path = os.path.join(tmpdir.strpath, 'parallel')
+
+        processor.process_corpus(ds, serial_path, frame_size=400, hop_size=160)
+        processor.process_corpus(ds, parallel_path, frame_size=400, hop_size=160, num_workers=2, pipelined=True)
+
+        assert_containers_equal(serial_path, parallel_path)
+
+    def test_process_corpus_swmr_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        swmr_path = os.path.join(tmpdir.strpath, 'swmr')
+
+        processor.process_corpus(ds, serial_path, frame_size=400, hop_size=160)
+        processor.process_corpus(ds, swmr_path, frame_size=400, hop_size=160, swmr=True)
+
+        assert_containers_equal(serial_path, swmr_path)
+
+    def test_process_corpus_swmr_can_be_read_while_processing(self, tmpdir):
+        ds = resources.create_dataset()
+        feat_path = os.path.join(tmpdir.strpath, 'feats')
+        processor = ReadingProcessorDummy(feat_path)
+
+        processor.process_corpus(ds, feat_path, frame_size=400, hop_size=160, swmr=True)
+        processor.reader.close()
+
+        processed = [utterance.idx for utterance in processor.called_with_utterance]
+
+        assert len(processor.read_keys) == len(processed) - 1
+
+        for i, keys in enumerate(processor.read_keys):
+            assert keys == sorted(processed[:i + 1])
+
     def test_process_corpus_online(self, processor, tmpdir):
         ds = resources.create_dataset()
         feat_path = os.path.join(tmpdir.strpath, 'feats')
@@ -290,7 +436,7 @@ class TestProcessor:
         processor.process_corpus_online(ds, feat_path, frame_size=4096, hop_size=2048)
 
         with h5py.File(feat_path, 'r') as f:
-            utts = set(f.keys())
+            utts = set(f.keys()) - {containers.index.INDEX_GROUP}
 
             assert utts == set(ds.utterances.keys())
 
@@ -300,6 +446,39 @@ class TestProcessor:
             assert f['utt-4'].shape == (7, 4096)
             assert f['utt-5'].shape == (20, 4096)
 
+    def test_process_corpus_online_with_workers_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        parallel_path = os.path.join(tmpdir.strpath, 'parallel')
+
+        processor.process_corpus_online(ds, serial_path, frame_size=400, hop_size=160, chunk_size=7)
+        processor.process_corpus_online(ds, parallel_path, frame_size=400, hop_size=160, chunk_size=7,
+                                        num_workers=2)
+
+        assert_containers_equal(serial_path, parallel_path)
+
+    def test_process_corpus_online_pipelined_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        pipelined_path = os.path.join(tmpdir.strpath, 'pipelined')
+
+        processor.process_corpus_online(ds, serial_path, frame_size=400, hop_size=160, chunk_size=7)
+        processor.process_corpus_online(ds, pipelined_path, frame_size=400, hop_size=160, chunk_size=7,
+                                        pipelined=True)
+
+        assert_containers_equal(serial_path, pipelined_path)
+
+    def test_process_corpus_online_swmr_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        swmr_path = os.path.join(tmpdir.strpath, 'swmr')
+
+        processor.process_corpus_online(ds, serial_path, frame_size=400, hop_size=160, chunk_size=7)
+        processor.process_corpus_online(ds, swmr_path, frame_size=400, hop_size=160, chunk_size=7,
+                                        pipelined=True, swmr=True)
+
+        assert_containers_equal(serial_path, swmr_path)
+
     def test_process_corpus_online_sets_container_attributes(self, processor, tmpdir):
         ds = resources.create_dataset()
         feat_path = os.path.join(tmpdir.strpath, 'feats')
@@ -373,6 +552,33 @@ class TestProcessor:
             assert np.array_equal(out_feats.get('utt-4', mem_map=False), utt_feats)
             assert np.array_equal(out_feats.get('utt-5', mem_map=False), utt_feats)
 
+    def test_process_features_with_workers_matches_serial(self, processor, tmpdir):
+        ds = resources.create_dataset()
+
+        in_feat_path = os.path.join(tmpdir.strpath, 'in_feats')
+        serial_path = os.path.join(tmpdir.strpath, 'serial')
+        parallel_path = os.path.join(tmpdir.strpath, 'parallel')
+
+        in_feats = containers.FeatureContainer(in_feat_path)
+
+        with in_feats:
+            in_feats.sampling_rate = 16000
+            in_feats.frame_size = 400
+            in_feats.hop_size = 160
+
+            for index, utt_idx in enumerate(ds.utterances):
+                in_feats.set(utt_idx, np.random.random((index + 3, 6)))
+
+        processor.process_features(ds, in_feats, serial_path)
+        processor.process_features(ds, in_feats, parallel_path, num_workers=3)
+
+        assert_containers_equal(serial_path, parallel_path)
+
+        pipelined_path = os.path.join(tmpdir.strpath, 'pipelined')
+        processor.process_features(ds, in_feats, pipelined_path, pipelined=True)
+
+        assert_containers_equal(serial_path, pipelined_path)
+
     def test_process_features_online(self, processor, tmpdir):
         ds = resources.create_dataset()
 
@@ -0,0 +1,152 @@
+import os
+
+import pytest
+import numpy as np
+
+from audiomate import tracks
+from audiomate.utils import audio
+
+
+@pytest.fixture()
+def enabled_cache():
+    cache = tracks.enable_sample_cache(max_size='1m')
+    yield cache
+    tracks.disable_sample_cache()
+
+
+@pytest.fixture()
+def wav_track(tmpdir):
+    path = os.path.join(tmpdir.strpath, 'audio.wav')
+    samples = np.random.random(16000).astype(np.float32) - 0.5
+    audio.write_wav(path, samples, sr=16000)
+    return tracks.FileTrack('wav', path)
+
+
+class TestSampleCache:
+
+    def test_get_returns_none_if_not_cached(self):
+        cache = tracks.SampleCache()
+
+        assert cache.get(('a', None, 0.0, None)) is None
+        assert cache.num_misses == 1
+
+    def test_set_and_get(self):
+        cache = tracks.SampleCache()
+        key = ('a', None, 0.0, None)
+        cache.set(key, np.arange(10, dtype=np.float32))
+
+        assert np.array_equal(cache.get(key), np.arange(10))
+        assert cache.num_hits == 1
+        assert cache.size == 40
+
+    def test_get_returns_copy(self):
+        cache = tracks.SampleCache()
+        key = ('a', None, 0.0, None)
+        cache.set(key, np.arange(10, dtype=np.float32))
+
+        cache.get(key)[:] = 0
+
+        assert np.array_equal(cache.get(key), np.arange(10))
+
+    def test_evicts_least_recently_used(self):
+        cache = tracks.SampleCache(max_size='100')
+        cache.set('a', np.zeros(10, dtype=np.float32))
+        cache.set('b', np.zeros(10, dtype=np.float32))
+        cache.get('a')
+        cache.set('c', np.zeros(10, dtype=np.float32))
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.size == 80
+        assert cache.num_evictions == 1
+
+    def test_entry_exceeding_max_size_is_not_kept(self):
+        cache = tracks.SampleCache(max_size='100')
+        cache.set('a', np.zeros(10, dtype=np.float32))
+        cache.set('b', np.zeros(100, dtype=np.float32))
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert cache.size == 40
+
+    def test_clear(self):
+        cache = tracks.SampleCache()
+        cache.set('a', np.zeros(10, dtype=np.float32))
+        cache.get('a')
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.size == 0
+        assert cache.num_hits == 0
+
+    def test_resampled_samples_are_stored_on_disk(self, tmpdir):
+        cache_dir = os.path.join(tmpdir.strpath, 'cache')
+        key = ('a', 8000, 0.0, None)
+        tracks.SampleCache(cache_dir=cache_dir).set(key, np.arange(10, dtype=np.float32))
+
+        cache = tracks.SampleCache(cache_dir=cache_dir)
+
+        assert np.array_equal(cache.get(key), np.arange(10))
+        assert cache.num_disk_hits == 1
+        assert key in cache
+
+    def test_native_samples_are_not_stored_on_disk(self, tmpdir):
+        cache_dir = os.path.join(tmpdir.strpath, 'cache')
+        tracks.SampleCache(cache_dir=cache_dir).set(('a', None, 0.0, None), np.arange(10, dtype=np.float32))
+
+        assert os.listdir(cache_dir) == []
+
+
+class TestReadThroughCache:
+
+    def test_disabled_by_default(self):
+        assert tracks.active_sample_cache() is None
+
+    def test_file_track_reads_from_cache(self, enabled_cache, wav_track):
+        first = wav_track.read_samples(offset=0.25, duration=0.5)
+        second = wav_track.read_samples(offset=0.25, duration=0.5)
+
+        assert np.array_equal(first, second)
+        assert enabled_cache.num_misses == 1
+        assert enabled_cache.num_hits == 1
+
+    def test_different_ranges_are_cached_separately(self, enabled_cache, wav_track):
+        wav_track.read_samples(offset=0.25, duration=0.5)
+        samples = wav_track.read_samples(offset=0.5)
+
+        assert samples.shape == (8000,)
+        assert enabled_cache.num_misses == 2
+
+    def test_different_sampling_rates_are_cached_separately(self, enabled_cache, wav_track):
+        wav_track.read_samples()
+        samples = wav_track.read_samples(sr=8000)
+
+        assert samples.shape == (8000,)
+        assert enabled_cache.num_misses == 2
+
+    def test_changed_file_is_not_read_from_cache(self, enabled_cache, wav_track):
+        wav_track.read_samples()
+
+        audio.write_wav(wav_track.path, np.zeros(8000, dtype=np.float32), sr=16000)
+        wav_track.invalidate_info()
+
+        assert wav_track.read_samples().shape == (8000,)
+        assert enabled_cache.num_hits == 0
+
+    def test_container_track_reads_from_cache(self, enabled_cache, tmpdir):
+        from audiomate import containers
+
+        container = containers.AudioContainer(os.path.join(tmpdir.strpath, 'audio.hdf5'))
+        container.open()
+        container.set('utt', np.arange(16000, dtype=np.float32), 16000)
+
+        track = tracks.ContainerTrack('utt', container)
+        first = track.read_samples(offset=0.5)
+        second = track.read_samples(offset=0.5)
+
+        container.close()
+
+        assert np.array_equal(first, second)
+        assert enabled_cache.num_misses == 1
+        assert enabled_cache.num_hits == 1
@@ -98,6 +98,41 @@ class TestContainerTrack:
 
         cont.close()
 
+    def test_read_frames_with_offset_and_duration(self, tmpdir):
+        cont_path = os.path.join(tmpdir.strpath, 'audio.hdf5')
+        cont = containers.AudioContainer(cont_path)
+        cont.open()
+
+        content = np.random.random(16000)
+        cont.set('track', content, 16000)
+        track = tracks.ContainerTrack('some_idx', cont, 'track')
+
+        data = list(track.read_frames(frame_size=400, hop_size=400, offset=0.5, duration=0.25))
+        frames = np.array([x[0] for x in data])
+
+        assert frames.shape == (10, 400)
+        assert np.allclose(frames[0], content[8000:8400], atol=0.0001)
+
+        cont.close()
+
+    def test_read_frame_blocks(self, tmpdir):
+        cont_path = os.path.join(tmpdir.strpath, 'audio.hdf5')
+        cont = containers.AudioContainer(cont_path)
+        cont.open()
+
+        content = np.random.random(10044)
+        cont.set('track', content, 16000)
+        track = tracks.ContainerTrack('some_idx', cont, 'track')
+
+        blocks = list(track.read_frame_blocks(frame_size=400, hop_size=160))
+        frames = np.array([x[0] for x in track.read_frames(frame_size=400, hop_size=160)])
+
+        assert [x[0].shape for x in blocks] == [(61, 400), (1, 400)]
+        assert [x[1] for x in blocks] == [False, True]
+        assert np.array_equal(np.vstack([x[0] for x in blocks]), frames)
+
+        cont.close()
+
     def test_read_frames_matches_length(self, tmpdir):
         cont_path = os.path.join(tmpdir.strpath, 'audio.hdf5')
         cont = containers.AudioContainer(cont_path)
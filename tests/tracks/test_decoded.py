@@ -0,0 +1,138 @@
+import os
+
+import pytest
+import numpy as np
+
+from audiomate import containers
+from audiomate import tracks
+from audiomate.utils import audio
+
+
+@pytest.fixture()
+def wav_track(tmpdir):
+    path = os.path.join(tmpdir.strpath, 'audio.wav')
+    samples = np.random.random(48000).astype(np.float32) - 0.5
+    audio.write_wav(path, samples, sr=16000)
+    return tracks.FileTrack('wav', path)
+
+
+@pytest.fixture()
+def enabled_cache(tmpdir):
+    cache = tracks.enable_decoded_cache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+    yield cache
+    tracks.disable_decoded_cache()
+
+
+class TestDecodedCache:
+
+    def test_handles(self):
+        cache = tracks.DecodedCache('/tmp/decoded.hdf5', extensions=['.mp3'])
+
+        assert cache.handles(tracks.FileTrack('a', '/some/file.MP3'))
+        assert not cache.handles(tracks.FileTrack('b', '/some/file.wav'))
+
+    def test_add(self, wav_track, tmpdir):
+        cache = tracks.DecodedCache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+
+        assert not cache.contains(wav_track)
+
+        cache.add(wav_track)
+
+        assert cache.contains(wav_track)
+        samples, sr = cache.container.get(cache.key_for(wav_track))
+        assert sr == 16000
+        assert samples.shape == (wav_track.num_samples,)
+
+        cache.close()
+
+    def test_read_samples(self, wav_track, tmpdir):
+        cache = tracks.DecodedCache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+        expected = audio.read_samples(wav_track.path, offset=1.0, duration=2.0)
+
+        samples = cache.read_samples(wav_track, offset=1.0, duration=2.0)
+
+        assert samples.dtype == np.float32
+        assert np.allclose(samples, expected, atol=1e-4)
+
+        cache.close()
+
+    def test_changed_file_is_decoded_again(self, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'audio.wav')
+        audio.write_wav(path, np.zeros(16000, dtype=np.float32), sr=16000)
+        track = tracks.FileTrack('wav', path)
+        cache = tracks.DecodedCache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+
+        cache.add(track)
+        audio.write_wav(path, np.zeros(8000, dtype=np.float32), sr=16000)
+        track.invalidate_info()
+
+        assert not cache.contains(track)
+        assert cache.read_samples(track).shape == (8000,)
+
+        cache.close()
+
+    def test_fill(self, wav_track, tmpdir):
+        other_track = tracks.FileTrack('other', os.path.join(tmpdir.strpath, 'audio.flac'))
+        cache = tracks.DecodedCache(os.path.join(tmpdir.strpath, 'decoded.hdf5'), extensions=['.wav'])
+
+        cache.fill([wav_track, other_track], num_workers=2)
+
+        assert cache.contains(wav_track)
+        assert cache.container.keys() == [cache.key_for(wav_track)]
+
+        cache.close()
+
+    def test_read_only_does_not_store_samples(self, wav_track, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'decoded.hdf5')
+        cache = tracks.DecodedCache(path, extensions=['.wav'], read_only=True)
+        expected = audio.read_samples(wav_track.path)
+
+        assert not cache.contains(wav_track)
+        assert np.allclose(cache.read_samples(wav_track), expected, atol=1e-4)
+        assert not os.path.exists(path)
+
+        with pytest.raises(ValueError):
+            cache.add(wav_track)
+
+        cache.close()
+
+    def test_read_only_reads_stored_samples(self, wav_track, tmpdir):
+        path = os.path.join(tmpdir.strpath, 'decoded.hdf5')
+        cache = tracks.DecodedCache(path, extensions=['.wav'])
+        cache.add(wav_track)
+        cache.close()
+
+        cache = tracks.DecodedCache(path, extensions=['.wav'], read_only=True)
+
+        assert cache.contains(wav_track)
+        assert cache.read_samples(wav_track).shape == (wav_track.num_samples,)
+
+        cache.close()
+
+
+class TestFileTrackWithDecodedCache:
+
+    def test_disabled_by_default(self):
+        assert tracks.active_decoded_cache() is None
+
+    def test_read_samples_stores_decoded_samples(self, wav_track, enabled_cache):
+        expected = audio.read_samples(wav_track.path, sr=8000)
+
+        samples = wav_track.read_samples(sr=8000)
+
+        assert enabled_cache.contains(wav_track)
+        assert np.allclose(samples, expected, atol=1e-4)
+
+    def test_decoded_samples_are_reused(self, wav_track, enabled_cache):
+        wav_track.read_samples()
+        tracks.disable_decoded_cache()
+
+        cache = containers.AudioContainer(enabled_cache.path)
+        cache.open()
+        key = enabled_cache.key_for(wav_track)
+        cache.set(key, np.zeros(100, dtype=np.float32), 16000)
+        cache.close()
+
+        tracks.enable_decoded_cache(enabled_cache.path, extensions=['.wav'])
+
+        assert np.array_equal(wav_track.read_samples(), np.zeros(100))
@@ -1,10 +1,14 @@
+import copy
 import os
 
 import pytest
 import numpy as np
 import librosa
+import soundfile as sf
 
 from audiomate import tracks
+from audiomate.utils import audio
+from audiomate.utils import audioread
 
 from tests import resources
 
@@ -146,3 +150,74 @@ class TestFile:
 
         assert last[:-1] == [False] * (len(data) - 1)
         assert last[-1]
+
+    def test_info_is_cached(self, audio_path):
+        file_obj = tracks.FileTrack('some_idx', os.path.join(audio_path, 'wav_1_16k_24b.wav'))
+
+        assert not file_obj.has_info()
+
+        assert file_obj.sampling_rate == 16000
+        assert file_obj.has_info()
+
+        info = file_obj.info
+        assert file_obj.info is info
+        assert info.num_channels == 1
+        assert info.duration == pytest.approx(2.5951875)
+        assert info.size == os.path.getsize(file_obj.path)
+
+    def test_probe_reads_header_without_audioread(self, audio_path, monkeypatch):
+        def audio_open(path):
+            raise AssertionError('audioread must not be used')
+
+        monkeypatch.setattr(audioread, 'audio_open', audio_open)
+
+        info = tracks.FileInfo.probe(os.path.join(audio_path, 'flac_1_16k_16b.flac'))
+
+        assert info.sampling_rate == 16000
+        assert info.num_channels == 1
+        assert info.num_samples == 103424
+
+    def test_probe_falls_back_to_audioread(self, audio_path, monkeypatch):
+        def info(path):
+            raise RuntimeError('unsupported format')
+
+        monkeypatch.setattr(sf, 'info', info)
+
+        info = tracks.FileInfo.probe(os.path.join(audio_path, 'wav_2_44_1k_16b.wav'))
+
+        assert info.sampling_rate == 44100
+        assert info.num_channels == 2
+        assert info.duration == pytest.approx(4.0)
+
+    def test_info_given_is_used(self):
+        info = tracks.FileInfo(8000, 2, 3.5, 100, 12.0)
+        file_obj = tracks.FileTrack('some_idx', '/not/existing.wav', info=info)
+
+        assert file_obj.sampling_rate == 8000
+        assert file_obj.num_channels == 2
+        assert file_obj.num_samples == 28000
+        assert file_obj.duration == 3.5
+
+    def test_info_is_valid(self, tmpdir):
+        wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+        audio.write_wav(wav_path, np.random.random(8000), sr=16000)
+
+        file_obj = tracks.FileTrack('some_idx', wav_path)
+        assert not file_obj.info_is_valid()
+
+        assert file_obj.num_samples == 8000
+        assert file_obj.info_is_valid()
+
+        audio.write_wav(wav_path, np.random.random(16000), sr=16000)
+        assert not file_obj.info_is_valid()
+
+        file_obj.invalidate_info()
+        assert not file_obj.has_info()
+        assert file_obj.num_samples == 16000
+
+    def test_copy_keeps_info(self, audio_path):
+        file_obj = tracks.FileTrack('some_idx', os.path.join(audio_path, 'wav_1_16k_24b.wav'))
+        info = file_obj.info
+
+        assert copy.copy(file_obj).info is info
+        assert copy.deepcopy(file_obj).info == info
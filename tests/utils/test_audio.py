@@ -2,6 +2,7 @@ import os
 
 import numpy as np
 import librosa
+import soundfile as sf
 
 from audiomate import tracks
 from audiomate.utils import audio
@@ -65,6 +66,125 @@ def test_read_frames_matches_length(tmpdir):
     assert last[-1]
 
 
+def test_split_frames():
+    samples = np.arange(10, dtype=np.float32)
+
+    frames, rest = audio.split_frames(samples, frame_size=4, hop_size=2)
+
+    assert np.array_equal(frames, [[0, 1, 2, 3], [2, 3, 4, 5], [4, 5, 6, 7]])
+    assert np.array_equal(rest, [6, 7, 8, 9])
+    assert not frames.flags.writeable
+
+
+def test_split_frames_with_hop_larger_than_frame():
+    samples = np.arange(10, dtype=np.float32)
+
+    frames, rest = audio.split_frames(samples, frame_size=2, hop_size=4)
+
+    assert np.array_equal(frames, [[0, 1], [4, 5]])
+    assert np.array_equal(rest, [8, 9])
+
+
+def test_split_frames_with_fewer_samples_than_frame_size():
+    samples = np.arange(3, dtype=np.float32)
+
+    frames, rest = audio.split_frames(samples, frame_size=4, hop_size=2)
+
+    assert frames.shape == (0, 4)
+    assert np.array_equal(rest, [0, 1, 2])
+
+
+def test_read_frame_blocks_matches_read_frames(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    wav_content = np.random.random(10044).astype(np.float32)
+    audio.write_wav(wav_path, wav_content, sr=16000)
+
+    blocks = list(audio.read_frame_blocks(wav_path, frame_size=400, hop_size=160, buffer_size=1000))
+    frames = [x[0] for x in audio.read_frames(wav_path, frame_size=400, hop_size=160, buffer_size=1000)]
+
+    assert len(blocks) > 2
+    assert np.array_equal(np.vstack([x[0] for x in blocks]), np.array(frames))
+    assert [x[1] for x in blocks] == [False] * (len(blocks) - 1) + [True]
+
+
+def test_read_samples(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    wav_content = np.random.random(10000)
+    audio.write_wav(wav_path, wav_content, sr=16000)
+
+    samples = audio.read_samples(wav_path)
+
+    assert samples.dtype == np.float32
+    assert np.allclose(samples, wav_content, atol=0.0001)
+
+
+def test_read_samples_with_offset_and_duration(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    wav_content = np.random.random(10000)
+    audio.write_wav(wav_path, wav_content, sr=16000)
+
+    samples = audio.read_samples(wav_path, offset=0.1, duration=0.2)
+
+    assert samples.shape == (3200,)
+    assert np.allclose(samples, wav_content[1600:4800], atol=0.0001)
+
+
+def test_read_samples_range_matches_librosa(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    audio.write_wav(wav_path, np.random.random(20000), sr=16000)
+
+    expected, __ = librosa.core.load(wav_path, sr=None, offset=0.34 + 0.28, duration=1.5 - 0.34 - 0.28)
+    samples = audio.read_samples(wav_path, offset=0.34 + 0.28, duration=1.5 - 0.34 - 0.28)
+
+    assert np.array_equal(samples, expected)
+
+
+def test_read_samples_with_resampling_matches_librosa(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    audio.write_wav(wav_path, np.random.random(20000), sr=16000)
+
+    expected, __ = librosa.core.load(wav_path, sr=8000)
+    samples = audio.read_samples(wav_path, sr=8000)
+
+    assert np.array_equal(samples, expected)
+
+
+def test_read_samples_offset_beyond_end(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    audio.write_wav(wav_path, np.random.random(10000), sr=16000)
+
+    samples = audio.read_samples(wav_path, offset=2.0)
+
+    assert samples.shape == (0,)
+
+
+def test_read_samples_stereo_to_mono(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    wav_content = np.random.random((10000, 2))
+    audio.write_wav(wav_path, wav_content, sr=16000)
+
+    samples = audio.read_samples(wav_path, offset=0.1)
+
+    assert samples.shape == (8400,)
+    assert np.allclose(samples, np.mean(wav_content[1600:], axis=1), atol=0.0001)
+
+
+def test_read_samples_falls_back_to_audioread(tmpdir, monkeypatch):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    wav_content = np.random.random(10000)
+    audio.write_wav(wav_path, wav_content, sr=16000)
+
+    def raise_error(*args, **kwargs):
+        raise RuntimeError('Unsupported format')
+
+    monkeypatch.setattr(audio.sf, 'SoundFile', raise_error)
+
+    samples = audio.read_samples(wav_path, offset=0.1, duration=0.2)
+
+    assert samples.dtype == np.float32
+    assert np.allclose(samples, wav_content[1600:4800], atol=0.0001)
+
+
 def test_write_wav(tmpdir):
     samples = np.random.random(50000)
     sr = 16000
@@ -80,3 +200,31 @@ def test_write_wav(tmpdir):
         track.read_samples(),
         atol=1.e-04
     )
+
+
+def test_is_pcm16_mono(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    sf.write(wav_path, np.zeros(10, dtype=np.int16), 16000, subtype='PCM_16')
+
+    float_path = os.path.join(tmpdir.strpath, 'float.wav')
+    sf.write(float_path, np.zeros(10, dtype=np.float32), 16000, subtype='FLOAT')
+
+    stereo_path = os.path.join(tmpdir.strpath, 'stereo.wav')
+    sf.write(stereo_path, np.zeros((10, 2), dtype=np.int16), 16000, subtype='PCM_16')
+
+    assert audio.is_pcm16_mono(wav_path)
+    assert not audio.is_pcm16_mono(float_path)
+    assert not audio.is_pcm16_mono(stereo_path)
+    assert not audio.is_pcm16_mono(os.path.join(tmpdir.strpath, 'not_existing.wav'))
+
+
+def test_read_pcm16_blocks(tmpdir):
+    wav_path = os.path.join(tmpdir.strpath, 'file.wav')
+    samples = np.random.randint(-32767, 32767, 2500).astype(np.int16)
+    sf.write(wav_path, samples, 16000, subtype='PCM_16')
+
+    blocks = list(audio.read_pcm16_blocks(wav_path, block_size=1000))
+
+    assert [block.size for block in blocks] == [1000, 1000, 500]
+    assert all(block.dtype == np.int16 for block in blocks)
+    assert np.array_equal(np.concatenate(blocks), samples)
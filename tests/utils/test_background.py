@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from audiomate.utils import background
+
+
+class TestBackgroundReader:
+
+    def test_yields_all_items_in_order(self):
+        with background.BackgroundReader(range(100), queue_size=3) as reader:
+            assert list(reader) == list(range(100))
+
+        assert reader.num_items == 101
+        assert reader.max_depth <= 3
+
+    def test_reads_in_background_thread(self):
+        thread_ids = []
+
+        def items():
+            for index in range(3):
+                thread_ids.append(threading.get_ident())
+                yield index
+
+        with background.BackgroundReader(items()) as reader:
+            list(reader)
+
+        assert threading.get_ident() not in thread_ids
+
+    def test_error_is_raised_in_consuming_thread(self):
+        def items():
+            yield 1
+            raise ValueError('broken')
+
+        with background.BackgroundReader(items()) as reader:
+            iterator = iter(reader)
+
+            assert next(iterator) == 1
+
+            with pytest.raises(ValueError, match='broken'):
+                next(iterator)
+
+    def test_close_stops_reading(self):
+        def items():
+            index = 0
+
+            while True:
+                yield index
+                index += 1
+
+        reader = background.BackgroundReader(items(), queue_size=2)
+
+        assert next(iter(reader)) == 0
+
+        reader.close()
+
+        assert not reader._thread.is_alive()
+
+    def test_invalid_queue_size_raises_error(self):
+        with pytest.raises(ValueError):
+            background.BackgroundReader([], queue_size=0)
+
+
+class TestBackgroundWriter:
+
+    def test_writes_all_items_in_order(self):
+        written = []
+
+        with background.BackgroundWriter(lambda key, value: written.append((key, value)), queue_size=2) as writer:
+            for index in range(50):
+                writer.write('key-{}'.format(index), index)
+
+        assert written == [('key-{}'.format(index), index) for index in range(50)]
+        assert writer.num_items == 50
+        assert writer.max_depth <= 2
+
+    def test_error_is_raised_in_writing_thread(self):
+        written = []
+
+        def write(value):
+            if value == 3:
+                raise ValueError('broken')
+
+            written.append(value)
+
+        with pytest.raises(ValueError, match='broken'):
+            with background.BackgroundWriter(write) as writer:
+                for index in range(6):
+                    writer.write(index)
+
+        assert not writer._thread.is_alive()
+
+        assert written == [0, 1, 2]
+
+    def test_error_is_raised_on_next_write(self):
+        writer = background.BackgroundWriter(lambda value: 1 / value, queue_size=1)
+        writer.write(0)
+        writer._close_without_error()
+
+        with pytest.raises(ZeroDivisionError):
+            writer.write(1)
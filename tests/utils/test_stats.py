@@ -54,3 +54,59 @@ class TestDataStats:
         assert s.min == pytest.approx(-2)
         assert s.max == pytest.approx(4.0)
         assert s.num == 99
+
+
+class TestStreamingStats:
+
+    def test_update(self):
+        values = np.random.randn(100, 4)
+        s = stats.StreamingStats()
+
+        for chunk in np.array_split(values, 7):
+            s.update(chunk)
+
+        assert s.mean == pytest.approx(np.mean(values))
+        assert s.var == pytest.approx(np.var(values))
+        assert s.min == pytest.approx(np.min(values))
+        assert s.max == pytest.approx(np.max(values))
+        assert s.num == values.size
+
+    def test_update_per_dimension(self):
+        values = np.random.randn(100, 4)
+        s = stats.StreamingStats(per_dimension=True)
+
+        for chunk in np.array_split(values, 7):
+            s.update(chunk)
+
+        assert np.allclose(s.mean, np.mean(values, axis=0))
+        assert np.allclose(s.var, np.var(values, axis=0))
+        assert np.array_equal(s.min, np.min(values, axis=0))
+        assert np.array_equal(s.max, np.max(values, axis=0))
+        assert s.num == 100
+        assert s.values.shape == (4, 5)
+
+    def test_merge(self):
+        values = np.random.randn(60)
+        a = stats.StreamingStats()
+        a.update(values[:10])
+        b = stats.StreamingStats()
+        b.update(values[10:])
+
+        a.merge(b)
+        a.merge(stats.StreamingStats())
+
+        assert a.mean == pytest.approx(np.mean(values))
+        assert a.var == pytest.approx(np.var(values))
+        assert a.num == 60
+
+    def test_to_dict_and_from_dict(self):
+        s = stats.StreamingStats(per_dimension=True)
+        s.update(np.arange(6).reshape(3, 2))
+
+        restored = stats.StreamingStats.from_dict(s.to_dict())
+
+        assert restored.per_dimension
+        assert np.allclose(restored.mean, [2, 3])
+        assert np.allclose(restored.var, s.var)
+        assert np.array_equal(restored.min, [0, 1])
+        assert restored.num == 3